@@ -0,0 +1,118 @@
+# admission.py - Admission control for requests that have to compute a ranking
+#
+# A cache miss means a full CFBD fetch plus a solve, so misses (never cache hits) go
+# through two checks before any work starts:
+#   - a token bucket per client IP: 429 + Retry-After once a client has used its burst
+#   - a bounded compute queue: 503 + Retry-After when it is full
+# Admitted computations run on a worker thread, so the event loop keeps answering
+# cache hits while they run. Identical misses already in flight share one computation.
+#
+# Limits are per worker process.
+
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from fastapi import HTTPException, Request
+
+logger = logging.getLogger(__name__)
+
+COMPUTE_RATE_PER_MINUTE = float(os.getenv("COMPUTE_RATE_PER_MINUTE", "12"))
+COMPUTE_BURST = int(os.getenv("COMPUTE_BURST", "6"))
+COMPUTE_CONCURRENCY = int(os.getenv("COMPUTE_CONCURRENCY", "1"))
+COMPUTE_QUEUE_SIZE = int(os.getenv("COMPUTE_QUEUE_SIZE", "4"))
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "1"))  # Proxies appending to X-Forwarded-For
+
+MAX_TRACKED_CLIENTS = 10000  # Least recently seen buckets are dropped beyond this
+
+
+def client_ip(request: Request) -> str:
+    """Client address, taken from the entry our own proxy appended to X-Forwarded-For"""
+    forwarded = request.headers.get("x-forwarded-for")
+    if forwarded and TRUSTED_PROXY_HOPS > 0:
+        hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+        if hops:
+            # Entries left of the trusted ones are client-supplied and can be spoofed
+            return hops[-min(TRUSTED_PROXY_HOPS, len(hops))]
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimiter:
+    """Token bucket per client: `burst` computations at once, refilled at `per_minute`"""
+    
+    def __init__(self, per_minute: float = COMPUTE_RATE_PER_MINUTE, burst: int = COMPUTE_BURST):
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self.buckets: OrderedDict = OrderedDict()  # client -> (tokens, last refill)
+    
+    def acquire(self, client: str) -> Optional[float]:
+        """Take a token; None if allowed, otherwise seconds until one is available"""
+        now = time.monotonic()
+        tokens, updated = self.buckets.pop(client, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        
+        retry_after = None
+        if tokens >= 1:
+            tokens -= 1
+        elif self.rate > 0:
+            retry_after = (1 - tokens) / self.rate
+        else:
+            retry_after = 60.0
+        
+        self.buckets[client] = (tokens, now)
+        while len(self.buckets) > MAX_TRACKED_CLIENTS:
+            self.buckets.popitem(last=False)
+        return retry_after
+    
+    def check(self, request: Request):
+        retry_after = self.acquire(client_ip(request))
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many uncached ranking requests - try again shortly or use the default formula",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+
+
+class ComputeGate:
+    """Bounded queue of computations, `concurrency` running at once off the event loop"""
+    
+    def __init__(self, concurrency: int = COMPUTE_CONCURRENCY, queue_size: int = COMPUTE_QUEUE_SIZE):
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.inflight: Dict[str, asyncio.Future] = {}  # key -> running/queued computation
+        self.average_seconds = 5.0  # Moving average of computation time, for Retry-After
+    
+    def retry_after(self) -> int:
+        rounds = math.ceil((len(self.inflight) + 1) / self.concurrency)
+        return max(1, math.ceil(rounds * self.average_seconds))
+    
+    async def _compute(self, fn: Callable):
+        async with self.semaphore:
+            started = time.monotonic()
+            try:
+                return await asyncio.to_thread(fn)
+            finally:
+                self.average_seconds = 0.8 * self.average_seconds + 0.2 * (time.monotonic() - started)
+    
+    async def run(self, key: str, fn: Callable):
+        """Result of fn() computed on a worker thread; 503 when the queue is full"""
+        future = self.inflight.get(key)
+        if future is None:
+            if len(self.inflight) >= self.concurrency + self.queue_size:
+                logger.warning(f"Compute queue full ({len(self.inflight)} computations), rejecting {key}")
+                raise HTTPException(
+                    status_code=503,
+                    detail="Ranking computation queue is full - try again shortly",
+                    headers={"Retry-After": str(self.retry_after())}
+                )
+            future = asyncio.ensure_future(self._compute(fn))
+            self.inflight[key] = future
+            future.add_done_callback(lambda _: self.inflight.pop(key, None))
+        # A client disconnecting mustn't cancel a computation others are waiting on
+        return await asyncio.shield(future)
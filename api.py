@@ -1,16 +1,31 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Union
+from datetime import datetime, timedelta
 import uvicorn
+import asyncio
+import hashlib
 import os
+import threading
+from collections import OrderedDict
+
+from admission import ComputeGate, RateLimiter
+from cache_warmer import CacheWarmer
+from compression import PrecompressedStaticFiles, compress_variants, encoded_body_response
+from http_cache import make_etag, cache_headers, not_modified_response
+from json_encoding import FastJSONResponse, encode_json, round_float
+from live_updates import RankingBroadcaster
+from shared_cache import open_shared_cache
+from sync_hooks import register_post_sync_hook, run_post_sync_hooks
 
 app = FastAPI(
     title="College Football Rankings API",
     description="Custom ranking system for college football teams",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # Enable CORS for frontend access
@@ -30,6 +45,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress anything not already encoded (cached /rankings bodies and precompressed
+# static assets set their own Content-Encoding and pass through untouched)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
 # Pydantic models for API responses
 class GameResultResponse(BaseModel):
     opponent: str
@@ -53,6 +72,33 @@ class RankingsResponse(BaseModel):
     season_type: str
     classification: str
 
+class TeamSummaryResponse(BaseModel):
+    name: str
+    wins: int
+    losses: int
+    ranking: float
+
+class RankingsSummaryResponse(BaseModel):
+    teams: List[TeamSummaryResponse]
+    total_teams: int
+    year: int
+    season_type: str
+    classification: str
+
+class RankingsPageResponse(BaseModel):
+    teams: List[Union[TeamResponse, TeamSummaryResponse]]
+    total_teams: int
+    year: int
+    season_type: str
+    classification: str
+    after_rank: int
+    limit: Optional[int]
+    next_after_rank: Optional[int]  # Pass as after_rank for the next page; null on the last page
+
+class TeamGamesResponse(BaseModel):
+    name: str
+    games: List[GameResultResponse]
+
 class FormulaParams(BaseModel):
     win_loss_multiplier: float = 1.0
     one_score_multiplier: float = 1.0      # Margin ≤ 8
@@ -63,6 +109,97 @@ class FormulaParams(BaseModel):
 # Cache for storing ranking system (could use Redis in production)
 ranking_cache = {}
 
+# Encoded /rankings bodies per (ranking cache key, top_n, include_games, after_rank, limit), with
+# identity/gzip/br variants. Validation and JSON encoding happen once per computed ranking, not once
+# per request; the least recently served bodies are dropped beyond RESPONSE_CACHE_SIZE
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+response_cache = OrderedDict()
+response_cache_lock = threading.Lock()
+
+# (Last-Modified, content version) of each cached ranking - its ETag is a digest of the ranked
+# teams and games plus the request parameters, so every recompute of unchanged games agrees on it
+ranking_versions = {}
+
+# Content digest per ranking cache key and when this process first saw it, kept across
+# invalidations so a recompute that finds the same games keeps its Last-Modified
+MAX_CONTENT_VERSIONS = 1024
+content_versions = OrderedDict()
+content_versions_lock = threading.Lock()
+
+# Teams of each cached ranking, sorted once - pages and streams slice this list
+ranking_order = {}
+
+# Cross-process tier behind the dicts above when running several workers (None for one worker)
+shared_cache = open_shared_cache()
+
+# Shared-cache generation each (season, season type, week) scope's in-process entries were filled under
+shared_generations = {}
+
+# One computation at a time per ranking: a request arriving while the warmer computes the
+# same ranking waits for it instead. Different rankings compute in parallel (COMPUTE_CONCURRENCY)
+compute_locks = {}
+compute_locks_guard = threading.Lock()
+
+# Bumped by every invalidation - a computation that started before one isn't cached
+invalidation_epoch = 0
+
+MAX_WEEK = 20  # Above any regular season or postseason week number
+
+def rankings_cache_key(
+    year: int,
+    season_type: str,
+    classification: str,
+    week: Optional[int],
+    formula_params: Optional[FormulaParams] = None
+) -> str:
+    """Cache key for a computed ranking system."""
+    # Include formula params in cache key
+    formula_key = ""
+    if formula_params:
+        formula_key = f"_{formula_params.win_loss_multiplier}_{formula_params.one_score_multiplier}_{formula_params.two_score_multiplier}_{formula_params.three_score_multiplier}_{formula_params.strength_of_schedule_multiplier}"
+    
+    return f"{year}_{season_type}_{classification}_{week}{formula_key}"
+
+def shared_generation(year: int, season_type: str, week: Optional[int]) -> Optional[str]:
+    """Current shared-cache generation for a ranking's scope, dropping this worker's stale copies."""
+    if shared_cache is None:
+        return None
+    scope = f"{year}_{season_type}_{week}"
+    generation = shared_cache.generation(year, scope)
+    if shared_generations.get(scope, generation) != generation:
+        invalidate_local(year, season_type, {week})  # Another worker invalidated it
+    shared_generations[scope] = generation
+    return generation
+
+def cached_response(response_key) -> Optional[dict]:
+    """Encoded /rankings body for a response key, marking it recently used."""
+    with response_cache_lock:
+        entry = response_cache.get(response_key)
+        if entry is not None:
+            response_cache.move_to_end(response_key)
+        return entry
+
+def store_response(response_key, entry: dict):
+    """Cache an encoded /rankings body, dropping the least recently used beyond RESPONSE_CACHE_SIZE."""
+    with response_cache_lock:
+        response_cache[response_key] = entry
+        response_cache.move_to_end(response_key)
+        while len(response_cache) > RESPONSE_CACHE_SIZE:
+            response_cache.popitem(last=False)
+
+def page_window(team_count: int, top_n: Optional[int], after_rank: Optional[int]):
+    """(top_n, after_rank) clamped to a ranking's team count, so equivalent requests share a response."""
+    if top_n is not None and top_n >= team_count:
+        top_n = None  # Every team
+    if after_rank is not None:
+        after_rank = min(after_rank, top_n or team_count)  # Past the end = an empty last page
+    return top_n, after_rank
+
+def compute_lock(cache_key: str) -> threading.Lock:
+    """The lock serializing computations of one ranking."""
+    with compute_locks_guard:
+        return compute_locks.setdefault(cache_key, threading.Lock())
+
 def get_or_create_rankings(
     year: int = 2025,
     season_type: str = "regular",
@@ -72,26 +209,116 @@ def get_or_create_rankings(
     formula_params: Optional[FormulaParams] = None
 ):
     """Get rankings from cache or compute them."""
-    # Include formula params in cache key
-    formula_key = ""
-    if formula_params:
-        formula_key = f"_{formula_params.win_loss_multiplier}_{formula_params.one_score_multiplier}_{formula_params.two_score_multiplier}_{formula_params.three_score_multiplier}_{formula_params.strength_of_schedule_multiplier}"
-    
-    cache_key = f"{year}_{season_type}_{classification}_{week}{formula_key}"
+    cache_key = rankings_cache_key(year, season_type, classification, week, formula_params)
+    generation = shared_generation(year, season_type, week)
     
     if cache_key in ranking_cache:
         return ranking_cache[cache_key]
     
+    lock = compute_lock(cache_key)
+    with lock:
+        try:
+            if cache_key in ranking_cache:
+                return ranking_cache[cache_key]  # Computed while we waited
+            epoch = invalidation_epoch
+            system, version = load_rankings(
+                cache_key, generation, year, season_type, classification, week, api_key, formula_params
+            )
+            
+            # Cache the result
+            if epoch == invalidation_epoch:
+                ranking_cache[cache_key] = system
+                ranking_versions[cache_key] = version
+        finally:
+            with compute_locks_guard:
+                if compute_locks.get(cache_key) is lock:
+                    del compute_locks[cache_key]  # Later callers find the cached ranking instead
+    return system
+
+# Cache misses (a CFBD fetch + solve) are rate limited per client and queued for a
+# worker thread; cache hits skip both and never wait behind a computation. /rankings
+# also charges encoding a response it has no cached body for
+rate_limiter = RateLimiter()
+compute_gate = ComputeGate()
+
+async def admitted_rankings(
+    request: Request,
+    year: int,
+    season_type: str,
+    classification: str,
+    week: Optional[int],
+    api_key: Optional[str] = None,
+    formula_params: Optional[FormulaParams] = None
+):
+    """Cached rankings right away; a miss is admitted (429/503 otherwise) and computed off the event loop."""
+    cache_key = rankings_cache_key(year, season_type, classification, week, formula_params)
+    shared_generation(year, season_type, week)
+    system = ranking_cache.get(cache_key)
+    if system is not None:
+        return system
+    
+    rate_limiter.check(request)
+    return await compute_gate.run(
+        cache_key,
+        lambda: get_or_create_rankings(year, season_type, classification, week, api_key, formula_params)
+    )
+
+def content_version(cache_key: str, system) -> tuple:
+    """(Last-Modified, version) of a computed ranking: a digest of the teams and games it
+    serves, and when this process first saw that digest for the cache key."""
+    rows = [team_row(team) for team in system.get_rankings(sort=True)]
+    digest = hashlib.sha1(encode_json([len(system.teams), rows])).hexdigest()[:20]
+    with content_versions_lock:
+        seen = content_versions.get(cache_key)
+        if seen is None:
+            seen = (datetime.utcnow(), digest)
+        elif seen[1] != digest:
+            # Last-Modified has whole-second resolution - a new version must move it
+            seen = (max(datetime.utcnow(), seen[0].replace(microsecond=0) + timedelta(seconds=1)), digest)
+        content_versions[cache_key] = seen
+        content_versions.move_to_end(cache_key)
+        while len(content_versions) > MAX_CONTENT_VERSIONS:
+            content_versions.popitem(last=False)
+    return seen
+
+def load_rankings(cache_key, generation, year, season_type, classification, week, api_key, formula_params):
+    """(system, (Last-Modified, version)) from the shared cache, or computed here."""
+    if shared_cache is None:
+        system = compute_rankings(year, season_type, classification, week, api_key, formula_params)
+        version = content_version(cache_key, system)
+    else:
+        # One worker computes, the others load its snapshot
+        computed = {}
+        
+        def compute():
+            system = computed["system"] = compute_rankings(
+                year, season_type, classification, week, api_key, formula_params
+            )
+            return {"snapshot": system.snapshot(), "version": content_version(cache_key, system)}
+        
+        entry = shared_cache.compute_once(f"ranking:{generation}:{cache_key}", compute)
+        if "system" in computed:
+            system = computed["system"]
+        else:
+            from cfb_ranking_system import RankingSystem
+            system = RankingSystem.from_snapshot(entry["snapshot"])
+        version = entry["version"]
+    return system, version
+
+def compute_rankings(
+    year: int,
+    season_type: str,
+    classification: str,
+    week: Optional[int],
+    api_key: Optional[str],
+    formula_params: Optional[FormulaParams]
+):
+    """Load a season's games and calculate rankings (no caching)."""
     # Import here to avoid circular imports
     from cfb_ranking_system import CFBDataAPI, RankingSystem, RankingFormula
     
-    # Update formula if custom params provided
-    if formula_params:
-        RankingFormula.WIN_LOSS_MULTIPLIER = formula_params.win_loss_multiplier
-        RankingFormula.ONE_SCORE_MULTIPLIER = formula_params.one_score_multiplier
-        RankingFormula.TWO_SCORE_MULTIPLIER = formula_params.two_score_multiplier
-        RankingFormula.THREE_SCORE_MULTIPLIER = formula_params.three_score_multiplier
-        RankingFormula.STRENGTH_OF_SCHEDULE_MULTIPLIER = formula_params.strength_of_schedule_multiplier
+    # The request's own formula - concurrent computations never share multipliers
+    formula = RankingFormula.with_params(**(formula_params or FormulaParams()).model_dump())
     
     # Use provided key or default
     if api_key is None:
@@ -113,80 +340,311 @@ def get_or_create_rankings(
     if len(system.teams) == 0:
         raise ValueError(f"No teams loaded. This could mean: (1) No games found for {year} {season_type} {classification}, (2) API key issue, or (3) API is down")
     
-    system.calculate_rankings(iterations=20)
-    
-    # Cache the result
-    ranking_cache[cache_key] = system
+    system.calculate_rankings(iterations=20, formula=formula)
     return system
 
-def format_team_response(team, rank: int) -> TeamResponse:
-    """Convert Team object to API response format."""
+# Plain-dict rows shaped like the response models. /rankings encodes these directly
+# (validating hundreds of nested models per computation costs more than the encode)
+def game_rows(team) -> List[dict]:
+    """A Team's game results as GameResultResponse-shaped dicts."""
     games = []
     for game in team.game_results:
         opp_wins, opp_losses = game.opponent.get_record()
-        games.append(GameResultResponse(
-            opponent=game.opponent.name,
-            opponent_record=f"{opp_wins}-{opp_losses}",
-            opponent_rank=game.opponent.ranking,
-            won=game.won,
-            margin=game.margin,
-            value=game.ranking_value
-        ))
-    
+        games.append({
+            "opponent": game.opponent.name,
+            "opponent_record": f"{opp_wins}-{opp_losses}",
+            "opponent_rank": round_float(game.opponent.ranking),
+            "won": game.won,
+            "margin": game.margin,
+            "value": round_float(game.ranking_value)
+        })
+    return games
+
+def team_row(team, include_games: bool = True) -> dict:
+    """A Team as a TeamResponse- (or TeamSummaryResponse-) shaped dict."""
     wins, losses = team.get_record()
-    return TeamResponse(
-        name=team.name,
-        wins=wins,
-        losses=losses,
-        ranking=team.ranking,
-        games=games
+    row = {
+        "name": team.name,
+        "wins": wins,
+        "losses": losses,
+        "ranking": round_float(team.ranking)
+    }
+    if include_games:
+        row["games"] = game_rows(team)
+    return row
+
+def format_game_results(team) -> List[GameResultResponse]:
+    """Convert a Team's game results to API response format."""
+    return [GameResultResponse(**game) for game in game_rows(team)]
+
+def format_team_response(team, rank: int) -> TeamResponse:
+    """Convert Team object to API response format."""
+    return TeamResponse(**team_row(team))
+
+def format_team_summary(team) -> TeamSummaryResponse:
+    """Convert Team object to the summary format (no per-game breakdown)."""
+    return TeamSummaryResponse(**team_row(team, include_games=False))
+
+def formula_query(
+    win_loss_multiplier: float = Query(1.0, description="Multiplier applied to base (+1 for win, -1 for loss)"),
+    one_score_multiplier: float = Query(1.0, description="Multiplier for 1-score games (≤8 pts)"),
+    two_score_multiplier: float = Query(1.3, description="Multiplier for 2-score games (9-16 pts)"),
+    three_score_multiplier: float = Query(1.5, description="Multiplier for 3+ score games (>16 pts)"),
+    strength_of_schedule_multiplier: float = Query(1.0, description="Multiplier for strength of schedule impact")
+) -> FormulaParams:
+    """Formula parameters from the query string."""
+    return FormulaParams(
+        win_loss_multiplier=win_loss_multiplier,
+        one_score_multiplier=one_score_multiplier,
+        two_score_multiplier=two_score_multiplier,
+        three_score_multiplier=three_score_multiplier,
+        strength_of_schedule_multiplier=strength_of_schedule_multiplier
     )
 
-@app.get("/rankings", response_model=RankingsResponse)
+def formula_preset(formula_params: FormulaParams) -> dict:
+    """Formula parameters that differ from the defaults ({} = default formula)."""
+    defaults = FormulaParams()
+    return {name: value for name, value in formula_params.model_dump().items() if getattr(defaults, name) != value}
+
+def sorted_rankings(cache_key: str, system) -> list:
+    """Teams of a cached ranking system in rank order."""
+    ranked = ranking_order.get(cache_key)
+    if ranked is None:
+        ranked = system.get_rankings(sort=True)
+        if ranking_cache.get(cache_key) is system:  # Not if an invalidation dropped it meanwhile
+            ranking_order[cache_key] = ranked
+    return ranked
+
+def ranking_version(cache_key: str, system) -> tuple:
+    """(Last-Modified, content version) of a cached ranking (rehashed if an invalidation dropped it meanwhile)."""
+    return ranking_versions.get(cache_key) or content_version(cache_key, system)
+
+def affected_weeks(weeks) -> Optional[set]:
+    """Ranking weeks whose games include any of these weeks (None = every week)."""
+    known = [week for week in weeks if week is not None]
+    if not known or len(known) < len(weeks):
+        return None
+    # A week-W ranking covers games up to week W; week=None covers the whole season
+    return {None, *range(min(known), MAX_WEEK + 1)}
+
+def in_scope(cache_key: str, year: int, season_type: Optional[str] = None, weeks: Optional[set] = None) -> bool:
+    key_year, key_type, _, key_week = cache_key.split("_", 4)[:4]
+    return (
+        key_year == str(year)
+        and (season_type is None or key_type == season_type)
+        and (weeks is None or key_week in {str(week) for week in weeks})
+    )
+
+def invalidate_weeks(year: int, season_type: str, weeks, token: Optional[str] = None):
+    """Drop cached rankings that include games from these weeks, in every worker."""
+    weeks = affected_weeks(weeks)
+    invalidate_local(year, season_type, weeks)
+    if shared_cache is None:
+        return
+    if weeks is None:
+        shared_cache.bump_generation(year, token=token)
+    else:
+        scopes = sorted(f"{year}_{season_type}_{week}" for week in weeks)
+        shared_cache.bump_generation(*scopes, token=token)
+
+def invalidate_local(year: int, season_type: Optional[str] = None, weeks: Optional[set] = None):
+    """Drop this worker's cached rankings and encoded responses in a season (type / weeks)."""
+    global invalidation_epoch
+    invalidation_epoch += 1
+    # Snapshot the keys - the warmer thread and the live-update poll fill these concurrently
+    for cache in (ranking_cache, ranking_versions, ranking_order):
+        for key in [key for key in list(cache) if in_scope(key, year, season_type, weeks)]:
+            cache.pop(key, None)
+    with response_cache_lock:
+        for key in [key for key in response_cache if in_scope(key[0], year, season_type, weeks)]:
+            del response_cache[key]
+
+def cached_seasons() -> set:
+    return {int(key.split("_", 1)[0]) for key in list(ranking_cache)}
+
+def summary_rows(params: dict) -> List[dict]:
+    """Summary rows (rank order) of a ranking, computing it if it isn't cached."""
+    system = get_or_create_rankings(**params)
+    cache_key = rankings_cache_key(
+        params["year"], params["season_type"], params["classification"], params["week"], params["formula_params"]
+    )
+    rows = []
+    for idx, team in enumerate(sorted_rankings(cache_key, system)):
+        wins, losses = team.get_record()
+        rows.append({"name": team.name, "rank": idx + 1, "ranking": round_float(team.ranking), "wins": wins, "losses": losses})
+    return rows
+
+def _live_updates_bind():
+    """Read engine for change detection, or None when no database is configured."""
+    try:
+        from db_models_complete import read_engine
+        return read_engine
+    except Exception as e:
+        print(f"Live ranking updates disabled: {e}")
+        return None
+
+def warm_ranking(year: int, season_type: str, preset: dict):
+    """Compute (and sort) the full-season FBS ranking for a formula preset, as /rankings would."""
+    params = dict(year=year, season_type=season_type, classification="fbs", week=None,
+                  formula_params=FormulaParams(**preset))
+    system = get_or_create_rankings(**params)
+    cache_key = rankings_cache_key(year, season_type, "fbs", None, params["formula_params"])
+    sorted_rankings(cache_key, system)
+
+# Rankings people ask for are recomputed in the background right after a sync
+warmer = CacheWarmer(warm_ranking)
+app.add_event_handler("shutdown", warmer.shutdown)
+
+@register_post_sync_hook
+def on_games_changed(year: int, season_type: str, weeks: set, token: Optional[str] = None):
+    """Post-sync hook: drop the affected weeks from the ranking cache and rewarm it."""
+    invalidate_weeks(year, season_type, weeks, token)
+    warmer.schedule(year, season_type)
+
+# One recompute per changed ranking, fanned out to every /rankings/stream client. Its change
+# poll also runs the post-sync hooks for syncs made by other processes (the nightly cron)
+broadcaster = RankingBroadcaster(summary_rows, run_post_sync_hooks, bind=_live_updates_bind(), watch=cached_seasons)
+app.add_event_handler("startup", broadcaster.start)
+app.add_event_handler("shutdown", broadcaster.stop)
+
+SSE_KEEPALIVE_SECONDS = 15
+
+def sse_event(event: str, data: dict) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + encode_json(data) + b"\n\n"
+
+def encoded_response(entry: dict, request: Request) -> Response:
+    """Serve a cached body (or a 304) in the best encoding the client accepts."""
+    not_modified = not_modified_response(request, entry["etag"], entry["last_modified"])
+    if not_modified:
+        return not_modified
+    
+    return encoded_body_response(
+        entry["variants"],
+        request.headers.get("accept-encoding"),
+        headers=cache_headers(entry["etag"], entry["last_modified"])
+    )
+
+@app.get(
+    "/rankings",
+    response_model=Union[RankingsResponse, RankingsSummaryResponse, RankingsPageResponse],
+    responses={
+        200: {
+            "description": "RankingsResponse; RankingsSummaryResponse with include_games=false; "
+                           "RankingsPageResponse with after_rank/limit; one team per line with format=ndjson",
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+        },
+        304: {"description": "Not modified since the ETag / Last-Modified the client sent"},
+    },
+)
 async def get_rankings(
+    request: Request,
     year: int = Query(2024, description="Season year"),
     season_type: str = Query("regular", description="Season type: regular or postseason"),
     classification: str = Query("fbs", description="Division: fbs, fcs, ii, or iii"),
     week: Optional[int] = Query(None, description="Specific week number (1-15)"),
-    top_n: Optional[int] = Query(None, description="Limit to top N teams"),
+    top_n: Optional[int] = Query(None, ge=1, description="Limit to top N teams"),
+    include_games: bool = Query(True, description="Embed each team's game results (false = summary rows only)"),
+    after_rank: Optional[int] = Query(None, ge=0, description="Cursor: return teams ranked below this rank"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size (teams per page)"),
+    response_format: str = Query("json", alias="format", pattern="^(json|ndjson)$",
+                                 description="json, or ndjson to stream one team per line"),
     api_key: Optional[str] = Query(None, description="College Football Data API key"),
-    # Formula parameters
-    win_loss_multiplier: float = Query(1.0, description="Multiplier applied to base (+1 for win, -1 for loss)"),
-    one_score_multiplier: float = Query(1.0, description="Multiplier for 1-score games (≤8 pts)"),
-    two_score_multiplier: float = Query(1.3, description="Multiplier for 2-score games (9-16 pts)"),
-    three_score_multiplier: float = Query(1.5, description="Multiplier for 3+ score games (>16 pts)"),
-    strength_of_schedule_multiplier: float = Query(1.0, description="Multiplier for strength of schedule impact")
+    formula_params: FormulaParams = Depends(formula_query)
 ):
     """
     Get rankings for all teams with customizable formula parameters.
+    
+    With include_games=false only rank, name, record and rating are returned;
+    fetch a team's games from /team/{team_name}/games with the same parameters.
+    
+    Large divisions can be paged with after_rank/limit (follow next_after_rank),
+    or streamed with format=ndjson: one team object per line, written as it is
+    serialized, with the totals in X-Total-Teams.
     """
     try:
-        formula_params = FormulaParams(
-            win_loss_multiplier=win_loss_multiplier,
-            one_score_multiplier=one_score_multiplier,
-            two_score_multiplier=two_score_multiplier,
-            three_score_multiplier=three_score_multiplier,
-            strength_of_schedule_multiplier=strength_of_schedule_multiplier
-        )
+        cache_key = rankings_cache_key(year, season_type, classification, week, formula_params)
+        paginated = after_rank is not None or limit is not None
+        generation = shared_generation(year, season_type, week)
         
-        system = get_or_create_rankings(year, season_type, classification, week, api_key, formula_params)
+        # A cached ranking comes straight back; the response key needs its team count
+        charged = cache_key not in ranking_cache  # admitted_rankings charges a ranking miss
+        system = await admitted_rankings(request, year, season_type, classification, week, api_key, formula_params)
+        warmer.tracker.record(formula_preset(formula_params))  # Only presets that were admitted
+        
+        ranked_teams = sorted_rankings(cache_key, system)
+        top_n, after_rank = page_window(len(ranked_teams), top_n, after_rank)
+        response_key = (cache_key, top_n, include_games, after_rank, limit)
+        entry = cached_response(response_key) if response_format == "json" else None
+        if entry is not None:
+            return encoded_response(entry, request)
+        
+        shared_key = f"response:{generation}:{response_key!r}"
+        if response_format == "json" and shared_cache is not None:
+            entry = shared_cache.get_object(shared_key)
+            if entry is not None:
+                store_response(response_key, entry)
+                return encoded_response(entry, request)
         
-        ranked_teams = system.get_rankings(sort=True)
         if top_n:
             ranked_teams = ranked_teams[:top_n]
         
-        teams_response = [
-            format_team_response(team, idx + 1) 
-            for idx, team in enumerate(ranked_teams)
-        ]
-        
-        return RankingsResponse(
-            teams=teams_response,
-            total_teams=len(system.teams),
-            year=year,
-            season_type=season_type,
-            classification=classification
-        )
+        start = after_rank or 0
+        end = min(start + limit, len(ranked_teams)) if limit else len(ranked_teams)
+        last_modified, version = ranking_version(cache_key, system)
+        etag = make_etag(cache_key, top_n, include_games, after_rank, limit, response_format, version)
+        
+        if response_format == "ndjson":
+            not_modified = not_modified_response(request, etag, last_modified)
+            if not_modified:
+                return not_modified
+        
+        # Encoding an uncached response or a stream is charged too (a miss that
+        # computed the ranking already was), so varying top_n/pages can't dodge the limit
+        if not charged:
+            rate_limiter.check(request)
+        
+        if response_format == "ndjson":
+            def stream_teams():
+                for idx in range(start, end):
+                    yield encode_json(team_row(ranked_teams[idx], include_games)) + b"\n"
+            
+            return StreamingResponse(
+                stream_teams(),
+                media_type="application/x-ndjson",
+                headers={
+                    "X-Total-Teams": str(len(system.teams)),
+                    "Content-Encoding": "identity",  # Keeps GZipMiddleware from buffering the stream
+                    **cache_headers(etag, last_modified)
+                }
+            )
+        
+        # Shaped like RankingsResponse / RankingsSummaryResponse / RankingsPageResponse
+        payload = {
+            "teams": [team_row(ranked_teams[idx], include_games) for idx in range(start, end)],
+            "total_teams": len(system.teams),
+            "year": year,
+            "season_type": season_type,
+            "classification": classification
+        }
+        if paginated:
+            payload.update(
+                after_rank=start,
+                limit=limit,
+                next_after_rank=end if end < len(ranked_teams) else None
+            )
+        body = encode_json(payload)
+        
+        entry = {
+            "variants": await asyncio.to_thread(compress_variants, body),  # gzip/br off the event loop
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+        store_response(response_key, entry)
+        if shared_cache is not None:
+            shared_cache.set_object(shared_key, entry)
+        return encoded_response(entry, request)
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -195,9 +653,98 @@ async def get_rankings(
         print(f"Error: {error_msg}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/rankings/stream")
+async def stream_ranking_updates(
+    request: Request,
+    year: int = Query(2024, description="Season year"),
+    season_type: str = Query("regular", description="Season type: regular or postseason"),
+    classification: str = Query("fbs", description="Division: fbs, fcs, ii, or iii"),
+    week: Optional[int] = Query(None, description="Specific week number (1-15)"),
+    api_key: Optional[str] = Query(None, description="College Football Data API key"),
+    formula_params: FormulaParams = Depends(formula_query)
+):
+    """
+    Server-Sent Events stream of ranking changes.
+    
+    Sends a `snapshot` event with the current summary rows, then a `rankings`
+    event with the changed rows (rank, rating, record, previous rank/rating)
+    each time the sync layer ingests new final scores for the season. A client
+    that falls too far behind gets a fresh `snapshot` (with "resync": true)
+    in place of the changes it missed.
+    """
+    cache_key = rankings_cache_key(year, season_type, classification, week, formula_params)
+    params = dict(year=year, season_type=season_type, classification=classification, week=week,
+                  api_key=api_key, formula_params=formula_params)
+    try:
+        await admitted_rankings(request, **params)  # The subscription's snapshot then reads the cache
+        queue, rows = await broadcaster.subscribe(cache_key, year, params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def events():
+        try:
+            yield sse_event("snapshot", {"season": year, "total_teams": len(rows), "teams": rows})
+            while not await request.is_disconnected():
+                try:
+                    update = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                yield sse_event("snapshot" if update.get("resync") else "rankings", update)
+        finally:
+            broadcaster.unsubscribe(cache_key, queue)
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",        # Don't let nginx-style proxies buffer events
+        "Content-Encoding": "identity",   # Keeps GZipMiddleware from buffering the stream
+    })
+
+@app.get("/team/{team_name}/games", response_model=TeamGamesResponse)
+async def get_team_games(
+    team_name: str,
+    request: Request,
+    response: Response,
+    year: int = Query(2024, description="Season year"),
+    season_type: str = Query("regular", description="Season type: regular or postseason"),
+    classification: str = Query("fbs", description="Division: fbs, fcs, ii, or iii"),
+    week: Optional[int] = Query(None, description="Specific week number (1-15)"),
+    api_key: Optional[str] = Query(None, description="College Football Data API key"),
+    formula_params: FormulaParams = Depends(formula_query)
+):
+    """
+    Game results for one team, from the same cached rankings as /rankings.
+    
+    Pass the same year/week/formula parameters as the /rankings request.
+    """
+    try:
+        system = await admitted_rankings(request, year, season_type, classification, week, api_key, formula_params)
+        
+        team = system.get_team(team_name)
+        if team is None:
+            raise HTTPException(status_code=404, detail=f"Team '{team_name}' not found")
+        
+        cache_key = rankings_cache_key(year, season_type, classification, week, formula_params)
+        last_modified, version = ranking_version(cache_key, system)
+        etag = make_etag(cache_key, team_name, "games", version)
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified:
+            return not_modified
+        response.headers.update(cache_headers(etag, last_modified))
+        
+        return TeamGamesResponse(name=team.name, games=format_game_results(team))
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/team/{team_name}", response_model=TeamResponse)
 async def get_team(
     team_name: str,
+    request: Request,
+    response: Response,
     year: int = Query(2024, description="Season year"),
     season_type: str = Query("regular", description="Season type"),
     classification: str = Query("fbs", description="Division"),
@@ -209,14 +756,22 @@ async def get_team(
     - **team_name**: Name of the team (case-sensitive)
     """
     try:
-        system = get_or_create_rankings(year, season_type, classification, None, api_key)
+        system = await admitted_rankings(request, year, season_type, classification, None, api_key)
         
-        if team_name not in system.teams:
+        team = system.get_team(team_name)
+        if team is None:
             raise HTTPException(status_code=404, detail=f"Team '{team_name}' not found")
         
-        team = system.teams[team_name]
-        ranked_teams = system.get_rankings(sort=True)
-        rank = next(i + 1 for i, t in enumerate(ranked_teams) if t.name == team_name)
+        cache_key = rankings_cache_key(year, season_type, classification, None)
+        last_modified, version = ranking_version(cache_key, system)
+        etag = make_etag(cache_key, team_name, version)
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified:
+            return not_modified
+        response.headers.update(cache_headers(etag, last_modified))
+        
+        ranked_teams = sorted_rankings(cache_key, system)
+        rank = next(i + 1 for i, t in enumerate(ranked_teams) if t is team)
         
         return format_team_response(team, rank)
     except HTTPException:
@@ -228,6 +783,11 @@ async def get_team(
 async def clear_cache():
     """Clear the rankings cache to force recalculation."""
     ranking_cache.clear()
+    response_cache.clear()
+    ranking_versions.clear()
+    ranking_order.clear()
+    if shared_cache is not None:
+        shared_cache.bump_generation('all')
     return {"message": "Cache cleared successfully"}
 
 @app.get("/health")
@@ -236,8 +796,9 @@ async def health_check():
     return {"status": "healthy"}
 
 # Serve React app (MUST BE LAST - after all API routes)
+# The build step writes the .gz/.br siblings (python compression.py dist)
 if os.path.exists("dist"):
-    app.mount("/", StaticFiles(directory="dist", html=True), name="static")
+    app.mount("/", PrecompressedStaticFiles(directory="dist", html=True), name="static")
 
 if __name__ == "__main__":
     import os
@@ -0,0 +1,207 @@
+# backfill.py - Parallel multi-season historical backfill
+#
+# Usage:
+#   python backfill.py --start 2014 --end 2024
+#   python backfill.py --start 2018 --end 2024 --datasets games,lines,sp --workers 4 --rps 8
+#   python backfill.py --start 2022 --end 2024 --datasets plays,play_stats,player_stats
+#
+# Each (dataset, season) job is checkpointed in sync_log as 'backfill_<dataset>',
+# so re-running the same command after an interruption skips finished jobs.
+
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from db_models_complete import SessionLocal, SyncLog, DATABASE_URL, init_db
+from sync_service_complete import CFBDataSyncService
+from sync_utils import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+def _sync_games(service: CFBDataSyncService, db: Session, season: int) -> List[Dict]:
+    return [
+        service.sync_games(db, season, 'regular'),
+        service.sync_games(db, season, 'postseason'),
+    ]
+
+
+def _bulk_both(method):
+    """Run a per-season bulk sync for the regular season and postseason"""
+    return lambda service, db, season: [
+        method(service, db, season, 'regular'),
+        method(service, db, season, 'postseason'),
+    ]
+
+# dataset name -> function(service, db, season) returning one or more sync results
+DATASETS = {
+    'games': _sync_games,
+    'rankings': lambda service, db, season: service.sync_ap_rankings(db, season),
+    'sp': lambda service, db, season: service.sync_sp_ratings(db, season),
+    'fpi': lambda service, db, season: service.sync_fpi_ratings(db, season),
+    'records': lambda service, db, season: service.sync_team_records(db, season),
+    'lines': lambda service, db, season: service.sync_betting_lines(db, season),
+    'recruiting': lambda service, db, season: service.sync_recruiting_rankings(db, season),
+    'plays': _bulk_both(CFBDataSyncService.sync_plays),
+    'play_stats': _bulk_both(CFBDataSyncService.sync_play_stats),
+    'player_stats': _bulk_both(CFBDataSyncService.sync_player_game_stats),
+}
+
+# Play-level datasets are large (COPY-loaded) - only backfilled when asked for
+DEFAULT_DATASETS = [d for d in DATASETS if d not in ('plays', 'play_stats', 'player_stats')]
+
+
+def completed_jobs(db: Session, seasons: List[int], datasets: List[str]) -> set:
+    """(dataset, season) pairs already checkpointed by an earlier backfill"""
+    rows = db.query(SyncLog.sync_type, SyncLog.season).filter(
+        SyncLog.sync_type.in_([f'backfill_{dataset}' for dataset in datasets]),
+        SyncLog.season.in_(seasons),
+        SyncLog.status == 'success'
+    ).all()
+    return {(sync_type[len('backfill_'):], season) for sync_type, season in rows}
+
+
+def run_job(service: CFBDataSyncService, dataset: str, season: int) -> Dict:
+    """Run one (dataset, season) sync in its own session and checkpoint it"""
+    db = SessionLocal()
+    started = time.monotonic()
+    log_entry = service._log_sync(db, f'backfill_{dataset}', season)
+    
+    try:
+        results = DATASETS[dataset](service, db, season)
+        if isinstance(results, dict):
+            results = [results]
+        
+        failed = [r.get('error') for r in results if r.get('success') is False]
+        added = sum(r.get('added', 0) for r in results)
+        updated = sum(r.get('updated', 0) for r in results)
+        unchanged = sum(r.get('unchanged', 0) for r in results)
+        
+        if failed:
+            service._complete_sync_log(db, log_entry, 'failed', added, updated,
+                                       error='; '.join(str(e) for e in failed), unchanged=unchanged)
+        else:
+            service._complete_sync_log(db, log_entry, 'success', added, updated, unchanged=unchanged)
+        
+        elapsed = time.monotonic() - started
+        rows = added + updated + unchanged
+        return {
+            'dataset': dataset, 'season': season, 'success': not failed,
+            'rows': rows, 'seconds': elapsed, 'error': '; '.join(str(e) for e in failed) or None
+        }
+    except Exception as e:
+        db.rollback()
+        service._complete_sync_log(db, log_entry, 'failed', error=str(e))
+        return {
+            'dataset': dataset, 'season': season, 'success': False,
+            'rows': 0, 'seconds': time.monotonic() - started, 'error': str(e)
+        }
+    finally:
+        db.close()
+
+
+def run_backfill(start_year: int, end_year: int, datasets: Optional[List[str]] = None,
+                 workers: int = 4, requests_per_second: float = 8.0,
+                 restart: bool = False, api_key: Optional[str] = None) -> Dict:
+    """Backfill every requested dataset for each season in [start_year, end_year]"""
+    api_key = api_key or os.getenv("CFBD_API_KEY")
+    if not api_key:
+        raise ValueError("CFBD_API_KEY not set")
+    
+    datasets = datasets or DEFAULT_DATASETS
+    unknown = [d for d in datasets if d not in DATASETS]
+    if unknown:
+        raise ValueError(f"Unknown datasets: {', '.join(unknown)} (choose from {', '.join(DATASETS)})")
+    rate_limiter = RateLimiter(requests_per_second)
+    
+    if DATABASE_URL.startswith("sqlite") and workers > 1:
+        logger.warning("SQLite allows a single writer, running backfill with 1 worker")
+        workers = 1
+    
+    init_db()
+    seasons = list(range(start_year, end_year + 1))
+    
+    # Teams first - every other dataset references them
+    service = CFBDataSyncService(api_key, rate_limiter=rate_limiter)
+    db = SessionLocal()
+    try:
+        service.sync_teams(db, 'fbs')
+        done = set() if restart else completed_jobs(db, seasons, datasets)
+    finally:
+        db.close()
+    
+    jobs = [(dataset, season) for season in seasons for dataset in datasets if (dataset, season) not in done]
+    if done:
+        logger.info(f"Resuming backfill: {len(done)} jobs already complete, {len(jobs)} remaining")
+    
+    started = time.monotonic()
+    results = []
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_job, service, dataset, season) for dataset, season in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            
+            rate = result['rows'] / result['seconds'] if result['seconds'] else 0.0
+            if result['success']:
+                logger.info(f"✓ {result['dataset']} {result['season']}: {result['rows']} rows "
+                            f"in {result['seconds']:.1f}s ({rate:.0f} rows/sec)")
+            else:
+                logger.error(f"✗ {result['dataset']} {result['season']}: {result['error']}")
+    
+    elapsed = time.monotonic() - started
+    total_rows = sum(r['rows'] for r in results)
+    failed = [r for r in results if not r['success']]
+    
+    logger.info("=" * 60)
+    logger.info(f"Backfill finished: {len(results) - len(failed)}/{len(results)} jobs succeeded, "
+                f"{total_rows} rows in {elapsed:.1f}s "
+                f"({total_rows / elapsed if elapsed else 0:.0f} rows/sec)")
+    if failed:
+        logger.info("Re-run the same command to retry failed jobs")
+    
+    return {
+        'jobs': len(results),
+        'failed': len(failed),
+        'skipped': len(done),
+        'rows': total_rows,
+        'seconds': elapsed,
+        'rows_per_second': total_rows / elapsed if elapsed else 0.0,
+        'results': results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill historical CFBD data into the database")
+    parser.add_argument('--start', type=int, required=True, help="First season (e.g. 2014)")
+    parser.add_argument('--end', type=int, required=True, help="Last season, inclusive")
+    parser.add_argument('--datasets', default=','.join(DEFAULT_DATASETS),
+                        help=f"Comma-separated datasets: {','.join(DATASETS)}")
+    parser.add_argument('--workers', type=int, default=4, help="Concurrent fetch/write jobs")
+    parser.add_argument('--rps', type=float, default=8.0, help="Max API requests per second across workers")
+    parser.add_argument('--restart', action='store_true', help="Ignore checkpoints and redo every job")
+    args = parser.parse_args()
+    
+    summary = run_backfill(
+        args.start, args.end,
+        datasets=[d.strip() for d in args.datasets.split(',') if d.strip()],
+        workers=args.workers,
+        requests_per_second=args.rps,
+        restart=args.restart
+    )
+    sys.exit(1 if summary['failed'] else 0)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    main()
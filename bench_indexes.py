@@ -0,0 +1,157 @@
+# bench_indexes.py - Query plans and latency before/after the composite query indexes
+#
+# Usage:
+#   python bench_indexes.py                      # throwaway SQLite database with synthetic data
+#   python bench_indexes.py --url postgresql://...  # existing database (indexes are dropped and recreated!)
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+
+from db_models_complete import Base, Game, Team, APRanking, TeamSP, ensure_indexes
+
+# Indexes added for the ranking loader and /team/{name}/details query shapes
+QUERY_INDEXES = [
+    ('games', 'idx_games_season_week'),
+    ('games', 'idx_games_completed_week'),
+    ('ap_rankings', 'idx_ap_rankings_team_id_season_week'),
+    ('team_sp_ratings', 'idx_team_sp_ratings_team_id_year'),
+    ('team_fpi_ratings', 'idx_team_fpi_ratings_team_id_year'),
+    ('team_records', 'idx_team_records_team_id_year'),
+    ('recruiting_teams', 'idx_recruiting_teams_team_id_year'),
+]
+
+QUERIES = {
+    'ranking load (season, week <= 8)': ("""
+        SELECT g.id, g.week, g.home_id, g.away_id, g.home_points, g.away_points,
+               ht.classification, at.classification
+        FROM games g
+        LEFT JOIN teams ht ON g.home_id = ht.api_id
+        LEFT JOIN teams at ON g.away_id = at.api_id
+        WHERE g.season = :season AND g.season_type = 'regular'
+            AND g.completed = true
+            AND g.home_points IS NOT NULL AND g.away_points IS NOT NULL
+            AND g.week <= 8
+        ORDER BY g.week, g.start_date
+    """, {"season": 2022}),
+    'latest AP rank for team': ("""
+        SELECT rank, points, week FROM ap_rankings
+        WHERE team_id = :team_id AND season = :season
+        ORDER BY week DESC LIMIT 1
+    """, {"team_id": 7, "season": 2022}),
+    'SP+ rating for team': ("""
+        SELECT rating, ranking FROM team_sp_ratings
+        WHERE team_id = :team_id AND year = :season
+    """, {"team_id": 7, "season": 2022}),
+}
+
+
+def populate(engine, seasons: int = 10, teams: int = 130, games_per_week: int = 60):
+    """Fill a fresh database with synthetic seasons of games, polls and ratings"""
+    rng = random.Random(42)
+    names = [f"Team {i}" for i in range(teams)]
+    
+    with engine.begin() as conn:
+        conn.execute(Team.__table__.insert(), [
+            {"api_id": i, "school": name, "classification": "fbs" if i < 100 else "fcs"}
+            for i, name in enumerate(names)
+        ])
+        
+        game_id = 1
+        games, polls, ratings = [], [], []
+        for season in range(2024 - seasons + 1, 2025):
+            for week in range(1, 16):
+                for _ in range(games_per_week):
+                    home, away = rng.sample(range(teams), 2)
+                    games.append({
+                        "id": game_id, "season": season, "week": week, "season_type": "regular",
+                        "start_date": f"{season}-09-{week:02d}T19:00:00.000Z", "completed": rng.random() < 0.95,
+                        "home_id": home, "away_id": away, "home_team": names[home], "away_team": names[away],
+                        "home_points": rng.randint(0, 56), "away_points": rng.randint(0, 56),
+                    })
+                    game_id += 1
+                for rank, team_id in enumerate(rng.sample(range(100), 25), 1):
+                    polls.append({"season": season, "season_type": "regular", "week": week, "poll": "AP Top 25",
+                                  "rank": rank, "team_id": team_id, "school": names[team_id]})
+            for i, name in enumerate(names):
+                ratings.append({"year": season, "team_id": i, "team": name, "rating": rng.gauss(0, 10), "ranking": i + 1})
+        
+        conn.execute(Game.__table__.insert(), games)
+        conn.execute(APRanking.__table__.insert(), polls)
+        conn.execute(TeamSP.__table__.insert(), ratings)
+
+
+def drop_query_indexes(engine):
+    with engine.begin() as conn:
+        for _, name in QUERY_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        if engine.dialect.name == 'sqlite':
+            conn.execute(text("ANALYZE"))
+
+
+def explain(conn, sql: str, params: dict) -> str:
+    if conn.dialect.name == 'postgresql':
+        rows = conn.execute(text(f"EXPLAIN ANALYZE {sql}"), params).fetchall()
+        return '\n'.join(f"    {row[0]}" for row in rows)
+    rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params).fetchall()
+    return '\n'.join(f"    {row[-1]}" for row in rows)
+
+
+def time_query(conn, sql: str, params: dict, runs: int) -> float:
+    """Median latency in milliseconds"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        conn.execute(text(sql), params).fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def run_queries(engine, label: str, runs: int) -> dict:
+    print(f"\n{'=' * 70}\n{label}\n{'=' * 70}")
+    results = {}
+    with engine.connect() as conn:
+        for name, (sql, params) in QUERIES.items():
+            latency = time_query(conn, sql, params, runs)
+            results[name] = latency
+            print(f"\n{name}: {latency:.3f} ms (median of {runs})")
+            print(explain(conn, sql, params))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the composite query indexes")
+    parser.add_argument('--url', help="Database URL (default: temporary SQLite file with synthetic data)")
+    parser.add_argument('--runs', type=int, default=50, help="Timed runs per query")
+    args = parser.parse_args()
+    
+    if args.url:
+        engine = create_engine(args.url)
+    else:
+        path = os.path.join(tempfile.mkdtemp(), 'bench_indexes.db')
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        populate(engine)
+    
+    drop_query_indexes(engine)
+    before = run_queries(engine, "BEFORE (single-column indexes only)", args.runs)
+    
+    ensure_indexes(engine)
+    if engine.dialect.name == 'sqlite':
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+    after = run_queries(engine, "AFTER (composite + partial indexes)", args.runs)
+    
+    print(f"\n{'=' * 70}\n{'Query':<36} {'Before':>10} {'After':>10} {'Speedup':>10}\n{'=' * 70}")
+    for name in QUERIES:
+        speedup = before[name] / after[name] if after[name] else float('inf')
+        print(f"{name:<36} {before[name]:>8.3f}ms {after[name]:>8.3f}ms {speedup:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
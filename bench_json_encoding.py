@@ -0,0 +1,84 @@
+# bench_json_encoding.py - Build + encode cost of a full-season /rankings payload
+#
+# Usage:
+#   python bench_json_encoding.py                   # 130 teams, 13 weeks (FBS season)
+#   python bench_json_encoding.py --teams 700       # all divisions
+#
+# Compares the old path (Pydantic response models, model_dump_json / stdlib json)
+# with the plain-row path /rankings uses now (stdlib json / orjson).
+
+import argparse
+import json
+import random
+import statistics
+import time
+
+from api import RankingsResponse, format_team_response, team_row
+from cfb_ranking_system import RankingSystem
+from json_encoding import orjson
+
+
+def synthetic_season(teams: int, weeks: int) -> RankingSystem:
+    rng = random.Random(42)
+    system = RankingSystem()
+    for week in range(1, weeks + 1):
+        order = rng.sample(range(teams), teams - teams % 2)
+        for i in range(0, len(order), 2):
+            system.add_game(f"Team {order[i]}", rng.randint(0, 56), f"Team {order[i + 1]}", rng.randint(0, 56),
+                            week=week)
+    system.calculate_rankings(iterations=20)
+    return system
+
+
+def time_it(fn, runs: int):
+    """(median milliseconds, last result)"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /rankings payload encoding")
+    parser.add_argument('--teams', type=int, default=130)
+    parser.add_argument('--weeks', type=int, default=13)
+    parser.add_argument('--runs', type=int, default=30, help="Timed runs per path")
+    args = parser.parse_args()
+    
+    system = synthetic_season(args.teams, args.weeks)
+    ranked = system.get_rankings(sort=True)
+    metadata = {"total_teams": len(system.teams), "year": 2024, "season_type": "regular", "classification": "fbs"}
+    
+    def build_models():
+        return RankingsResponse(teams=[format_team_response(team, i + 1) for i, team in enumerate(ranked)], **metadata)
+    
+    def build_rows():
+        return {"teams": [team_row(team) for team in ranked], **metadata}
+    
+    build_models_ms, models = time_it(build_models, args.runs)
+    build_rows_ms, rows = time_it(build_rows, args.runs)
+    
+    paths = [
+        ("models + model_dump_json", build_models_ms, lambda: models.model_dump_json().encode()),
+        ("models + stdlib json", build_models_ms, lambda: json.dumps(models.model_dump()).encode()),
+        ("rows + stdlib json", build_rows_ms, lambda: json.dumps(rows, separators=(",", ":")).encode()),
+    ]
+    if orjson is not None:
+        paths.append(("rows + orjson", build_rows_ms, lambda: orjson.dumps(rows)))
+    else:
+        print("orjson not installed - skipping the orjson path")
+    
+    print(f"\n{args.teams} teams, {args.weeks} weeks, median of {args.runs} runs\n")
+    print(f"{'Path':<28} {'Build':>9} {'Encode':>9} {'Total':>9} {'Size':>9} {'Encode MB/s':>12}")
+    print('-' * 80)
+    for name, build_ms, encode in paths:
+        encode_ms, body = time_it(encode, args.runs)
+        throughput = len(body) / 1e6 / (encode_ms / 1000) if encode_ms else float('inf')
+        print(f"{name:<28} {build_ms:>7.2f}ms {encode_ms:>7.2f}ms {build_ms + encode_ms:>7.2f}ms "
+              f"{len(body) / 1024:>7.1f}KB {throughput:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
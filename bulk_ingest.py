@@ -0,0 +1,144 @@
+# bulk_ingest.py - High-throughput staging + merge loads for play-by-play sized tables
+#
+# Rows are streamed into a temporary stage table - COPY FROM STDIN (CSV) on PostgreSQL,
+# batched executemany elsewhere - and merged into the target in a single statement:
+#
+#   key=[...]          upsert on the key columns (INSERT ... ON CONFLICT DO UPDATE)
+#   replace_by=[...]   delete target rows matching the staged values of these columns,
+#                      then insert everything (for tables without a natural row id)
+
+import csv
+import hashlib
+import io
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+COPY_NULL = '\\N'
+
+
+def stable_id(*parts) -> int:
+    """Deterministic positive 63-bit id for rows the API doesn't give an id"""
+    digest = hashlib.blake2b('|'.join('' if p is None else str(p) for p in parts).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') >> 1
+
+
+def _chunks(rows: Iterable[Sequence], size: int) -> Iterable[List[Sequence]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _copy_chunk(conn, stage: str, columns: List[str], chunk: List[Sequence]):
+    """COPY one chunk into the stage table from an in-memory CSV buffer"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in chunk:
+        writer.writerow([COPY_NULL if value is None else value for value in row])
+    buffer.seek(0)
+    
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {stage} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+
+def bulk_ingest(conn, table: str, columns: List[str], rows: Iterable[Sequence],
+                key: Optional[List[str]] = None, replace_by: Optional[List[str]] = None,
+                batch_size: int = 10000) -> Dict:
+    """Stage rows (tuples in `columns` order) and merge them into `table`.
+    
+    Runs on the caller's connection/transaction; the caller commits. Rows with a
+    duplicate key are collapsed to the last one seen, since a single upsert
+    statement can't touch the same target row twice.
+    
+    Staged rows matching an existing target row (on key, or on replace_by) are
+    counted as updated, the rest as inserted; replace_by also reports how many
+    target rows it deleted.
+    """
+    if bool(key) == bool(replace_by):
+        raise ValueError("Pass exactly one of key or replace_by")
+    
+    started = time.monotonic()
+    postgres = conn.dialect.name == 'postgresql'
+    stage = f"stage_{table}"
+    column_list = ', '.join(columns)
+    
+    if postgres:
+        conn.execute(text(f"CREATE TEMP TABLE {stage} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"))
+    else:
+        conn.execute(text(f"DROP TABLE IF EXISTS temp.{stage}"))
+        conn.execute(text(f"CREATE TEMP TABLE {stage} AS SELECT {column_list} FROM {table} WHERE 0"))
+    
+    insert_stage = text(f"INSERT INTO {stage} ({column_list}) VALUES ({', '.join(':' + c for c in columns)})")
+    key_index = [columns.index(c) for c in key] if key else None
+    delete_staged = text(f"DELETE FROM {stage} WHERE {' AND '.join(f'{c} = :{c}' for c in key or [])}")
+    seen = set()
+    staged = 0
+    
+    for chunk in _chunks(rows, batch_size):
+        if key_index:
+            deduped = {tuple(row[i] for i in key_index): row for row in chunk}
+            repeats = [row_key for row_key in deduped if row_key in seen]
+            if repeats:
+                # Keys already staged by an earlier chunk - keep the newer rows
+                conn.execute(delete_staged, [dict(zip(key, row_key)) for row_key in repeats])
+            seen.update(deduped)
+            chunk = list(deduped.values())
+            staged = len(seen)
+        else:
+            staged += len(chunk)
+        
+        if postgres:
+            _copy_chunk(conn, stage, columns, chunk)
+        else:
+            conn.execute(insert_stage, [dict(zip(columns, row)) for row in chunk])
+    
+    match_columns = key or replace_by
+    match = ' AND '.join(f"t.{c} = s.{c}" for c in match_columns)
+    updated = conn.execute(text(
+        f"SELECT COUNT(*) FROM {stage} s WHERE EXISTS (SELECT 1 FROM {table} t WHERE {match})"
+    )).scalar() or 0
+    deleted = 0
+    
+    if key:
+        updates = ', '.join(f"{c} = excluded.{c}" for c in columns if c not in key)
+        conn.execute(text(f"""
+            INSERT INTO {table} ({column_list})
+            SELECT {column_list} FROM {stage} WHERE true
+            ON CONFLICT ({', '.join(key)}) DO {'UPDATE SET ' + updates if updates else 'NOTHING'}
+        """))
+    else:
+        match = ' AND '.join(f"{table}.{c} = s.{c}" for c in replace_by)
+        deleted = conn.execute(text(
+            f"DELETE FROM {table} WHERE EXISTS (SELECT 1 FROM {stage} s WHERE {match})"
+        )).rowcount or 0
+        conn.execute(text(f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {stage}"))
+    
+    conn.execute(text(f"DROP TABLE IF EXISTS {stage}"))
+    
+    elapsed = time.monotonic() - started
+    stats = {
+        'rows': staged,
+        'inserted': staged - updated,
+        'updated': updated,
+        'deleted': deleted,
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(staged / elapsed) if elapsed else None,
+    }
+    logger.info(f"Bulk loaded {staged} rows into {table} ({stats['inserted']} new, {updated} updated) in {elapsed:.2f}s "
+                f"({stats['rows_per_second'] or 0} rows/sec, {'COPY' if postgres else 'executemany'})")
+    return stats
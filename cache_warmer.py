@@ -0,0 +1,113 @@
+# cache_warmer.py - Recompute the rankings people ask for as soon as a sync lands
+#
+# After a sync invalidates a season's rankings, the warmer recomputes the default
+# formula plus the configured and most-requested formula presets on a background
+# thread, so the first visitors after a sync hit a warm cache instead of paying for
+# the recompute.
+#
+#   WARM_FORMULA_PRESETS='[{"three_score_multiplier": 2.0}]'  # Always warmed (JSON list)
+#   WARM_POPULAR_PRESETS=3                                    # Plus the top N of the last 7 days
+
+import json
+import logging
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+WARM_FORMULA_PRESETS = json.loads(os.getenv("WARM_FORMULA_PRESETS", "[]"))
+WARM_POPULAR_PRESETS = int(os.getenv("WARM_POPULAR_PRESETS", "3"))
+USAGE_WINDOW_DAYS = 7
+MAX_TRACKED_PRESETS = 1000  # Distinct presets counted per day; new ones beyond this are ignored
+
+
+def preset_key(preset: Dict) -> Tuple:
+    """Hashable form of a formula preset (sorted field/value pairs)"""
+    return tuple(sorted(preset.items()))
+
+
+class UsageTracker:
+    """Requests per formula preset over the last `days` days, in daily buckets"""
+    
+    def __init__(self, days: int = USAGE_WINDOW_DAYS, max_presets: int = MAX_TRACKED_PRESETS):
+        self.days = days
+        self.max_presets = max_presets
+        self.buckets: Dict[date, Counter] = {}
+        self.lock = threading.Lock()
+    
+    def record(self, preset: Dict):
+        if not preset:
+            return  # The default formula is always warmed
+        today = date.today()
+        with self.lock:
+            bucket = self.buckets.get(today)
+            if bucket is None:
+                bucket = self.buckets[today] = Counter()
+                cutoff = today - timedelta(days=self.days)
+                for day in [day for day in self.buckets if day <= cutoff]:
+                    del self.buckets[day]
+            key = preset_key(preset)
+            if key in bucket or len(bucket) < self.max_presets:
+                bucket[key] += 1
+    
+    def most_common(self, n: int) -> List[Dict]:
+        cutoff = date.today() - timedelta(days=self.days)
+        totals = Counter()
+        with self.lock:
+            for day, bucket in self.buckets.items():
+                if day > cutoff:
+                    totals.update(bucket)
+        return [dict(key) for key, _ in totals.most_common(n)]
+
+
+class CacheWarmer:
+    """Queues ranking recomputes for a season on one background thread.
+    
+    warm(season, season_type, preset) computes and caches one ranking; preset
+    is a dict of formula parameters ({} = the default formula).
+    """
+    
+    def __init__(self, warm: Callable[[int, str, Dict], None], tracker: Optional[UsageTracker] = None,
+                 presets: Optional[List[Dict]] = None, popular: int = WARM_POPULAR_PRESETS):
+        self.warm = warm
+        self.tracker = tracker or UsageTracker()
+        self.configured = WARM_FORMULA_PRESETS if presets is None else presets
+        self.popular = popular
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-warmer")
+        self.pending = set()  # (season, season_type) queued but not started, so bursts warm once
+        self.lock = threading.Lock()
+    
+    def presets(self) -> List[Dict]:
+        """Default formula first, then configured presets, then the most requested ones"""
+        presets, seen = [], set()
+        for preset in [{}, *self.configured, *self.tracker.most_common(self.popular)]:
+            if preset_key(preset) not in seen:
+                seen.add(preset_key(preset))
+                presets.append(preset)
+        return presets
+    
+    def schedule(self, season: int, season_type: str):
+        with self.lock:
+            if (season, season_type) in self.pending:
+                return
+            self.pending.add((season, season_type))
+        self.executor.submit(self._run, season, season_type)
+    
+    def _run(self, season: int, season_type: str):
+        with self.lock:
+            self.pending.discard((season, season_type))
+        
+        presets = self.presets()
+        for preset in presets:
+            try:
+                self.warm(season, season_type, preset)
+            except Exception as e:
+                logger.warning(f"Cache warm failed for {season} {season_type} {preset or 'default'}: {e}")
+        logger.info(f"Warmed {len(presets)} rankings for {season} {season_type}")
+    
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
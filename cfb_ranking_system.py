@@ -23,8 +23,9 @@ class GameResult:
 class Team:
     """Represents a college football team."""
     
-    def __init__(self, name: str):
+    def __init__(self, name: str, team_id: Optional[int] = None):
         self.name = name
+        self.id = team_id if team_id is not None else name  # Key in RankingSystem.teams
         self.game_results: List[GameResult] = []
         self.ranking = 0.0
     
@@ -53,12 +54,26 @@ class RankingFormula:
     """Encapsulates the ranking calculation logic with configurable parameters."""
     
     # Class variables that can be modified to customize the formula
+    # (or use with_params for a customized copy that leaves these untouched)
     WIN_LOSS_MULTIPLIER = 1.0
     ONE_SCORE_MULTIPLIER = 1.0      # Margin ≤ 8 points
     TWO_SCORE_MULTIPLIER = 1.3      # Margin 9-16 points
     THREE_SCORE_MULTIPLIER = 1.5    # Margin > 16 points
     STRENGTH_OF_SCHEDULE_MULTIPLIER = 1.0
     
+    @classmethod
+    def with_params(cls, win_loss_multiplier: float = 1.0, one_score_multiplier: float = 1.0,
+                    two_score_multiplier: float = 1.3, three_score_multiplier: float = 1.5,
+                    strength_of_schedule_multiplier: float = 1.0) -> type:
+        """A formula with its own multipliers, safe to use while other threads calculate."""
+        return type(cls.__name__, (cls,), {
+            'WIN_LOSS_MULTIPLIER': win_loss_multiplier,
+            'ONE_SCORE_MULTIPLIER': one_score_multiplier,
+            'TWO_SCORE_MULTIPLIER': two_score_multiplier,
+            'THREE_SCORE_MULTIPLIER': three_score_multiplier,
+            'STRENGTH_OF_SCHEDULE_MULTIPLIER': strength_of_schedule_multiplier,
+        })
+    
     @classmethod
     def calculate(cls, game_result: GameResult, opponent_rank: float) -> float:
         """
@@ -140,26 +155,44 @@ class RankingSystem:
     """Main ranking system that orchestrates teams and calculations."""
     
     def __init__(self):
-        self.teams: dict = {}
+        self.teams: dict = {}      # API team id (school name if unknown) -> Team
         self.fbs_teams: set = set()
+        self.team_keys: dict = {}  # school name -> key in self.teams
     
-    def add_team(self, name: str) -> Team:
-        """Get or create a team."""
-        if name not in self.teams:
-            self.teams[name] = Team(name)
-        return self.teams[name]
+    def add_team(self, name: str, team_id: Optional[int] = None) -> Team:
+        """Get or create a team, keyed by API id when known and by school name otherwise."""
+        key = team_id if team_id is not None else self.team_keys.get(name, name)
+        team = self.teams.get(key)
+        if team is None:
+            if team_id is not None and name in self.teams:
+                # Seen on name-only rows so far - re-key it under its id
+                team = self.teams.pop(name)
+                team.id = team_id
+                if name in self.fbs_teams:
+                    self.fbs_teams.discard(name)
+                    self.fbs_teams.add(team_id)
+            else:
+                team = Team(name, team_id)
+            self.teams[key] = team
+            self.team_keys[name] = key
+        return team
+    
+    def get_team(self, name: str) -> Optional[Team]:
+        """Look up a team by school name."""
+        return self.teams.get(self.team_keys.get(name, name))
     
     def add_game(self, home_name: str, home_score: int, away_name: str, away_score: int,
-                 home_fbs: bool = True, away_fbs: bool = True, week: Optional[int] = None):
+                 home_fbs: bool = True, away_fbs: bool = True, week: Optional[int] = None,
+                 home_id: Optional[int] = None, away_id: Optional[int] = None):
         """Add a completed game to the system."""
-        home_team = self.add_team(home_name)
-        away_team = self.add_team(away_name)
+        home_team = self.add_team(home_name, home_id)
+        away_team = self.add_team(away_name, away_id)
         
         # Track FBS teams
         if home_fbs:
-            self.fbs_teams.add(home_name)
+            self.fbs_teams.add(home_team.id)
         if away_fbs:
-            self.fbs_teams.add(away_name)
+            self.fbs_teams.add(away_team.id)
         
         margin = home_score - away_score
         
@@ -223,14 +256,16 @@ class RankingSystem:
             self.add_game(
                 home_team, game.get('homePoints'),
                 away_team, game.get('awayPoints'),
-                home_fbs, away_fbs, week_num
+                home_fbs, away_fbs, week_num,
+                home_id=game.get('homeId'), away_id=game.get('awayId')
             )
             games_added += 1
         
         print(f"Loaded {games_added} games")
         print(f"Total teams: {len(self.teams)}, FBS teams: {len(self.fbs_teams)}")
     
-    def calculate_rankings(self, iterations: int = 20, convergence_threshold: float = 0.01):
+    def calculate_rankings(self, iterations: int = 20, convergence_threshold: float = 0.01,
+                           formula: type = RankingFormula):
         """Iteratively calculate rankings until convergence."""
         # Initialize
         for team in self.teams.values():
@@ -242,7 +277,7 @@ class RankingSystem:
             old_rankings = {name: team.ranking for name, team in self.teams.items()}
             
             # Update game values based on current opponent rankings
-            self._update_game_values()
+            self._update_game_values(formula)
             
             # Update team rankings
             for team in self.teams.values():
@@ -261,20 +296,54 @@ class RankingSystem:
             print(f"Completed {iterations} iterations")
         
         # Final update to match final rankings
-        self._update_game_values()
+        self._update_game_values(formula)
     
-    def _update_game_values(self):
+    def _update_game_values(self, formula: type = RankingFormula):
         """Recalculate all game values based on current rankings."""
         for team in self.teams.values():
             for game in team.game_results:
                 # Update opponent FBS status
-                game.opponent_fbs = game.opponent.name in self.fbs_teams
+                game.opponent_fbs = game.opponent.id in self.fbs_teams
                 # Calculate value using formula
-                game.ranking_value = RankingFormula.calculate(game, game.opponent.ranking)
+                game.ranking_value = formula.calculate(game, game.opponent.ranking)
+    
+    def snapshot(self) -> dict:
+        """Flat copy of a computed system (teams, games, ratings) for sharing between processes.
+        
+        Teams reference each other through their games, so the object graph is too
+        deep to pickle directly; this keeps only lists of plain values.
+        """
+        keys = list(self.teams)
+        index = {key: i for i, key in enumerate(keys)}
+        teams = [(key, team.name, team.id, team.ranking) for key, team in self.teams.items()]
+        games = [
+            (index[key], index[game.opponent.id], game.won, game.margin, game.opponent_fbs, game.week, game.ranking_value)
+            for key, team in self.teams.items() for game in team.game_results
+        ]
+        return {'teams': teams, 'games': games, 'fbs_teams': list(self.fbs_teams), 'team_keys': self.team_keys}
+    
+    @classmethod
+    def from_snapshot(cls, data: dict) -> 'RankingSystem':
+        """Rebuild a computed system from snapshot() without recalculating"""
+        system = cls()
+        teams = []
+        for key, name, team_id, ranking in data['teams']:
+            team = Team(name)
+            team.id = team_id
+            team.ranking = ranking
+            system.teams[key] = team
+            teams.append(team)
+        for team_idx, opponent_idx, won, margin, opponent_fbs, week, ranking_value in data['games']:
+            game = GameResult(teams[opponent_idx], won, margin, opponent_fbs, week)
+            game.ranking_value = ranking_value
+            teams[team_idx].add_game(game)
+        system.fbs_teams = set(data['fbs_teams'])
+        system.team_keys = dict(data['team_keys'])
+        return system
     
     def get_rankings(self, sort: bool = True) -> List[Team]:
         """Get ranked list of FBS teams only."""
-        teams = [t for name, t in self.teams.items() if name in self.fbs_teams]
+        teams = [t for key, t in self.teams.items() if key in self.fbs_teams]
         if sort:
             teams.sort(key=lambda t: t.ranking, reverse=True)
         return teams
@@ -297,11 +366,11 @@ class RankingSystem:
     
     def print_team_details(self, team_name: str):
         """Print detailed game results for a specific team."""
-        if team_name not in self.teams:
+        team = self.get_team(team_name)
+        if team is None:
             print(f"Team '{team_name}' not found.")
             return
         
-        team = self.teams[team_name]
         wins, losses = team.get_record()
         
         print(f"\n{team.name} ({wins}-{losses}) - Ranking: {team.ranking:.2f}")
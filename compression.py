@@ -0,0 +1,177 @@
+# compression.py - gzip/brotli content negotiation and precompressed static assets
+#
+# Usage:
+#   python compression.py dist        # write .gz/.br siblings for compressible build assets
+#
+# Cached API payloads are compressed once when the cache is filled (compress_variants)
+# and the best variant is picked per request (negotiate). PrecompressedStaticFiles
+# serves the .br/.gz siblings written by precompress_directory instead of the originals.
+
+import argparse
+import gzip
+import logging
+import mimetypes
+import os
+from typing import Dict, Iterable, Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+try:
+    import brotli
+except ImportError:  # gzip only when brotli isn't installed
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Preference order when the client accepts several with the same q-value
+ENCODINGS = ['br', 'gzip']
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+COMPRESSIBLE_EXTENSIONS = {'.html', '.js', '.mjs', '.css', '.json', '.svg', '.txt', '.map', '.xml', '.ico', '.webmanifest'}
+MIN_SIZE = 1024  # Smaller files aren't worth the Content-Encoding overhead
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5        # Per-payload API variants: fast enough to run on cache fill
+BROTLI_STATIC_QUALITY = 11  # Build assets are compressed once, so use the maximum
+
+
+def available_encodings() -> list:
+    return [encoding for encoding in ENCODINGS if encoding != 'br' or brotli is not None]
+
+
+def negotiate(accept_encoding: Optional[str], available: Iterable[str]) -> Optional[str]:
+    """Best encoding from `available` for an Accept-Encoding header (None = identity)"""
+    if not accept_encoding:
+        return None
+    
+    weights = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name.strip().lower()] = q
+    
+    candidates = [
+        (weights.get(encoding, weights.get('*', 0.0)), -ENCODINGS.index(encoding), encoding)
+        for encoding in available if encoding in ENCODINGS
+    ]
+    candidates = [c for c in candidates if c[0] > 0]
+    return max(candidates)[2] if candidates else None
+
+
+def compress_variants(body: bytes, brotli_quality: int = BROTLI_QUALITY) -> Dict[str, bytes]:
+    """Encoded copies of a body keyed by content-coding ('identity' is the original)"""
+    variants = {'identity': body, 'gzip': gzip.compress(body, compresslevel=GZIP_LEVEL)}
+    if brotli is not None:
+        variants['br'] = brotli.compress(body, quality=brotli_quality)
+    return variants
+
+
+def encoded_body_response(variants: Dict[str, bytes], accept_encoding: Optional[str],
+                          media_type: str = "application/json", headers: Optional[Dict] = None) -> Response:
+    """Response with the best precompressed variant for the client"""
+    headers = {"Vary": "Accept-Encoding", **(headers or {})}
+    encoding = negotiate(accept_encoding, [e for e in variants if e != 'identity'])
+    if encoding:
+        headers["Content-Encoding"] = encoding
+        return Response(content=variants[encoding], media_type=media_type, headers=headers)
+    return Response(content=variants['identity'], media_type=media_type, headers=headers)
+
+# ==================== STATIC ASSETS ====================
+
+def _compressible(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in COMPRESSIBLE_EXTENSIONS
+
+
+def precompress_directory(directory: str, force: bool = False) -> Dict[str, int]:
+    """Write .gz (and .br) siblings for compressible files that lack a current one"""
+    written = skipped = 0
+    encodings = available_encodings()
+    
+    for root, _, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            if not _compressible(path) or os.path.getsize(path) < MIN_SIZE:
+                continue
+            
+            mtime = os.path.getmtime(path)
+            stale = [
+                encoding for encoding in encodings
+                if force or not os.path.exists(path + SUFFIXES[encoding])
+                or os.path.getmtime(path + SUFFIXES[encoding]) < mtime
+            ]
+            if not stale:
+                skipped += 1
+                continue
+            
+            with open(path, 'rb') as f:
+                data = f.read()
+            for encoding in stale:
+                if encoding == 'br':
+                    compressed = brotli.compress(data, quality=BROTLI_STATIC_QUALITY)
+                else:
+                    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+                with open(path + SUFFIXES[encoding], 'wb') as f:
+                    f.write(compressed)
+            written += 1
+    
+    logger.info(f"Precompressed {written} assets in {directory} ({skipped} already current, "
+                f"encodings: {', '.join(encodings)})")
+    return {'written': written, 'skipped': skipped}
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves a file's .br/.gz sibling when the client accepts it"""
+    
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        full_path = str(full_path)
+        if not _compressible(full_path):
+            return super().file_response(full_path, stat_result, scope, status_code)
+        
+        request_headers = Headers(scope=scope)
+        siblings = {}
+        for encoding, suffix in SUFFIXES.items():
+            try:
+                siblings[encoding] = os.stat(full_path + suffix)
+            except OSError:
+                continue
+        
+        headers = {"Vary": "Accept-Encoding"}
+        encoding = negotiate(request_headers.get("accept-encoding"), siblings)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            response = FileResponse(
+                full_path + SUFFIXES[encoding], status_code=status_code, headers=headers,
+                media_type=mimetypes.guess_type(full_path)[0] or "text/plain",
+                stat_result=siblings[encoding]
+            )
+        else:
+            response = FileResponse(full_path, status_code=status_code, headers=headers, stat_result=stat_result)
+        
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Write .gz/.br siblings for built static assets")
+    parser.add_argument('directory', nargs='?', default='dist')
+    parser.add_argument('--force', action='store_true', help="Recompress even if siblings are current")
+    args = parser.parse_args()
+    
+    if brotli is None:
+        logger.warning("brotli not installed, writing .gz only")
+    precompress_directory(args.directory, args.force)
+
+
+if __name__ == "__main__":
+    main()
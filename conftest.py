@@ -0,0 +1,11 @@
+# conftest.py - Keep test runs off the working database
+#
+# Without DATABASE_URL the models fall back to ./cfb_rankings.db; point that fallback
+# at a throwaway file instead. Set DATABASE_URL to run against a real database.
+
+import os
+import tempfile
+
+os.environ.setdefault(
+    "DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="cfb_rankings_test_"), "cfb_rankings.db")
+)
@@ -0,0 +1,99 @@
+# db_async.py - Async read sessions for the API endpoints
+#
+# Uses SQLAlchemy's asyncio extension on the read database: asyncpg for PostgreSQL,
+# aiosqlite for the local SQLite fallback. When the async driver isn't installed the
+# dependency falls back to running the regular read session in a worker thread, so
+# handlers can always `await db.execute(...)` without blocking the event loop.
+
+import asyncio
+import importlib
+import logging
+from typing import AsyncIterator, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from db_models_complete import DATABASE_READ_URL, ReadSessionLocal, _engine_kwargs
+
+logger = logging.getLogger(__name__)
+
+# sync scheme -> (async scheme, driver module)
+ASYNC_DRIVERS = {
+    'postgresql': ('postgresql+asyncpg', 'asyncpg'),
+    'postgresql+psycopg2': ('postgresql+asyncpg', 'asyncpg'),
+    'sqlite': ('sqlite+aiosqlite', 'aiosqlite'),
+}
+
+
+def async_url(url: str) -> Optional[str]:
+    """The async-driver form of a database URL, or None if its driver isn't installed"""
+    scheme, sep, rest = url.partition('://')
+    if scheme not in ASYNC_DRIVERS:
+        return None
+    
+    async_scheme, driver = ASYNC_DRIVERS[scheme]
+    try:
+        importlib.import_module(driver)
+    except ImportError:
+        return None
+    return f"{async_scheme}{sep}{rest}"
+
+
+ASYNC_READ_URL = async_url(DATABASE_READ_URL)
+
+if ASYNC_READ_URL:
+    read_async_engine: Optional[AsyncEngine] = create_async_engine(
+        ASYNC_READ_URL, **_engine_kwargs(DATABASE_READ_URL, "DB_READ")
+    )
+    AsyncReadSessionLocal = async_sessionmaker(read_async_engine, expire_on_commit=False, autoflush=False)
+    logger.info(f"Async read engine created ({ASYNC_READ_URL.split(':', 1)[0]})")
+else:
+    read_async_engine = None
+    AsyncReadSessionLocal = None
+    logger.warning("No async database driver installed (asyncpg/aiosqlite), "
+                   "async reads will run the sync session in a worker thread")
+
+
+class ThreadedReadSession:
+    """Awaitable stand-in for AsyncSession backed by a sync session in a worker thread.
+    
+    The sync session is opened on the first query, so requests that never
+    reach the database don't check anything out of the read pool.
+    """
+    
+    def __init__(self):
+        self._session = None
+    
+    def _execute(self, statement, params):
+        if self._session is None:
+            self._session = ReadSessionLocal()
+        # Buffer rows inside the worker so iterating the result never touches the connection
+        return self._session.execute(statement, params).freeze()
+    
+    async def execute(self, statement, params=None):
+        frozen = await asyncio.to_thread(self._execute, statement, params)
+        return frozen()
+    
+    async def close(self):
+        if self._session is not None:
+            await asyncio.to_thread(self._session.close)
+            self._session = None
+
+
+async def get_async_read_db() -> AsyncIterator[AsyncSession]:
+    """Async session on the read pool for API queries"""
+    if AsyncReadSessionLocal is None:
+        db = ThreadedReadSession()
+        try:
+            yield db
+        finally:
+            await db.close()
+        return
+    
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engine():
+    """Close pooled async connections (call on application shutdown)"""
+    if read_async_engine is not None:
+        await read_async_engine.dispose()
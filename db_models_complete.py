@@ -2,11 +2,14 @@
 
 from sqlalchemy import (
     create_engine, Column, Integer, String, Boolean, TIMESTAMP, 
-    DECIMAL, ARRAY, JSON, Float, Text, ForeignKey, Index, BigInteger
+    DECIMAL, ARRAY, JSON, Float, Text, ForeignKey, Index, BigInteger,
+    inspect, text, bindparam
 )
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
+from typing import Optional, List
 import os
 import logging
 
@@ -26,25 +29,46 @@ else:
         logger.info("Fixed DATABASE_URL scheme from postgres:// to postgresql://")
     logger.info(f"Connecting to database: {DATABASE_URL.split('@')[0] if '@' in DATABASE_URL else '***'}@***")
 
-# Create engine with connection pooling settings
-engine_kwargs = {
-    'pool_pre_ping': True,  # Test connections before using
-    'pool_recycle': 3600,   # Recycle connections after 1 hour
-}
+# Separate read/write engines: API reads get their own pool (optionally on a replica)
+# so long-running syncs can't starve user-facing queries of connections
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL") or DATABASE_URL
+if DATABASE_READ_URL.startswith("postgres://"):
+    DATABASE_READ_URL = DATABASE_READ_URL.replace("postgres://", "postgresql://", 1)
+
+def _engine_kwargs(url: str, prefix: str) -> dict:
+    """Engine settings, with pool sizing from <prefix>_POOL_SIZE / _MAX_OVERFLOW / _POOL_TIMEOUT"""
+    kwargs = {
+        'pool_pre_ping': True,  # Test connections before using
+        'pool_recycle': 3600,   # Recycle connections after 1 hour
+    }
+    
+    # Add SQLite-specific settings if using SQLite
+    if url.startswith("sqlite"):
+        kwargs['connect_args'] = {'check_same_thread': False}
+    else:
+        kwargs['pool_size'] = int(os.getenv(f"{prefix}_POOL_SIZE", "5"))
+        kwargs['max_overflow'] = int(os.getenv(f"{prefix}_MAX_OVERFLOW", "10"))
+        kwargs['pool_timeout'] = float(os.getenv(f"{prefix}_POOL_TIMEOUT", "30"))
+    return kwargs
 
-# Add SQLite-specific settings if using SQLite
 if DATABASE_URL.startswith("sqlite"):
-    engine_kwargs['connect_args'] = {'check_same_thread': False}
     logger.info("Using SQLite with thread-safe settings")
 
+POOL_SETTINGS = {
+    'write': _engine_kwargs(DATABASE_URL, "DB_WRITE"),
+    'read': _engine_kwargs(DATABASE_READ_URL, "DB_READ"),
+}
+
 try:
-    engine = create_engine(DATABASE_URL, **engine_kwargs)
+    engine = create_engine(DATABASE_URL, **POOL_SETTINGS['write'])
+    read_engine = create_engine(DATABASE_READ_URL, **POOL_SETTINGS['read'])
     logger.info("Database engine created successfully")
 except Exception as e:
     logger.error(f"Failed to create database engine: {e}")
     raise
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 Base = declarative_base()
 
 # ==================== CORE ENTITIES ====================
@@ -54,6 +78,7 @@ class Team(Base):
     __tablename__ = "teams"
     
     id = Column(Integer, primary_key=True, index=True)
+    api_id = Column(Integer, unique=True, index=True)  # API team ID - games.home_id / away_id point here
     school = Column(String(100), unique=True, nullable=False, index=True)
     mascot = Column(String(100))
     abbreviation = Column(String(10))
@@ -83,6 +108,8 @@ class Team(Base):
     location_grass = Column(Boolean)
     location_dome = Column(Boolean)
     
+    content_hash = Column(String(40))  # Fingerprint of the last synced payload
+    
     created_at = Column(TIMESTAMP, default=datetime.utcnow)
     updated_at = Column(TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -141,7 +168,7 @@ class Game(Base):
     venue_id = Column(Integer)
     venue = Column(String(200))
     
-    home_id = Column(Integer)
+    home_id = Column(Integer, index=True)
     home_team = Column(String(100), nullable=False, index=True)
     home_conference = Column(String(100))
     home_division = Column(String(50))
@@ -151,7 +178,7 @@ class Game(Base):
     home_pregame_elo = Column(Integer)
     home_postgame_elo = Column(Integer)
     
-    away_id = Column(Integer)
+    away_id = Column(Integer, index=True)
     away_team = Column(String(100), nullable=False, index=True)
     away_conference = Column(String(100))
     away_division = Column(String(50))
@@ -165,8 +192,18 @@ class Game(Base):
     highlights = Column(String(500))
     notes = Column(Text)
     
+    content_hash = Column(String(40))  # Fingerprint of the last synced payload
+    
     created_at = Column(TIMESTAMP, default=datetime.utcnow)
     updated_at = Column(TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        # Season/week scans (sync planner, API filters)
+        Index('idx_games_season_week', 'season', 'season_type', 'week'),
+        # Ranking loads: completed games of a season, ordered by week and kickoff
+        Index('idx_games_completed_week', 'season', 'season_type', 'week', 'start_date',
+              postgresql_where=text('completed = true'), sqlite_where=text('completed = true')),
+    )
 
 class GameLine(Base):
     """Mirror of /lines endpoint"""
@@ -247,13 +284,15 @@ class Drive(Base):
     """Mirror of /drives endpoint"""
     __tablename__ = "drives"
     
-    id = Column(BigInteger, primary_key=True, index=True)
+    id = Column(BigInteger, primary_key=True, autoincrement=False, index=True)
     game_id = Column(Integer, nullable=False, index=True)
-    season = Column(Integer, nullable=False)
+    season = Column(Integer, primary_key=True)  # Partition key
     week = Column(Integer)
     
+    offense_id = Column(Integer, index=True)
     offense = Column(String(100), nullable=False, index=True)
     offense_conference = Column(String(100))
+    defense_id = Column(Integer, index=True)
     defense = Column(String(100), nullable=False)
     defense_conference = Column(String(100))
     
@@ -277,20 +316,25 @@ class Drive(Base):
     is_home_offense = Column(Boolean)
     
     created_at = Column(TIMESTAMP, default=datetime.utcnow)
+    
+    # Partitioned by season on PostgreSQL - see ensure_season_partitions()
+    __table_args__ = {'postgresql_partition_by': 'LIST (season)'}
 
 class Play(Base):
     """Mirror of /plays endpoint"""
     __tablename__ = "plays"
     
-    id = Column(BigInteger, primary_key=True, index=True)
+    id = Column(BigInteger, primary_key=True, autoincrement=False, index=True)
     drive_id = Column(BigInteger, index=True)
     game_id = Column(Integer, nullable=False, index=True)
-    season = Column(Integer, nullable=False)
+    season = Column(Integer, primary_key=True)  # Partition key
     week = Column(Integer)
     
+    offense_id = Column(Integer, index=True)
     offense = Column(String(100), index=True)
     offense_conference = Column(String(100))
     offense_score = Column(Integer)
+    defense_id = Column(Integer, index=True)
     defense = Column(String(100))
     defense_conference = Column(String(100))
     defense_score = Column(Integer)
@@ -319,16 +363,20 @@ class Play(Base):
     garbage_time = Column(Boolean)
     
     created_at = Column(TIMESTAMP, default=datetime.utcnow)
+    
+    # Partitioned by season on PostgreSQL - see ensure_season_partitions()
+    __table_args__ = {'postgresql_partition_by': 'LIST (season)'}
 
 class PlayStat(Base):
     """Mirror of /play/stats endpoint"""
     __tablename__ = "play_stats"
     
-    id = Column(BigInteger, primary_key=True, index=True)
+    id = Column(BigInteger, primary_key=True, autoincrement=False, index=True)
     play_id = Column(BigInteger, index=True)
     game_id = Column(Integer, index=True)
-    season = Column(Integer)
+    season = Column(Integer, primary_key=True)  # Partition key
     week = Column(Integer)
+    team_id = Column(Integer, index=True)
     team = Column(String(100))
     conference = Column(String(100))
     opponent = Column(String(100))
@@ -340,6 +388,9 @@ class PlayStat(Base):
     stat = Column(Integer)
     
     created_at = Column(TIMESTAMP, default=datetime.utcnow)
+    
+    # Partitioned by season on PostgreSQL - see ensure_season_partitions()
+    __table_args__ = {'postgresql_partition_by': 'LIST (season)'}
 
 class PlayType(Base):
     """Mirror of /play/types endpoint"""
@@ -395,6 +446,7 @@ class TeamRecord(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     year = Column(Integer, nullable=False, index=True)
+    team_id = Column(Integer, index=True)
     team = Column(String(100), nullable=False, index=True)
     conference = Column(String(100))
     division = Column(String(50))
@@ -422,6 +474,10 @@ class TeamRecord(Base):
     expected_wins = Column(Float)
     
     created_at = Column(TIMESTAMP, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_team_records_team_id_year', 'team_id', 'year'),
+    )
 
 class TeamTalent(Base):
     """Mirror of /talent endpoint"""
@@ -485,6 +541,7 @@ class TeamSP(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     year = Column(Integer, nullable=False, index=True)
+    team_id = Column(Integer, index=True)
     team = Column(String(100), nullable=False, index=True)
     conference = Column(String(100))
     
@@ -519,6 +576,10 @@ class TeamSP(Base):
     special_teams_rating = Column(Float)
     
     created_at = Column(TIMESTAMP, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_team_sp_ratings_team_id_year', 'team_id', 'year'),
+    )
 
 class TeamSRS(Base):
     """Mirror of /ratings/srs endpoint - Simple Rating System"""
@@ -540,6 +601,7 @@ class TeamFPI(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     year = Column(Integer, nullable=False, index=True)
+    team_id = Column(Integer, index=True)
     team = Column(String(100), nullable=False, index=True)
     conference = Column(String(100))
     fpi = Column(Float)
@@ -551,6 +613,10 @@ class TeamFPI(Base):
     game_control = Column(Float)
     
     created_at = Column(TIMESTAMP, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_team_fpi_ratings_team_id_year', 'team_id', 'year'),
+    )
 
 class TeamElo(Base):
     """Mirror of /ratings/elo endpoint"""
@@ -642,12 +708,18 @@ class APRanking(Base):
     week = Column(Integer, index=True)
     poll = Column(String(50), index=True)
     rank = Column(Integer)
+    team_id = Column(Integer, index=True)
     school = Column(String(100), nullable=False, index=True)
     conference = Column(String(100))
     first_place_votes = Column(Integer)
     points = Column(Integer)
     
     created_at = Column(TIMESTAMP, default=datetime.utcnow)
+    
+    __table_args__ = (
+        # Latest poll position for a team: filter (school, season), newest week first
+        Index('idx_ap_rankings_team_id_season_week', 'team_id', 'season', 'week'),
+    )
 
 # ==================== RECRUITING ====================
 
@@ -658,10 +730,15 @@ class RecruitingTeam(Base):
     id = Column(Integer, primary_key=True, index=True)
     year = Column(Integer, nullable=False, index=True)
     rank = Column(Integer)
+    team_id = Column(Integer, index=True)
     team = Column(String(100), nullable=False, index=True)
     points = Column(Float)
     
     created_at = Column(TIMESTAMP, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_recruiting_teams_team_id_year', 'team_id', 'year'),
+    )
 
 class Recruit(Base):
     """Mirror of /recruiting/players endpoint"""
@@ -931,6 +1008,25 @@ class CustomRanking(Base):
     formula_params = Column(JSON)
     computed_at = Column(TIMESTAMP, default=datetime.utcnow)
 
+class SeasonGameSummary(Base):
+    """Completed games pre-joined for the ranking engine - rebuilt per season by refresh_game_summary()"""
+    __tablename__ = "season_game_summary"
+    
+    game_id = Column(Integer, primary_key=True)
+    season = Column(Integer, nullable=False)
+    season_type = Column(String(20), nullable=False)
+    week = Column(Integer)
+    
+    home_id = Column(Integer, nullable=False)
+    away_id = Column(Integer, nullable=False)
+    margin = Column(Integer, nullable=False)  # home_points - away_points
+    home_fbs = Column(Boolean, nullable=False)
+    away_fbs = Column(Boolean, nullable=False)
+    
+    __table_args__ = (
+        Index('idx_season_game_summary_lookup', 'season', 'season_type', 'week'),
+    )
+
 # ==================== SYNC TRACKING ====================
 
 class SyncLog(Base):
@@ -945,10 +1041,179 @@ class SyncLog(Base):
     status = Column(String(20), index=True)
     records_added = Column(Integer, default=0)
     records_updated = Column(Integer, default=0)
+    records_unchanged = Column(Integer, default=0)
     error_message = Column(Text)
     started_at = Column(TIMESTAMP, default=datetime.utcnow, index=True)
     completed_at = Column(TIMESTAMP)
 
+class SyncWatermark(Base):
+    """High-water marks used to plan incremental syncs"""
+    __tablename__ = "sync_watermarks"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    dataset = Column(String(50), nullable=False)
+    season = Column(Integer, nullable=False)
+    season_type = Column(String(20), nullable=False)
+    
+    last_completed_week = Column(Integer)  # Every game up to this week has started
+    last_game_start = Column(String(50))   # Latest start_date among completed games
+    incomplete_game_ids = Column(JSON)     # Started games that are not final yet
+    
+    updated_at = Column(TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_sync_watermarks_lookup', 'dataset', 'season', 'season_type', unique=True),
+    )
+
+# ==================== SEASON PARTITIONS ====================
+
+# Play-by-play tables partitioned by LIST (season) on PostgreSQL
+PARTITIONED_TABLES = ['drives', 'plays', 'play_stats']
+
+def _partition_name(table: str, season: int) -> str:
+    return f"{table}_{int(season)}"
+
+def _is_partitioned(conn, table: str) -> bool:
+    return conn.execute(text("""
+        SELECT 1 FROM pg_partitioned_table pt
+        JOIN pg_class c ON c.oid = pt.partrelid
+        WHERE c.oid = to_regclass(:table)
+    """), {"table": table}).first() is not None
+
+def _table_exists(conn, name: str) -> bool:
+    return conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None
+
+def ensure_season_partitions(seasons: Optional[List[int]] = None, bind=None) -> List[str]:
+    """Create missing per-season partitions (plus a DEFAULT catch-all) on PostgreSQL.
+    
+    Defaults to every season in games plus the current and next season. Rows
+    already sitting in the default partition for a season are moved into the
+    new partition. No-op on other databases.
+    """
+    bind = bind or engine
+    if bind.dialect.name != 'postgresql':
+        return []
+    
+    created = []
+    with bind.begin() as conn:
+        if seasons is None:
+            now = datetime.utcnow()
+            current = now.year if now.month >= 8 else now.year - 1  # Jan bowls belong to last season
+            seasons = {row[0] for row in conn.execute(text("SELECT DISTINCT season FROM games")) if row[0]}
+            seasons.update({current, current + 1})
+        
+        for table in PARTITIONED_TABLES:
+            if not _is_partitioned(conn, table):
+                logger.warning(f"{table} is not a partitioned table - recreate it to enable season partitions")
+                continue
+            
+            default = f"{table}_default"
+            if not _table_exists(conn, default):
+                conn.execute(text(f"CREATE TABLE {default} PARTITION OF {table} DEFAULT"))
+                created.append(default)
+            
+            for season in sorted(seasons):
+                partition = _partition_name(table, season)
+                if _table_exists(conn, partition):
+                    continue
+                
+                # Build and fill the partition first so attaching it doesn't trip over
+                # rows for this season that landed in the default partition
+                conn.execute(text(f"CREATE TABLE {partition} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+                conn.execute(text(f"INSERT INTO {partition} SELECT * FROM {default} WHERE season = {int(season)}"))
+                conn.execute(text(f"DELETE FROM {default} WHERE season = {int(season)}"))
+                conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {partition} FOR VALUES IN ({int(season)})"))
+                created.append(partition)
+    
+    if created:
+        logger.info(f"Created partitions: {', '.join(created)}")
+    return created
+
+def truncate_season(table: str, season: int, bind=None):
+    """Remove one season of play-by-play data - a partition TRUNCATE on PostgreSQL"""
+    if table not in PARTITIONED_TABLES:
+        raise ValueError(f"{table} is not season-partitioned")
+    
+    bind = bind or engine
+    with bind.begin() as conn:
+        partition = _partition_name(table, season)
+        if bind.dialect.name == 'postgresql' and _table_exists(conn, partition):
+            conn.execute(text(f"TRUNCATE {partition}"))
+        else:
+            conn.execute(text(f"DELETE FROM {table} WHERE season = :season"), {"season": season})
+    logger.info(f"Cleared {table} for {season}")
+
+def detach_season(table: str, season: int, drop: bool = False, bind=None) -> Optional[str]:
+    """Detach a season partition (PostgreSQL), optionally dropping it; returns the detached table.
+    
+    Other databases have no partitions: drop=True deletes the season's rows
+    instead, and a plain detach is a logged no-op. Both return None.
+    """
+    if table not in PARTITIONED_TABLES:
+        raise ValueError(f"{table} is not season-partitioned")
+    
+    bind = bind or engine
+    if bind.dialect.name != 'postgresql':
+        if drop:
+            truncate_season(table, season, bind)
+        else:
+            logger.warning(f"Not detaching {table} {season}: season partitions require PostgreSQL")
+        return None
+    
+    partition = _partition_name(table, season)
+    with bind.begin() as conn:
+        if not _table_exists(conn, partition):
+            return None
+        conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {partition}"))
+        if drop:
+            conn.execute(text(f"DROP TABLE {partition}"))
+    
+    logger.info(f"{'Dropped' if drop else 'Detached'} partition {partition}")
+    return None if drop else partition
+
+def swap_season(table: str, season: int, staging_table: str, bind=None):
+    """Replace a season partition with a fully loaded staging table in one transaction.
+    
+    The staging table should be created with create_season_staging() so its
+    columns and constraints match the parent. Without partitions (other
+    databases) the season's rows are replaced by the staging rows instead,
+    still in one transaction, and the staging table is dropped.
+    """
+    if table not in PARTITIONED_TABLES:
+        raise ValueError(f"{table} is not season-partitioned")
+    
+    bind = bind or engine
+    if bind.dialect.name != 'postgresql':
+        with bind.begin() as conn:
+            conn.execute(text(f"DELETE FROM {table} WHERE season = :season"), {"season": season})
+            conn.execute(text(f"INSERT INTO {table} SELECT * FROM {staging_table} WHERE season = :season"),
+                         {"season": season})
+            conn.execute(text(f"DROP TABLE {staging_table}"))
+        logger.info(f"Replaced {table} {season} with the rows of {staging_table}")
+        return
+    
+    partition = _partition_name(table, season)
+    with bind.begin() as conn:
+        if _table_exists(conn, partition):
+            conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {partition}"))
+            conn.execute(text(f"DROP TABLE {partition}"))
+        conn.execute(text(f"ALTER TABLE {staging_table} RENAME TO {partition}"))
+        conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {partition} FOR VALUES IN ({int(season)})"))
+    logger.info(f"Swapped {staging_table} in as {partition}")
+
+def create_season_staging(table: str, season: int, bind=None) -> str:
+    """Create an empty table shaped like a partition, to load a season before swap_season()"""
+    bind = bind or engine
+    staging = f"{_partition_name(table, season)}_staging"
+    with bind.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+        if bind.dialect.name != 'postgresql':
+            conn.execute(text(f"CREATE TABLE {staging} AS SELECT * FROM {table} WHERE 1 = 0"))
+            return staging
+        conn.execute(text(f"CREATE TABLE {staging} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+        conn.execute(text(f"ALTER TABLE {staging} ADD CHECK (season = {int(season)})"))
+    return staging
+
 # ==================== UTILITY FUNCTIONS ====================
 
 def get_db():
@@ -958,16 +1223,213 @@ def get_db():
     finally:
         db.close()
 
+def get_read_db():
+    """Session on the read pool (replica when DATABASE_READ_URL is set) for API queries"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def pool_status() -> dict:
+    """Connection pool usage for the write and read engines"""
+    status = {}
+    for name, eng in (('write', engine), ('read', read_engine)):
+        pool = eng.pool
+        if not hasattr(pool, 'checkedout'):
+            status[name] = {'pool': type(pool).__name__}
+            continue
+        
+        # Overflow limit as configured (QueuePool's default of 10 when not set)
+        max_overflow = POOL_SETTINGS[name].get('max_overflow', 10)
+        capacity = pool.size() + max(max_overflow, 0)
+        checked_out = pool.checkedout()
+        status[name] = {
+            'pool': type(pool).__name__,
+            'size': pool.size(),
+            'max_overflow': max_overflow,
+            'timeout': pool.timeout(),
+            'checked_out': checked_out,
+            'checked_in': pool.checkedin(),
+            'overflow': max(pool.overflow(), 0),
+            'saturation': round(checked_out / capacity, 3) if capacity else None,
+        }
+    status['replica'] = DATABASE_READ_URL != DATABASE_URL
+    return status
+
 def init_db():
     """Initialize all tables"""
     try:
         logger.info("Creating database tables...")
         Base.metadata.create_all(bind=engine)
+        _add_missing_columns()
+        ensure_indexes()
+        ensure_season_partitions()
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Failed to create database tables: {e}")
         raise
 
+def _add_missing_columns():
+    """Add columns introduced after a table was first created.
+    
+    create_all() only creates missing tables, so new (nullable) columns on
+    existing tables are added here with ALTER TABLE.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            
+            existing_columns = {col['name'] for col in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                logger.info(f"Added column {table.name}.{column.name}")
+
+def ensure_indexes(bind=None):
+    """Create any model index missing from an existing table.
+    
+    create_all() skips tables that already exist, so indexes added to a
+    model later (e.g. the composite query indexes) are created here.
+    """
+    bind = bind or engine
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        
+        existing_indexes = {idx['name'] for idx in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(bind=bind)
+                logger.info(f"Created index {index.name} on {table.name}")
+
+# (table, integer team column, school name column) - ids are the API team ids in teams.api_id
+TEAM_ID_COLUMNS = [
+    ('games', 'home_id', 'home_team'),
+    ('games', 'away_id', 'away_team'),
+    ('drives', 'offense_id', 'offense'),
+    ('drives', 'defense_id', 'defense'),
+    ('plays', 'offense_id', 'offense'),
+    ('plays', 'defense_id', 'defense'),
+    ('play_stats', 'team_id', 'team'),
+    ('ap_rankings', 'team_id', 'school'),
+    ('team_sp_ratings', 'team_id', 'team'),
+    ('team_fpi_ratings', 'team_id', 'team'),
+    ('team_records', 'team_id', 'team'),
+    ('recruiting_teams', 'team_id', 'team'),
+]
+
+def backfill_team_ids(bind=None, tables: Optional[List[str]] = None) -> int:
+    """Fill integer team columns still NULL from their school name.
+    
+    Rows written before teams.api_id existed only carry the name; this
+    resolves them once so readers can join and filter on the integer ids.
+    Only the given tables are resolved when `tables` is set.
+    """
+    bind = bind or engine
+    filled = 0
+    
+    def _run(conn):
+        nonlocal filled
+        for table, id_column, name_column in TEAM_ID_COLUMNS:
+            if tables is not None and table not in tables:
+                continue
+            result = conn.execute(text(f"""
+                UPDATE {table} SET {id_column} = (
+                    SELECT t.api_id FROM teams t WHERE t.school = {table}.{name_column}
+                )
+                WHERE {id_column} IS NULL
+                    AND {name_column} IN (SELECT school FROM teams WHERE api_id IS NOT NULL)
+            """))
+            filled += result.rowcount or 0
+    
+    if isinstance(bind, Engine):
+        with bind.begin() as conn:
+            _run(conn)
+    else:
+        _run(bind)
+    
+    if filled:
+        logger.info(f"Resolved {filled} team ids from school names")
+    return filled
+
+def refresh_game_summary(bind=None, seasons: Optional[List[int]] = None) -> int:
+    """Rebuild season_game_summary rows for the given seasons (all seasons if None).
+    
+    Replaces each season's rows with its completed, scored games joined to
+    team classifications, so ranking loads read one narrow pre-filtered table.
+    Games stored without team ids are resolved through teams.school; a season
+    with games that still can't be resolved is left unsummarized, so loaders
+    fall back to reading its games directly instead of silently losing them.
+    """
+    bind = bind or engine
+    season_filter = "AND g.season IN :seasons" if seasons is not None else ""
+    delete_sql = "DELETE FROM season_game_summary" + (" WHERE season IN :seasons" if seasons is not None else "")
+    games_sql = f"""
+        FROM games g
+        LEFT JOIN teams ht ON ht.api_id = g.home_id OR (g.home_id IS NULL AND ht.school = g.home_team)
+        LEFT JOIN teams at ON at.api_id = g.away_id OR (g.away_id IS NULL AND at.school = g.away_team)
+        WHERE g.completed = true
+            AND g.home_points IS NOT NULL
+            AND g.away_points IS NOT NULL
+            {season_filter}
+    """
+    unresolved_sql = f"""
+        SELECT DISTINCT g.season {games_sql}
+            AND (COALESCE(g.home_id, ht.api_id) IS NULL OR COALESCE(g.away_id, at.api_id) IS NULL)
+    """
+    insert_sql = f"""
+        INSERT INTO season_game_summary
+        (game_id, season, season_type, week, home_id, away_id, margin, home_fbs, away_fbs)
+        SELECT
+            g.id, g.season, g.season_type, g.week,
+            COALESCE(g.home_id, ht.api_id), COALESCE(g.away_id, at.api_id),
+            g.home_points - g.away_points,
+            LOWER(COALESCE(ht.classification, 'fbs')) = 'fbs',
+            LOWER(COALESCE(at.classification, 'fbs')) = 'fbs'
+        {games_sql}
+            AND g.season NOT IN :unresolved
+        ORDER BY g.season, g.season_type, g.week, g.start_date
+    """
+    
+    params = {}
+    delete_stmt, unresolved_stmt = text(delete_sql), text(unresolved_sql)
+    insert_stmt = text(insert_sql).bindparams(bindparam('unresolved', expanding=True))
+    if seasons is not None:
+        if not seasons:
+            return 0
+        params["seasons"] = list(seasons)
+        delete_stmt = delete_stmt.bindparams(bindparam('seasons', expanding=True))
+        unresolved_stmt = unresolved_stmt.bindparams(bindparam('seasons', expanding=True))
+        insert_stmt = insert_stmt.bindparams(bindparam('seasons', expanding=True))
+    
+    def _run(conn):
+        unresolved = [season for (season,) in conn.execute(unresolved_stmt, params)]
+        if unresolved:
+            logger.warning(f"Not summarizing seasons {unresolved}: some games have teams with no API id "
+                           f"(sync teams, then refresh the summary)")
+        conn.execute(delete_stmt, params)
+        return conn.execute(insert_stmt, dict(params, unresolved=unresolved)).rowcount or 0
+    
+    if isinstance(bind, Engine):
+        with bind.begin() as conn:
+            rows = _run(conn)
+    else:
+        rows = _run(bind)
+    
+    logger.info(f"Refreshed game summary for {seasons if seasons is not None else 'all seasons'}: {rows} games")
+    return rows
+
 def drop_all():
     """Drop all tables (use with caution!)"""
     logger.warning("Dropping all database tables...")
@@ -7,13 +7,34 @@ These integrate seamlessly with your existing code structure.
 
 INTEGRATION INSTRUCTIONS:
 1. Add these imports at the top of api.py (if not already present):
+   import hmac
+   from fastapi import Header
    from sqlalchemy import text
+   from sqlalchemy.ext.asyncio import AsyncSession
+   from db_models_complete import get_db, pool_status
+   from db_async import get_async_read_db, dispose_async_engine
+   from http_cache import revalidate
+   from json_encoding import FastJSONResponse
    
+   and dispose the async pool on shutdown:
+   app.add_event_handler("shutdown", dispose_async_engine)
+
 2. Copy the endpoints below into your api.py file after your existing endpoints
-   
+
 3. Replace 'sync_service_complete' with your actual sync service import if different
 """
 
+# ==================== ADMIN AUTH ====================
+
+ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
+
+def require_admin_key(x_admin_key: Optional[str] = Header(None)):
+    """Reject requests without the X-Admin-Key header matching ADMIN_API_KEY (closed when it is unset)"""
+    if not ADMIN_API_KEY:
+        raise HTTPException(status_code=503, detail="ADMIN_API_KEY not configured")
+    if not x_admin_key or not hmac.compare_digest(x_admin_key, ADMIN_API_KEY):
+        raise HTTPException(status_code=401, detail="Invalid admin key")
+
 # ==================== ENHANCED SYNC ENDPOINTS ====================
 
 @app.post("/admin/sync-all")
@@ -60,7 +81,7 @@ async def sync_all_data(
             "total_updated": result["total_updated"],
             "details": result["results"]
         }
-        
+    
     except Exception as e:
         logger.error(f"Sync all failed: {e}")
         raise HTTPException(status_code=500, detail=f"Sync failed: {str(e)}")
@@ -86,7 +107,7 @@ async def sync_rankings(
             raise HTTPException(status_code=500, detail=result.get("error"))
         
         return result
-        
+    
     except HTTPException:
         raise
     except Exception as e:
@@ -114,7 +135,7 @@ async def sync_sp_ratings(
             raise HTTPException(status_code=500, detail=result.get("error"))
         
         return result
-        
+    
     except HTTPException:
         raise
     except Exception as e:
@@ -142,7 +163,7 @@ async def sync_fpi_ratings(
             raise HTTPException(status_code=500, detail=result.get("error"))
         
         return result
-        
+    
     except HTTPException:
         raise
     except Exception as e:
@@ -169,7 +190,7 @@ async def sync_team_records(
             raise HTTPException(status_code=500, detail=result.get("error"))
         
         return result
-        
+    
     except HTTPException:
         raise
     except Exception as e:
@@ -197,7 +218,7 @@ async def sync_betting_lines(
             raise HTTPException(status_code=500, detail=result.get("error"))
         
         return result
-        
+    
     except HTTPException:
         raise
     except Exception as e:
@@ -224,7 +245,7 @@ async def sync_recruiting(
             raise HTTPException(status_code=500, detail=result.get("error"))
         
         return result
-        
+    
     except HTTPException:
         raise
     except Exception as e:
@@ -236,17 +257,24 @@ async def sync_recruiting(
 
 @app.get("/rankings/ap")
 async def get_ap_rankings(
+    request: Request,
+    response: Response,
     season: int = Query(..., description="Season year"),
     week: Optional[int] = Query(None, description="Specific week"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get AP Poll rankings from database"""
     try:
+        # ETag from the last ap_rankings sync that changed rows - unchanged data is a 304
+        not_modified = await revalidate(db, request, response, ['ap_rankings'], season, "/rankings/ap", week)
+        if not_modified:
+            return not_modified
+        
         query = """
-            SELECT season, week, season_type, team, rank, 
+            SELECT season, week, season_type, school, rank, 
                    first_place_votes, points
             FROM ap_rankings
-            WHERE season = :season
+            WHERE season = :season AND poll = 'AP Top 25'
         """
         params = {"season": season}
         
@@ -256,7 +284,7 @@ async def get_ap_rankings(
         
         query += " ORDER BY week DESC, rank ASC"
         
-        result = db.execute(text(query), params)
+        result = await db.execute(text(query), params)
         rankings = []
         
         for row in result:
@@ -270,8 +298,9 @@ async def get_ap_rankings(
                 "points": row[6]
             })
         
-        return {"rankings": rankings, "count": len(rankings)}
-        
+        # Returned directly so the rows skip jsonable_encoder; carry over the ETag headers
+        return FastJSONResponse({"rankings": rankings, "count": len(rankings)}, headers=response.headers)
+    
     except Exception as e:
         logger.error(f"Failed to retrieve AP rankings: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve rankings: {str(e)}")
@@ -279,43 +308,42 @@ async def get_ap_rankings(
 
 @app.get("/ratings/sp")
 async def get_sp_ratings(
+    request: Request,
+    response: Response,
     season: int = Query(..., description="Season year"),
-    week: Optional[int] = Query(None, description="Specific week"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """Get SP+ ratings from database"""
+    """Get SP+ ratings from database (one rating per team per season)"""
     try:
+        # ETag from the last sp_ratings sync that changed rows - unchanged data is a 304
+        not_modified = await revalidate(db, request, response, ['sp_ratings'], season, "/ratings/sp")
+        if not_modified:
+            return not_modified
+        
         query = """
-            SELECT season, week, team, rating, ranking,
+            SELECT year, team, rating, ranking,
                    offense_rating, defense_rating, special_teams_rating
             FROM team_sp_ratings
-            WHERE season = :season
+            WHERE year = :season
+            ORDER BY ranking ASC
         """
-        params = {"season": season}
         
-        if week is not None:
-            query += " AND week = :week"
-            params["week"] = week
-        
-        query += " ORDER BY week DESC, ranking ASC"
-        
-        result = db.execute(text(query), params)
+        result = await db.execute(text(query), {"season": season})
         ratings = []
         
         for row in result:
             ratings.append({
                 "season": row[0],
-                "week": row[1],
-                "team": row[2],
-                "rating": row[3],
-                "ranking": row[4],
-                "offense_rating": row[5],
-                "defense_rating": row[6],
-                "special_teams_rating": row[7]
+                "team": row[1],
+                "rating": row[2],
+                "ranking": row[3],
+                "offense_rating": row[4],
+                "defense_rating": row[5],
+                "special_teams_rating": row[6]
             })
         
-        return {"ratings": ratings, "count": len(ratings)}
-        
+        return FastJSONResponse({"ratings": ratings, "count": len(ratings)}, headers=response.headers)
+    
     except Exception as e:
         logger.error(f"Failed to retrieve SP+ ratings: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve SP+ ratings: {str(e)}")
@@ -323,48 +351,77 @@ async def get_sp_ratings(
 
 @app.get("/ratings/fpi")
 async def get_fpi_ratings(
+    request: Request,
+    response: Response,
     season: int = Query(..., description="Season year"),
-    week: Optional[int] = Query(None, description="Specific week"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """Get FPI ratings from database"""
+    """Get FPI ratings from database (one rating per team per season)"""
     try:
+        # ETag from the last fpi_ratings sync that changed rows - unchanged data is a 304
+        not_modified = await revalidate(db, request, response, ['fpi_ratings'], season, "/ratings/fpi")
+        if not_modified:
+            return not_modified
+        
         query = """
-            SELECT season, week, team, fpi
+            SELECT year, team, fpi
             FROM team_fpi_ratings
-            WHERE season = :season
+            WHERE year = :season
+            ORDER BY fpi DESC
         """
-        params = {"season": season}
-        
-        if week is not None:
-            query += " AND week = :week"
-            params["week"] = week
-        
-        query += " ORDER BY week DESC, fpi DESC"
         
-        result = db.execute(text(query), params)
+        result = await db.execute(text(query), {"season": season})
         ratings = []
         
         for row in result:
             ratings.append({
                 "season": row[0],
-                "week": row[1],
-                "team": row[2],
-                "fpi": row[3]
+                "team": row[1],
+                "fpi": row[2]
             })
         
-        return {"ratings": ratings, "count": len(ratings)}
-        
+        return FastJSONResponse({"ratings": ratings, "count": len(ratings)}, headers=response.headers)
+    
     except Exception as e:
         logger.error(f"Failed to retrieve FPI ratings: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve FPI ratings: {str(e)}")
 
 
+# One round trip, every lookup on (team_id, year/season): the latest AP poll week is a
+# ROW_NUMBER() CTE joined on rn = 1; SP+, FPI, records and recruiting are one row per season
+TEAM_DETAILS_QUERY = """
+    WITH t AS (
+        SELECT api_id, conference, mascot, color, alt_color FROM teams WHERE school = :team
+    ),
+    ap AS (
+        SELECT a.rank, a.points, a.week,
+               ROW_NUMBER() OVER (ORDER BY a.season_type = 'postseason' DESC, a.week DESC) AS rn
+        FROM ap_rankings a
+        JOIN t ON a.team_id = t.api_id
+        WHERE a.season = :season AND a.poll = 'AP Top 25'
+    )
+    SELECT t.conference, t.mascot, t.color, t.alt_color,
+           r.id AS record_id, r.total_wins, r.total_losses, r.total_ties,
+           r.conference_wins, r.conference_losses, r.home_wins, r.home_losses,
+           r.away_wins, r.away_losses,
+           ap.rank AS ap_rank, ap.points AS ap_points, ap.week AS ap_week,
+           sp.id AS sp_id, sp.rating AS sp_rating, sp.ranking AS sp_ranking,
+           sp.offense_rating, sp.defense_rating, sp.special_teams_rating,
+           fpi.id AS fpi_id, fpi.fpi,
+           rec.id AS recruiting_id, rec.rank AS recruiting_rank, rec.points AS recruiting_points
+    FROM t
+    LEFT JOIN team_records r ON r.team_id = t.api_id AND r.year = :season
+    LEFT JOIN ap ON ap.rn = 1
+    LEFT JOIN team_sp_ratings sp ON sp.team_id = t.api_id AND sp.year = :season
+    LEFT JOIN team_fpi_ratings fpi ON fpi.team_id = t.api_id AND fpi.year = :season
+    LEFT JOIN recruiting_teams rec ON rec.team_id = t.api_id AND rec.year = :season
+"""
+
 @app.get("/team/{team_name}/details")
 async def get_team_details(
     team_name: str,
     season: int = Query(..., description="Season year"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Get comprehensive team details including:
@@ -374,97 +431,49 @@ async def get_team_details(
     - Recruiting ranking
     """
     try:
-        # Basic team info
-        team_info = db.query(Team).filter(Team.school == team_name).first()
+        row = (await db.execute(text(TEAM_DETAILS_QUERY), {"team": team_name, "season": season})).mappings().first()
         
-        if not team_info:
+        if not row:
             raise HTTPException(status_code=404, detail="Team not found")
         
-        # Season record
-        record_query = """
-            SELECT total_wins, total_losses, total_ties,
-                   conf_wins, conf_losses, home_wins, home_losses,
-                   away_wins, away_losses
-            FROM team_records
-            WHERE team = :team AND season = :season
-        """
-        record = db.execute(text(record_query), {"team": team_name, "season": season}).fetchone()
-        
-        # Latest AP ranking
-        ap_query = """
-            SELECT rank, points, week
-            FROM ap_rankings
-            WHERE team = :team AND season = :season
-            ORDER BY week DESC LIMIT 1
-        """
-        ap_rank = db.execute(text(ap_query), {"team": team_name, "season": season}).fetchone()
-        
-        # Latest SP+ rating
-        sp_query = """
-            SELECT rating, ranking, week, offense_rating, defense_rating, special_teams_rating
-            FROM team_sp_ratings
-            WHERE team = :team AND season = :season
-            ORDER BY week DESC LIMIT 1
-        """
-        sp_rating = db.execute(text(sp_query), {"team": team_name, "season": season}).fetchone()
-        
-        # Latest FPI rating
-        fpi_query = """
-            SELECT fpi, week
-            FROM team_fpi_ratings
-            WHERE team = :team AND season = :season
-            ORDER BY week DESC LIMIT 1
-        """
-        fpi_rating = db.execute(text(fpi_query), {"team": team_name, "season": season}).fetchone()
-        
-        # Recruiting ranking
-        recruiting_query = """
-            SELECT rank, points
-            FROM recruiting_teams
-            WHERE team = :team AND year = :season
-        """
-        recruiting = db.execute(text(recruiting_query), {"team": team_name, "season": season}).fetchone()
-        
         return {
             "team": team_name,
             "season": season,
-            "conference": team_info.conference,
-            "mascot": team_info.mascot,
+            "conference": row["conference"],
+            "mascot": row["mascot"],
             "colors": {
-                "primary": team_info.color,
-                "secondary": team_info.alt_color
+                "primary": row["color"],
+                "secondary": row["alt_color"]
             },
             "record": {
-                "overall": f"{record[0]}-{record[1]}" if record else "N/A",
-                "conference": f"{record[3]}-{record[4]}" if record and len(record) > 4 else "N/A",
-                "home": f"{record[5]}-{record[6]}" if record and len(record) > 6 else "N/A",
-                "away": f"{record[7]}-{record[8]}" if record and len(record) > 8 else "N/A"
-            } if record else None,
+                "overall": f"{row['total_wins']}-{row['total_losses']}",
+                "conference": f"{row['conference_wins']}-{row['conference_losses']}",
+                "home": f"{row['home_wins']}-{row['home_losses']}",
+                "away": f"{row['away_wins']}-{row['away_losses']}"
+            } if row["record_id"] is not None else None,
             "rankings": {
                 "ap_poll": {
-                    "rank": ap_rank[0] if ap_rank else None,
-                    "points": ap_rank[1] if ap_rank else None,
-                    "week": ap_rank[2] if ap_rank else None
-                } if ap_rank else None,
+                    "rank": row["ap_rank"],
+                    "points": row["ap_points"],
+                    "week": row["ap_week"]
+                } if row["ap_week"] is not None else None,
                 "sp_plus": {
-                    "rating": sp_rating[0] if sp_rating else None,
-                    "ranking": sp_rating[1] if sp_rating else None,
-                    "week": sp_rating[2] if sp_rating else None,
-                    "offense": sp_rating[3] if sp_rating and len(sp_rating) > 3 else None,
-                    "defense": sp_rating[4] if sp_rating and len(sp_rating) > 4 else None,
-                    "special_teams": sp_rating[5] if sp_rating and len(sp_rating) > 5 else None
-                } if sp_rating else None,
+                    "rating": row["sp_rating"],
+                    "ranking": row["sp_ranking"],
+                    "offense": row["offense_rating"],
+                    "defense": row["defense_rating"],
+                    "special_teams": row["special_teams_rating"]
+                } if row["sp_id"] is not None else None,
                 "fpi": {
-                    "rating": fpi_rating[0] if fpi_rating else None,
-                    "week": fpi_rating[1] if fpi_rating else None
-                } if fpi_rating else None,
+                    "rating": row["fpi"]
+                } if row["fpi_id"] is not None else None,
                 "recruiting": {
-                    "rank": recruiting[0] if recruiting else None,
-                    "points": recruiting[1] if recruiting else None
-                } if recruiting else None
+                    "rank": row["recruiting_rank"],
+                    "points": row["recruiting_points"]
+                } if row["recruiting_id"] is not None else None
             }
         }
-        
+    
     except HTTPException:
         raise
     except Exception as e:
@@ -476,17 +485,17 @@ async def get_team_details(
 async def get_team_records(
     season: int,
     conference: Optional[str] = Query(None, description="Filter by conference"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get team records for a season"""
     try:
         query = """
             SELECT r.team, r.total_wins, r.total_losses, r.total_ties,
-                   r.conf_wins, r.conf_losses, r.home_wins, r.home_losses,
+                   r.conference_wins, r.conference_losses, r.home_wins, r.home_losses,
                    r.away_wins, r.away_losses, t.conference
             FROM team_records r
-            LEFT JOIN teams t ON r.team = t.school
-            WHERE r.season = :season
+            LEFT JOIN teams t ON t.api_id = r.team_id
+            WHERE r.year = :season
         """
         params = {"season": season}
         
@@ -496,7 +505,7 @@ async def get_team_records(
         
         query += " ORDER BY r.total_wins DESC, r.total_losses ASC"
         
-        result = db.execute(text(query), params)
+        result = await db.execute(text(query), params)
         records = []
         
         for row in result:
@@ -509,8 +518,20 @@ async def get_team_records(
                 "conference": row[10]
             })
         
-        return {"season": season, "records": records, "count": len(records)}
-        
+        return FastJSONResponse({"season": season, "records": records, "count": len(records)})
+    
     except Exception as e:
         logger.error(f"Failed to retrieve team records: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve team records: {str(e)}")
+
+
+# ==================== OPERATIONS ====================
+
+@app.get("/admin/db-pool", dependencies=[Depends(require_admin_key)])
+async def get_db_pool_status():
+    """Connection pool usage for the read and write engines (requires X-Admin-Key).
+    
+    Reads (GET endpoints) use the async read engine via get_async_read_db; syncs use the write pool.
+    A saturation near 1.0 means requests are waiting for connections.
+    """
+    return pool_status()
@@ -207,12 +207,12 @@ async def get_team(
     try:
         system = get_or_create_rankings(year, season_type, classification, None, None)
         
-        if team_name not in system.teams:
+        team = system.get_team(team_name)
+        if team is None:
             raise HTTPException(status_code=404, detail=f"Team '{team_name}' not found")
         
-        team = system.teams[team_name]
         ranked_teams = system.get_rankings(sort=True)
-        rank = next(i + 1 for i, t in enumerate(ranked_teams) if t.name == team_name)
+        rank = next(i + 1 for i, t in enumerate(ranked_teams) if t is team)
         
         return format_team_response(team, rank)
     except HTTPException:
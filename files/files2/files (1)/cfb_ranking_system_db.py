@@ -1,7 +1,7 @@
 # cfb_ranking_system_db.py
 # Modified version that loads from database instead of API
 
-from typing import Optional, List
+from typing import Optional, List, Iterator
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import Session
 import os
@@ -27,8 +27,9 @@ class GameResult:
 class Team:
     """Represents a college football team."""
     
-    def __init__(self, name: str):
+    def __init__(self, name: str, team_id: Optional[int] = None):
         self.name = name
+        self.id = team_id if team_id is not None else name  # Key in RankingSystem.teams
         self.game_results: List[GameResult] = []
         self.ranking = 0.0
     
@@ -92,17 +93,28 @@ class RankingFormula:
 class DatabaseLoader:
     """Load games from database instead of API"""
     
+    STREAM_BATCH_SIZE = 1000
+    
     def __init__(self, db_url: Optional[str] = None):
         if db_url is None:
-            db_url = os.getenv("DATABASE_URL")
+            # Rankings only read, so prefer the replica when one is configured
+            db_url = os.getenv("DATABASE_READ_URL") or os.getenv("DATABASE_URL")
             if not db_url:
                 raise ValueError("DATABASE_URL not set")
         
         self.engine = create_engine(db_url)
     
-    def get_games(self, year: int, season_type: str = "regular", 
-                  classification: str = "fbs", week: Optional[int] = None) -> List[dict]:
-        """Fetch games from database."""
+    def _stream(self, query: str, params: dict) -> Iterator:
+        """Yield rows through a server-side cursor, STREAM_BATCH_SIZE rows per fetch."""
+        with self.engine.connect() as conn:
+            result = conn.execution_options(
+                stream_results=True, yield_per=self.STREAM_BATCH_SIZE
+            ).execute(text(query), params)
+            yield from result
+    
+    def iter_games(self, year: int, season_type: str = "regular",
+                   classification: str = "fbs", week: Optional[int] = None) -> Iterator:
+        """Stream completed games as rows without building an intermediate list."""
         
         query = """
             SELECT 
@@ -116,10 +128,13 @@ class DatabaseLoader:
                 g.away_points,
                 g.completed,
                 ht.classification as home_classification,
-                at.classification as away_classification
+                at.classification as away_classification,
+                COALESCE(g.home_id, ht.api_id) as home_id,
+                COALESCE(g.away_id, at.api_id) as away_id
             FROM games g
-            LEFT JOIN teams ht ON g.home_team = ht.school
-            LEFT JOIN teams at ON g.away_team = at.school
+            -- Rows synced before their team had an id only carry the school name
+            LEFT JOIN teams ht ON ht.api_id = g.home_id OR (g.home_id IS NULL AND ht.school = g.home_team)
+            LEFT JOIN teams at ON at.api_id = g.away_id OR (g.away_id IS NULL AND at.school = g.away_team)
             WHERE g.season = :year
                 AND g.season_type = :season_type
                 AND g.completed = true
@@ -139,26 +154,52 @@ class DatabaseLoader:
         
         query += " ORDER BY g.week, g.start_date"
         
+        return self._stream(query, params)
+    
+    def get_games(self, year: int, season_type: str = "regular", 
+                  classification: str = "fbs", week: Optional[int] = None) -> List[dict]:
+        """Fetch games from database."""
+        return [
+            {
+                'id': row[0],
+                'season': row[1],
+                'week': row[2],
+                'seasonType': row[3],
+                'homeTeam': row[4],
+                'awayTeam': row[5],
+                'homePoints': row[6],
+                'awayPoints': row[7],
+                'completed': row[8],
+                'homeClassification': row[9] or 'fbs',
+                'awayClassification': row[10] or 'fbs',
+                'homeId': row[11],
+                'awayId': row[12]
+            }
+            for row in self.iter_games(year, season_type, classification, week)
+        ]
+    
+    def iter_season_results(self, year: int, season_type: str = "regular",
+                            week: Optional[int] = None) -> Iterator:
+        """Stream pre-filtered (week, home_id, away_id, margin, home_fbs, away_fbs) rows from season_game_summary."""
+        query = """
+            SELECT week, home_id, away_id, margin, home_fbs, away_fbs
+            FROM season_game_summary
+            WHERE season = :year AND season_type = :season_type
+        """
+        params = {"year": year, "season_type": season_type}
+        
+        if week is not None:
+            query += " AND week <= :week"
+            params["week"] = week
+        
+        query += " ORDER BY week, game_id"
+        
+        return self._stream(query, params)
+    
+    def get_team_names(self) -> dict:
+        """API team id -> school name, for labelling summary rows."""
         with self.engine.connect() as conn:
-            result = conn.execute(text(query), params)
-            
-            games = []
-            for row in result:
-                games.append({
-                    'id': row[0],
-                    'season': row[1],
-                    'week': row[2],
-                    'seasonType': row[3],
-                    'homeTeam': row[4],
-                    'awayTeam': row[5],
-                    'homePoints': row[6],
-                    'awayPoints': row[7],
-                    'completed': row[8],
-                    'homeClassification': row[9] or 'fbs',
-                    'awayClassification': row[10] or 'fbs'
-                })
-            
-            return games
+            return dict(conn.execute(text("SELECT api_id, school FROM teams WHERE api_id IS NOT NULL")).fetchall())
 
 
 # ==================== RANKING SYSTEM (modified to use database) ====================
@@ -167,27 +208,47 @@ class RankingSystem:
     """Main ranking system - now loads from database"""
     
     def __init__(self):
-        self.teams: dict = {}
+        self.teams: dict = {}      # API team id (school name if unknown) -> Team
         self.fbs_teams: set = set()
+        self.team_keys: dict = {}  # school name -> key in self.teams
+    
+    def add_team(self, name: str, team_id: Optional[int] = None) -> Team:
+        """Get or create a team, keyed by API id when known and by school name otherwise."""
+        key = team_id if team_id is not None else self.team_keys.get(name, name)
+        team = self.teams.get(key)
+        if team is None:
+            if team_id is not None and name in self.teams:
+                # Seen on name-only rows so far - re-key it under its id
+                team = self.teams.pop(name)
+                team.id = team_id
+                if name in self.fbs_teams:
+                    self.fbs_teams.discard(name)
+                    self.fbs_teams.add(team_id)
+            else:
+                team = Team(name, team_id)
+            self.teams[key] = team
+            self.team_keys[name] = key
+        return team
     
-    def add_team(self, name: str) -> Team:
-        """Get or create a team."""
-        if name not in self.teams:
-            self.teams[name] = Team(name)
-        return self.teams[name]
+    def get_team(self, name: str) -> Optional[Team]:
+        """Look up a team by school name."""
+        return self.teams.get(self.team_keys.get(name, name))
     
     def add_game(self, home_name: str, home_score: int, away_name: str, away_score: int,
-                 home_fbs: bool = True, away_fbs: bool = True, week: Optional[int] = None):
+                 home_fbs: bool = True, away_fbs: bool = True, week: Optional[int] = None,
+                 home_id: Optional[int] = None, away_id: Optional[int] = None):
         """Add a completed game to the system."""
-        home_team = self.add_team(home_name)
-        away_team = self.add_team(away_name)
-        
+        home_team = self.add_team(home_name, home_id)
+        away_team = self.add_team(away_name, away_id)
+        self.add_result(home_team, away_team, home_score - away_score, home_fbs, away_fbs, week)
+    
+    def add_result(self, home_team: Team, away_team: Team, margin: int,
+                   home_fbs: bool = True, away_fbs: bool = True, week: Optional[int] = None):
+        """Add a completed game given the home team's margin of victory."""
         if home_fbs:
-            self.fbs_teams.add(home_name)
+            self.fbs_teams.add(home_team.id)
         if away_fbs:
-            self.fbs_teams.add(away_name)
-        
-        margin = home_score - away_score
+            self.fbs_teams.add(away_team.id)
         
         home_team.add_game(GameResult(
             opponent=away_team,
@@ -212,25 +273,59 @@ class RankingSystem:
         """Load games from database (replaces load_games_from_api)"""
         print(f"Loading {classification.upper()} games from database for {year}, week {week if week else 'all'}...")
         
-        games = db_loader.get_games(year, season_type, classification, week)
+        # Pre-joined summary rows when the season has been refreshed by sync
+        names = db_loader.get_team_names()
+        games_added = 0
+        for week_num, home_id, away_id, margin, home_fbs, away_fbs in db_loader.iter_season_results(year, season_type, week):
+            self.add_result(
+                self.add_team(names.get(home_id, str(home_id)), home_id),
+                self.add_team(names.get(away_id, str(away_id)), away_id),
+                margin, bool(home_fbs), bool(away_fbs), week_num
+            )
+            games_added += 1
+        
+        # Season not summarized yet - stream the joined games query instead
+        if not games_added:
+            for row in db_loader.iter_games(year, season_type, classification, week):
+                if not row.home_team or not row.away_team:
+                    continue
+                
+                self.add_game(
+                    row.home_team, row.home_points,
+                    row.away_team, row.away_points,
+                    (row.home_classification or 'fbs').lower() == 'fbs',
+                    (row.away_classification or 'fbs').lower() == 'fbs',
+                    row.week,
+                    home_id=row.home_id, away_id=row.away_id
+                )
+                games_added += 1
+        
+        print(f"Loaded {games_added} games")
+        print(f"Total teams: {len(self.teams)}, FBS teams: {len(self.fbs_teams)}")
+    
+    def load_games_from_snapshot(self, snapshot, season_type: str = "regular",
+                                 week: Optional[int] = None):
+        """Load games from a memory-mapped season snapshot (see snapshot.py)"""
+        print(f"Loading games from snapshot {snapshot.version}, week {week if week else 'all'}...")
+        
+        games = snapshot.columns(f"games_{season_type}")
+        names = snapshot.team_names
         
         games_added = 0
-        for game in games:
-            home_team = game.get('homeTeam')
-            away_team = game.get('awayTeam')
-            
-            if not home_team or not away_team:
-                continue
-            
-            home_fbs = game.get('homeClassification', 'fbs').lower() == 'fbs'
-            away_fbs = game.get('awayClassification', 'fbs').lower() == 'fbs'
-            
-            week_num = game.get('week')
+        weeks, home_ids, away_ids = games['week'], games['home_id'], games['away_id']
+        margins, home_fbs, away_fbs = games['margin'], games['home_fbs'], games['away_fbs']
+        week_valid = snapshot.valid(f"games_{season_type}").get('week')  # Only present if some weeks are NULL
+        for i in range(len(weeks)):
+            week_num = weeks[i] if week_valid is None or week_valid[i] else None
+            # Rows are ordered by week
+            if week is not None and week_num is not None and week_num > week:
+                break
             
-            self.add_game(
-                home_team, game.get('homePoints'),
-                away_team, game.get('awayPoints'),
-                home_fbs, away_fbs, week_num
+            home_id, away_id = home_ids[i], away_ids[i]
+            self.add_result(
+                self.add_team(names.get(home_id, str(home_id)), home_id),
+                self.add_team(names.get(away_id, str(away_id)), away_id),
+                margins[i], bool(home_fbs[i]), bool(away_fbs[i]), week_num
             )
             games_added += 1
         
@@ -264,12 +359,12 @@ class RankingSystem:
         """Recalculate all game values based on current rankings."""
         for team in self.teams.values():
             for game in team.game_results:
-                game.opponent_fbs = game.opponent.name in self.fbs_teams
+                game.opponent_fbs = game.opponent.id in self.fbs_teams
                 game.ranking_value = RankingFormula.calculate(game, game.opponent.ranking)
     
     def get_rankings(self, sort: bool = True) -> List[Team]:
         """Get ranked list of FBS teams only."""
-        teams = [t for name, t in self.teams.items() if name in self.fbs_teams]
+        teams = [t for key, t in self.teams.items() if key in self.fbs_teams]
         if sort:
             teams.sort(key=lambda t: t.ranking, reverse=True)
         return teams
@@ -292,11 +387,11 @@ class RankingSystem:
     
     def print_team_details(self, team_name: str):
         """Print detailed game results for a specific team."""
-        if team_name not in self.teams:
+        team = self.get_team(team_name)
+        if team is None:
             print(f"Team '{team_name}' not found.")
             return
         
-        team = self.teams[team_name]
         wins, losses = team.get_record()
         
         print(f"\n{team.name} ({wins}-{losses}) - Ranking: {team.ranking:.2f}")
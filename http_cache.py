@@ -0,0 +1,96 @@
+# http_cache.py - ETag / Last-Modified validators and 304 handling for read endpoints
+#
+# Responses carry a strong ETag built from the version of the data behind them plus
+# whatever shapes the body (formula key, filters), and Cache-Control: no-cache so
+# browsers and the CDN revalidate on every refresh. A matching If-None-Match (or an
+# If-Modified-Since no older than Last-Modified) gets an empty 304 instead of the body.
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import DateTime, text
+
+CACHE_CONTROL = "public, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag from the parts that determine a response body"""
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+def _http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)  # Timestamps are stored as naive UTC
+    return format_datetime(value.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified:
+        headers["Last-Modified"] = _http_date(last_modified)
+    return headers
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == '*':
+        return True
+    # If-None-Match uses the weak comparison, so W/"x" matches "x"
+    candidates = (tag.strip() for tag in header.split(','))
+    return any(tag.removeprefix('W/') == etag for tag in candidates)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Whether the client's cached copy is still current"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)  # Takes precedence over If-Modified-Since
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        modified = last_modified if last_modified.tzinfo else last_modified.replace(tzinfo=timezone.utc)
+        return modified.replace(microsecond=0) <= since
+    return False
+
+
+def not_modified_response(request: Request, etag: str,
+                          last_modified: Optional[datetime] = None) -> Optional[Response]:
+    """An empty 304 if the client's copy is current, otherwise None"""
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=cache_headers(etag, last_modified))
+    return None
+
+
+def data_version_query(sync_types: Iterable[str]):
+    """Latest sync that changed any rows of these types for a season.
+    
+    Syncs that found nothing new don't move the version, so a week without
+    games keeps the same ETag.
+    """
+    names = ', '.join(f"'{name}'" for name in sync_types)
+    return text(f"""
+        SELECT MAX(completed_at) AS last_modified FROM sync_log
+        WHERE sync_type IN ({names}) AND season = :season AND status = 'success'
+            AND COALESCE(records_added, 0) + COALESCE(records_updated, 0) > 0
+    """).columns(last_modified=DateTime)
+
+
+async def revalidate(db, request: Request, response: Response, sync_types: Iterable[str],
+                     season: int, *key) -> Optional[Response]:
+    """Validators for a synced-data endpoint: a 304 to return, or None after setting the headers"""
+    last_modified = (await db.execute(data_version_query(sync_types), {"season": season})).scalar()
+    etag = make_etag(*key, season, last_modified.isoformat() if last_modified else None)
+    
+    not_modified = not_modified_response(request, etag, last_modified)
+    if not_modified is None:
+        response.headers.update(cache_headers(etag, last_modified))
+    return not_modified
@@ -0,0 +1,71 @@
+# json_encoding.py - Fast JSON encoding for API responses
+#
+# Uses orjson when it's installed (several times faster than the stdlib on the
+# large nested lists the ranking endpoints return) and falls back to compact
+# stdlib json otherwise. Both encoders agree on the output: NaN/infinity are
+# written as null and dates in ISO format. FastJSONResponse renders through the
+# same encoder, rounding every float in the content first.
+
+import json
+import math
+from datetime import date
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder when orjson isn't installed
+    orjson = None
+
+# Ratings are emitted with this many decimals
+FLOAT_DECIMALS = 4
+
+
+def round_float(value):
+    """A rating rounded to FLOAT_DECIMALS (None for None, NaN and infinity)"""
+    if value is None or not math.isfinite(value):
+        return None
+    return round(value, FLOAT_DECIMALS)
+
+
+def round_floats(content: Any) -> Any:
+    """Copy of a payload with every float passed through round_float"""
+    if isinstance(content, float):
+        return round_float(content)
+    if isinstance(content, dict):
+        return {key: round_floats(value) for key, value in content.items()}
+    if isinstance(content, (list, tuple)):
+        return [round_floats(value) for value in content]
+    return content
+
+
+def _finite(content: Any) -> Any:
+    """Copy of a payload with NaN/infinity as None, as orjson writes them"""
+    if isinstance(content, float):
+        return content if math.isfinite(content) else None
+    if isinstance(content, dict):
+        return {key: _finite(value) for key, value in content.items()}
+    if isinstance(content, (list, tuple)):
+        return [_finite(value) for value in content]
+    return content
+
+
+def _default(value: Any) -> str:
+    return value.isoformat() if isinstance(value, date) else str(value)
+
+
+def encode_json(content: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        _finite(content), ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with encode_json (orjson when available), floats rounded"""
+    
+    def render(self, content: Any) -> bytes:
+        return encode_json(round_floats(content))
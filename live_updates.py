@@ -0,0 +1,203 @@
+# live_updates.py - Push ranking deltas to connected clients when new final scores land
+#
+# One background task watches season_game_summary (rebuilt by both sync paths whenever
+# games change) with a cheap per-week signature query. When a week's signature moves,
+# the change is reported (the API runs its post-sync hooks, so syncs from the nightly
+# cron process invalidate and rewarm the ranking cache too), then each subscribed
+# ranking is recomputed once and the rank/rating changes are fanned out to every
+# client subscribed to it, instead of every client polling.
+
+import asyncio
+import hashlib
+import logging
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+POLL_SECONDS = float(os.getenv("LIVE_UPDATES_POLL_SECONDS", "30"))
+QUEUE_SIZE = 16  # Pending events per client before they're replaced by a resync snapshot
+
+SIGNATURE_QUERY = text("""
+    SELECT season_type, week, COUNT(*), COALESCE(SUM(margin), 0), COALESCE(MAX(game_id), 0)
+    FROM season_game_summary
+    WHERE season = :season
+    GROUP BY season_type, week
+""")
+
+ROW_FIELDS = ('rank', 'ranking', 'wins', 'losses')
+
+
+def changed_weeks(previous: Dict[Tuple, Tuple], current: Dict[Tuple, Tuple]) -> Dict[str, Set]:
+    """Weeks per season type whose games differ between two signatures"""
+    changes: Dict[str, Set] = {}
+    for key in previous.keys() | current.keys():
+        if previous.get(key) != current.get(key):
+            season_type, week = key
+            changes.setdefault(season_type, set()).add(week)
+    return changes
+
+
+def diff_rankings(previous: Dict[str, Dict], current: List[Dict]) -> List[Dict]:
+    """Rows whose rank, rating or record changed, with the previous rank/rating"""
+    changes = []
+    for row in current:
+        old = previous.get(row['name'])
+        if old and all(old[field] == row[field] for field in ROW_FIELDS):
+            continue
+        changes.append({
+            **row,
+            'previous_rank': old['rank'] if old else None,
+            'previous_ranking': old['ranking'] if old else None,
+        })
+    return changes
+
+
+class _Channel:
+    """Subscribers to one ranking (one cache key) and the rows they last saw"""
+    
+    def __init__(self, season: int, params: Dict):
+        self.season = season
+        self.params = params
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.rows: Optional[List[Dict]] = None
+        self.lock = asyncio.Lock()
+
+
+class RankingBroadcaster:
+    """Shared recompute + fan-out of ranking changes to SSE subscribers.
+    
+    compute(params) returns summary rows in rank order ({name, rank, ranking,
+    wins, losses}); on_change(changes, token) is told the changed weeks per
+    (season, season_type) and must drop them from the ranking cache so compute
+    sees the new games - token identifies the change, so worker processes that
+    see the same one can act on it once. watch() returns further seasons to
+    check (ones with cached rankings) besides those with subscribers.
+    """
+    
+    def __init__(self, compute: Callable[[Dict], List[Dict]],
+                 on_change: Callable[[Dict[Tuple[int, str], Set], str], None],
+                 bind=None, poll_seconds: float = POLL_SECONDS,
+                 watch: Optional[Callable[[], Iterable[int]]] = None):
+        self.compute = compute
+        self.on_change = on_change
+        self.bind = bind
+        self.poll_seconds = poll_seconds
+        self.watch = watch
+        self.channels: Dict[str, _Channel] = {}
+        self.signatures: Dict[int, Dict[Tuple, Tuple]] = {}
+        self._task: Optional[asyncio.Task] = None
+    
+    # ==================== SUBSCRIPTIONS ====================
+    
+    async def subscribe(self, key: str, season: int, params: Dict) -> Tuple[asyncio.Queue, List[Dict]]:
+        """Register a client; returns its event queue and the current rows"""
+        channel = self.channels.get(key)
+        if channel is None:
+            channel = self.channels[key] = _Channel(season, params)
+        
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        channel.subscribers.add(queue)
+        try:
+            async with channel.lock:
+                if channel.rows is None:
+                    channel.rows = await asyncio.to_thread(self.compute, channel.params)
+        except Exception:
+            self.unsubscribe(key, queue)
+            raise
+        return queue, channel.rows
+    
+    def unsubscribe(self, key: str, queue: asyncio.Queue):
+        channel = self.channels.get(key)
+        if channel is None:
+            return
+        channel.subscribers.discard(queue)
+        if not channel.subscribers:
+            del self.channels[key]
+    
+    def subscriber_count(self) -> int:
+        return sum(len(channel.subscribers) for channel in self.channels.values())
+    
+    @staticmethod
+    def _publish(channel: _Channel, event: Dict):
+        for queue in list(channel.subscribers):
+            if not queue.full():
+                queue.put_nowait(event)
+                continue
+            # Slow client - rather than block the fan-out, replace its backlog with the
+            # full current rows, since the deltas it has queued are no longer complete
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait({
+                'resync': True,
+                'season': event['season'],
+                'total_teams': len(channel.rows or []),
+                'teams': channel.rows or [],
+            })
+            logger.info(f"Client fell {QUEUE_SIZE} events behind on {event['season']} rankings, resyncing")
+    
+    # ==================== CHANGE DETECTION ====================
+    
+    def _signature(self, season: int) -> Dict[Tuple, Tuple]:
+        """(season_type, week) -> (games, margin sum, max game id)"""
+        with self.bind.connect() as conn:
+            rows = conn.execute(SIGNATURE_QUERY, {"season": season}).fetchall()
+        return {(row[0], row[1]): tuple(row[2:]) for row in rows}
+    
+    def _seasons(self) -> Set[int]:
+        seasons = {channel.season for channel in self.channels.values()}
+        if self.watch is not None:
+            seasons.update(self.watch())
+        return seasons
+    
+    async def _refresh_season(self, season: int, changes: Dict[str, Set]):
+        signature = repr(sorted(self.signatures[season].items(), key=repr))
+        token = f"{season}:{hashlib.sha1(signature.encode()).hexdigest()[:16]}"
+        await asyncio.to_thread(
+            self.on_change, {(season, season_type): weeks for season_type, weeks in changes.items()}, token
+        )
+        for key, channel in list(self.channels.items()):
+            if channel.season != season or not channel.subscribers:
+                continue
+            async with channel.lock:
+                rows = await asyncio.to_thread(self.compute, channel.params)
+                previous = {row['name']: row for row in channel.rows or []}
+                changes = diff_rankings(previous, rows)
+                channel.rows = rows
+            if changes:
+                self._publish(channel, {'season': season, 'total_teams': len(rows), 'changes': changes})
+                logger.info(f"Pushed {len(changes)} ranking changes for {key} to {len(channel.subscribers)} clients")
+    
+    async def poll_once(self):
+        """Check each watched season for new final scores and push any changes"""
+        for season in self._seasons():
+            signature = await asyncio.to_thread(self._signature, season)
+            previous = self.signatures.get(season)
+            self.signatures[season] = signature
+            if previous is None:
+                continue
+            changes = changed_weeks(previous, signature)
+            if changes:
+                logger.info(f"New results for {season} ({changes}), recomputing {len(self.channels)} live rankings")
+                await self._refresh_season(season, changes)
+    
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            if not self._seasons():
+                continue
+            try:
+                await self.poll_once()
+            except Exception as e:
+                logger.warning(f"Live ranking update check failed: {e}")
+    
+    async def start(self):
+        if self.bind is not None and self._task is None:
+            self._task = asyncio.create_task(self.run())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
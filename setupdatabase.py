@@ -3,7 +3,8 @@
 import os
 import sys
 from db_models_complete import init_db, drop_all
-from sync_service_complete import CFBDataSyncService, SessionLocal, run_initial_historical_sync
+from sync_service_complete import CFBDataSyncService, SessionLocal
+from backfill import run_backfill
 import logging
 
 logging.basicConfig(
@@ -58,7 +59,7 @@ def main():
             start_year, end_year = map(int, years.split())
         else:
             start_year, end_year = 2014, 2024
-        run_initial_historical_sync(start_year, end_year)
+        run_backfill(start_year, end_year)
     elif command == "reset":
         confirm = input("This will DELETE ALL DATA. Type 'yes' to confirm: ")
         if confirm.lower() == 'yes':
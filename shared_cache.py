@@ -0,0 +1,275 @@
+# shared_cache.py - Ranking cache shared by every API worker process
+#
+# With several uvicorn workers each process has its own in-memory ranking_cache, so
+# every worker would compute every ranking itself. Computed rankings (as flat
+# snapshots) and encoded /rankings bodies are published here instead:
+#   - SQLite file (default): a WAL-mode file on local disk, shared by the workers on one host
+#   - Redis (SHARED_CACHE_URL=redis://...): shared across hosts, when redis is installed
+#
+# compute_once() takes a cross-process lock so only one worker computes a given ranking
+# while the others wait for its result. Entries are keyed by generation tokens (per
+# season, and per season type + week); invalidating just bumps the tokens, and each
+# worker compares them before trusting its own in-process copies. Workers re-read the
+# tokens at most every GENERATION_CACHE_SECONDS, so requests don't each hit the store.
+#
+# Values are stored as JSON (bytes and datetimes tagged), never pickled: anyone who can
+# write to Redis must not be able to run code in the API workers.
+
+import base64
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import redis
+except ImportError:  # SQLite file cache only when redis isn't installed
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+SHARED_CACHE_URL = os.getenv("SHARED_CACHE_URL")  # redis://..., sqlite:///path or a file path
+TTL_SECONDS = int(os.getenv("SHARED_CACHE_TTL", "21600"))
+GENERATION_CACHE_SECONDS = float(os.getenv("SHARED_CACHE_GENERATION_SECONDS", "1"))
+DEFAULT_PATH = os.path.join(tempfile.gettempdir(), "cfb_rankings_cache.sqlite3")
+
+LOCK_SECONDS = 120        # A worker that dies mid-compute releases its lock after this
+WAIT_POLL_SECONDS = 0.1   # How often waiting workers check for the result
+TOKEN_SECONDS = 300       # Workers reporting the same change do so within this window
+
+# ==================== STORES ====================
+
+class SQLiteCache:
+    """Key/value store in a local SQLite file - works across processes on one host"""
+    
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._conn().execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                expires_at REAL
+            )
+        """)
+    
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit: every statement is its own transaction, so writers never hold the lock long
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    @staticmethod
+    def _expiry(ttl: Optional[float]) -> Optional[float]:
+        return time.time() + ttl if ttl else None
+    
+    def get(self, key: str) -> Optional[bytes]:
+        row = self._conn().execute(
+            "SELECT value FROM cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+    
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        conn = self._conn()
+        conn.execute("INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                     (key, value, self._expiry(ttl)))
+        conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+    
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        """Set only if the key is absent (or expired); True if this call set it"""
+        conn = self._conn()
+        conn.execute("DELETE FROM cache WHERE key = ? AND expires_at <= ?", (key, time.time()))
+        cursor = conn.execute("INSERT OR IGNORE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                              (key, value, self._expiry(ttl)))
+        return cursor.rowcount == 1
+    
+    def delete(self, key: str):
+        self._conn().execute("DELETE FROM cache WHERE key = ?", (key,))
+    
+    def clear(self):
+        self._conn().execute("DELETE FROM cache")
+
+
+class RedisCache:
+    """Key/value store in Redis - shared across hosts"""
+    
+    NAMESPACE = "cfb_rankings:"
+    
+    def __init__(self, url: str):
+        self.client = redis.Redis.from_url(url)
+    
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.NAMESPACE + key)
+    
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        self.client.set(self.NAMESPACE + key, value, ex=int(ttl) if ttl else None)
+    
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        return bool(self.client.set(self.NAMESPACE + key, value, ex=int(ttl) if ttl else None, nx=True))
+    
+    def delete(self, key: str):
+        self.client.delete(self.NAMESPACE + key)
+    
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.NAMESPACE + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+# ==================== ENCODING ====================
+
+def _tag(value: Any) -> Dict:
+    if isinstance(value, bytes):
+        return {"__bytes__": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    raise TypeError(f"{type(value).__name__} can't be stored in the shared cache")
+
+
+def _untag(value: Dict) -> Any:
+    if len(value) == 1:
+        if "__bytes__" in value:
+            return base64.b64decode(value["__bytes__"])
+        if "__datetime__" in value:
+            return datetime.fromisoformat(value["__datetime__"])
+    return value
+
+
+def encode_value(value: Any) -> bytes:
+    """JSON for a cache value (dicts, lists, scalars, bytes, datetimes; tuples come back as lists)"""
+    return json.dumps(value, default=_tag, separators=(",", ":")).encode("utf-8")
+
+
+def decode_value(data: bytes) -> Any:
+    return json.loads(data, object_hook=_untag)
+
+# ==================== SHARED CACHE ====================
+
+class SharedCache:
+    """JSON-encoded objects, per-season generations and single-flight compute over a store.
+    
+    A store that fails (Redis down, disk full) behaves like a miss, so requests
+    fall back to computing in-process instead of erroring.
+    """
+    
+    def __init__(self, store, ttl: float = TTL_SECONDS, generation_seconds: float = GENERATION_CACHE_SECONDS):
+        self.store = store
+        self.ttl = ttl
+        self.generation_seconds = generation_seconds
+        self._generations: Dict[Tuple, Tuple[float, str]] = {}  # scopes -> (read at, token)
+    
+    def _call(self, method: str, *args, default=None):
+        try:
+            return getattr(self.store, method)(*args)
+        except Exception as e:
+            logger.warning(f"Shared cache {method} failed: {e}")
+            return default
+    
+    def get_object(self, key: str) -> Any:
+        value = self._call('get', key)
+        if value is None:
+            return None
+        try:
+            return decode_value(value)
+        except ValueError as e:
+            logger.warning(f"Ignoring undecodable shared cache entry {key}: {e}")  # Left by an older version
+            return None
+    
+    def set_object(self, key: str, value: Any, ttl: Optional[float] = None):
+        self._call('set', key, encode_value(value), ttl or self.ttl)
+    
+    # ==================== GENERATIONS ====================
+    
+    def generation(self, *scopes) -> str:
+        """Token that changes whenever any of the scopes (or the whole cache) is invalidated.
+        
+        Scopes nest from broad to narrow, e.g. (season, "season_type + week"). Other
+        workers' bumps are seen within generation_seconds; this worker's at once.
+        """
+        now = time.monotonic()
+        cached = self._generations.get(scopes)
+        if cached is not None and now - cached[0] < self.generation_seconds:
+            return cached[1]
+        
+        tokens = (self._call('get', f"generation:{scope}") for scope in ('all', *scopes))
+        generation = '.'.join(token.decode() if token else '0' for token in tokens)
+        self._generations[scopes] = (now, generation)
+        return generation
+    
+    def bump_generation(self, *scopes, token: Optional[str] = None) -> bool:
+        """Invalidate scopes ('all' = everything). With a token (e.g. the data
+        signature that triggered it), workers reporting the same change only bump once.
+        """
+        if token is not None:
+            # Keyed on the scopes in a fixed order, whatever order the caller built them in;
+            # add() is set-if-absent, so of the workers racing on one change only one bumps
+            scope_key = ','.join(sorted(str(scope) for scope in scopes))
+            if not self._call('add', f"generation_token:{scope_key}:{token}", b"1", TOKEN_SECONDS, default=True):
+                return False
+        for scope in scopes:
+            self._call('set', f"generation:{scope}", uuid.uuid4().hex[:12].encode())
+        self._generations.clear()
+        return True
+    
+    def clear(self):
+        self._call('clear')
+        self._generations.clear()
+    
+    # ==================== SINGLE-FLIGHT ====================
+    
+    def compute_once(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Cached value for key, computed by exactly one worker at a time.
+        
+        Workers that lose the lock poll for the winner's result; if the winner
+        fails (or hangs past LOCK_SECONDS) the next one in line computes it.
+        """
+        value = self.get_object(key)
+        if value is not None:
+            return value
+        
+        lock = f"lock:{key}"
+        deadline = time.monotonic() + LOCK_SECONDS
+        while True:
+            acquired = self._call('add', lock, b"1", LOCK_SECONDS, default=True)
+            if acquired:
+                try:
+                    value = self.get_object(key)  # Published while we waited for the lock
+                    if value is None:
+                        value = compute()
+                        self.set_object(key, value)
+                    return value
+                finally:
+                    self._call('delete', lock)
+            
+            time.sleep(WAIT_POLL_SECONDS)
+            value = self.get_object(key)
+            if value is not None:
+                return value
+            if time.monotonic() > deadline:
+                logger.warning(f"Gave up waiting for another worker to compute {key}")
+                return compute()
+
+
+def open_shared_cache(url: Optional[str] = SHARED_CACHE_URL, workers: Optional[int] = None) -> Optional[SharedCache]:
+    """The shared cache for this deployment, or None for a single worker without SHARED_CACHE_URL"""
+    workers = workers or int(os.getenv("WEB_CONCURRENCY", "1"))
+    if not url and workers <= 1:
+        return None
+    
+    if url and url.startswith(("redis://", "rediss://", "unix://")):
+        if redis is not None:
+            return SharedCache(RedisCache(url))
+        logger.warning("SHARED_CACHE_URL points at Redis but redis isn't installed, using the SQLite file cache")
+        url = None
+    
+    path = url.removeprefix("sqlite:///") if url else DEFAULT_PATH
+    return SharedCache(SQLiteCache(path))
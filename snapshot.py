@@ -0,0 +1,361 @@
+# snapshot.py - Columnar per-season snapshots of games (and optionally drives/plays)
+#
+# Usage:
+#   python snapshot.py export --seasons 2023 2024 --out snapshots
+#   python snapshot.py export --seasons 2024 --tables drives,plays --force
+#   python snapshot.py info snapshots/2024
+#
+# Each column is written as a standard .npy file (readable with numpy.load(path, mmap_mode='r')),
+# and load_snapshot() memory-maps them with the standard library, so the ranking engine
+# can read a season with no parsing step and without numpy installed. Columns that held
+# NULLs get a companion <column>.valid.npy boolean mask (numpy.ma-style) instead of a
+# sentinel value that could collide with real data.
+
+import argparse
+import ast
+import array
+import hashlib
+import json
+import logging
+import mmap
+import os
+import shutil
+import struct
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from db_models_complete import engine
+
+logger = logging.getLogger(__name__)
+
+NPY_MAGIC = b'\x93NUMPY'
+NPY_HEADER_SIZE = 128  # Fixed so the row count can be patched in after streaming
+
+# npy dtype -> (array typecode, fill value stored under a NULL; the .valid mask marks those rows)
+DTYPES = {
+    '<i4': ('i', 0),
+    '<i8': ('q', 0),
+    '<f8': ('d', float('nan')),
+    '|b1': ('B', 0),
+}
+
+VERSION_QUERY = """
+    SELECT season_type, game_id, week, home_id, away_id, margin, home_fbs, away_fbs
+    FROM season_game_summary
+    WHERE season = :season
+    ORDER BY season_type, game_id
+"""
+
+SEASON_TYPES = ['regular', 'postseason']
+
+# table -> (SQL returning the columns in order, [(column, npy dtype)])
+TABLES = {
+    'games': ("""
+        SELECT game_id, week, home_id, away_id, margin, home_fbs, away_fbs
+        FROM season_game_summary
+        WHERE season = :season AND season_type = :season_type
+        ORDER BY week, game_id
+    """, [
+        ('game_id', '<i4'), ('week', '<i4'), ('home_id', '<i4'), ('away_id', '<i4'),
+        ('margin', '<i4'), ('home_fbs', '|b1'), ('away_fbs', '|b1'),
+    ]),
+    'drives': ("""
+        SELECT id, game_id, offense_id, defense_id, drive_number, start_period,
+               start_yards_to_goal, plays, yards, scoring
+        FROM drives
+        WHERE season = :season
+        ORDER BY game_id, drive_number
+    """, [
+        ('id', '<i8'), ('game_id', '<i4'), ('offense_id', '<i4'), ('defense_id', '<i4'),
+        ('drive_number', '<i4'), ('start_period', '<i4'), ('start_yards_to_goal', '<i4'),
+        ('plays', '<i4'), ('yards', '<i4'), ('scoring', '|b1'),
+    ]),
+    'plays': ("""
+        SELECT id, drive_id, game_id, offense_id, defense_id, period, down, distance,
+               yards_to_goal, yards_gained, ppa, epa, success
+        FROM plays
+        WHERE season = :season
+        ORDER BY game_id, id
+    """, [
+        ('id', '<i8'), ('drive_id', '<i8'), ('game_id', '<i4'), ('offense_id', '<i4'),
+        ('defense_id', '<i4'), ('period', '<i4'), ('down', '<i4'), ('distance', '<i4'),
+        ('yards_to_goal', '<i4'), ('yards_gained', '<i4'), ('ppa', '<f8'), ('epa', '<f8'),
+        ('success', '|b1'),
+    ]),
+}
+
+STREAM_BATCH_SIZE = 5000
+
+# ==================== NPY FILES ====================
+
+def _npy_header(dtype: str, rows: int) -> bytes:
+    """npy v1.0 header padded to NPY_HEADER_SIZE bytes"""
+    header = repr({'descr': dtype, 'fortran_order': False, 'shape': (rows,)}).encode('latin1')
+    padding = NPY_HEADER_SIZE - len(NPY_MAGIC) - 4 - len(header) - 1
+    return NPY_MAGIC + b'\x01\x00' + struct.pack('<H', NPY_HEADER_SIZE - 10) + header + b' ' * padding + b'\n'
+
+
+class _ColumnWriter:
+    """Append values to one .npy column file, patching the row count on close.
+    
+    A validity mask (1 = value present) is written next to the column and
+    kept only if the column turned out to contain NULLs.
+    """
+    
+    def __init__(self, path: str, dtype: str):
+        self.path = path
+        self.valid_path = path[:-len('.npy')] + '.valid.npy'
+        self.dtype = dtype
+        self.typecode, self.fill = DTYPES[dtype]
+        self.rows = 0
+        self.nulls = 0
+        self.file = open(path, 'wb')
+        self.file.write(_npy_header(dtype, 0))
+        self.valid_file = open(self.valid_path, 'wb')
+        self.valid_file.write(_npy_header('|b1', 0))
+    
+    def write(self, values: List):
+        data = array.array(self.typecode, [self.fill if v is None else v for v in values])
+        valid = bytes(v is not None for v in values)
+        if sys.byteorder == 'big':
+            data.byteswap()
+        data.tofile(self.file)
+        self.valid_file.write(valid)
+        self.rows += len(values)
+        self.nulls += len(values) - sum(valid)
+    
+    def close(self):
+        self.file.seek(0)
+        self.file.write(_npy_header(self.dtype, self.rows))
+        self.file.close()
+        
+        self.valid_file.seek(0)
+        self.valid_file.write(_npy_header('|b1', self.rows))
+        self.valid_file.close()
+        if not self.nulls:
+            os.remove(self.valid_path)
+    
+    def info(self) -> Dict:
+        info = {'file': os.path.basename(self.path), 'dtype': self.dtype}
+        if self.nulls:
+            info['valid'] = os.path.basename(self.valid_path)
+            info['nulls'] = self.nulls
+        return info
+
+
+def _map_column(path: str) -> memoryview:
+    """Memory-map a 1-D .npy column as a typed memoryview (zero-copy)"""
+    with open(path, 'rb') as f:
+        prefix = f.read(10)
+        if prefix[:6] != NPY_MAGIC:
+            raise ValueError(f"{path} is not a .npy file")
+        header_len = struct.unpack('<H', prefix[8:10])[0]
+        header = ast.literal_eval(f.read(header_len).decode('latin1'))
+        
+        typecode = DTYPES[header['descr']][0]
+        if sys.byteorder == 'big' and typecode != 'B':
+            raise ValueError("Memory-mapped snapshots require a little-endian host")
+        
+        if header['shape'][0] == 0:
+            return memoryview(array.array(typecode))
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    return memoryview(mapped)[10 + header_len:].cast(typecode)
+
+# ==================== EXPORT ====================
+
+def snapshot_version(bind: Engine, season: int) -> Dict:
+    """Version a season's snapshot by the content of its game summary.
+    
+    Any change to the summarized games (a new final score, a corrected id)
+    changes the digest; re-syncs that leave the games as they were don't.
+    """
+    digest = hashlib.sha1()
+    games: Dict[str, int] = {}
+    with bind.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=STREAM_BATCH_SIZE).execute(
+            text(VERSION_QUERY), {'season': season}
+        )
+        for row in result:
+            digest.update(json.dumps([int(v) if isinstance(v, bool) else v for v in row]).encode())
+            games[row[0]] = games.get(row[0], 0) + 1
+    return {'version': digest.hexdigest()[:12] if games else 'unversioned', 'games': games}
+
+
+def _export_table(conn, table: str, params: Dict, directory: str) -> Dict:
+    """Stream one query into per-column .npy files"""
+    query, columns = TABLES[table.split('_')[0]]
+    writers = [
+        _ColumnWriter(os.path.join(directory, f"{table}.{name}.npy"), dtype)
+        for name, dtype in columns
+    ]
+    try:
+        result = conn.execution_options(stream_results=True, yield_per=STREAM_BATCH_SIZE).execute(
+            text(query), params
+        )
+        for batch in result.partitions(STREAM_BATCH_SIZE):
+            for index, writer in enumerate(writers):
+                writer.write([row[index] for row in batch])
+    finally:
+        for writer in writers:
+            writer.close()
+    
+    return {
+        'rows': writers[0].rows,
+        'columns': {name: writer.info() for (name, _), writer in zip(columns, writers)},
+    }
+
+
+def export_season(season: int, out_dir: str = 'snapshots', tables: Optional[List[str]] = None,
+                  force: bool = False, bind: Optional[Engine] = None) -> str:
+    """Write a season snapshot and return its directory.
+    
+    Snapshots live in <out_dir>/<season>/<version>/; an unchanged game summary
+    means the existing snapshot is reused unless force is set.
+    """
+    bind = bind or engine
+    tables = tables or []
+    version = snapshot_version(bind, season)
+    season_dir = os.path.join(out_dir, str(season))
+    directory = os.path.join(season_dir, version['version'])
+    
+    current = os.path.exists(os.path.join(directory, 'manifest.json')) and version['version'] != 'unversioned'
+    if current and not force:
+        logger.info(f"Snapshot {season} {version['version']} is current")
+        return directory
+    
+    staging = directory + '.tmp'
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    
+    manifest = {
+        'season': season,
+        'version': version['version'],
+        'games': version['games'],
+        'created_at': datetime.utcnow().isoformat(),
+        'tables': {},
+    }
+    
+    with bind.connect() as conn:
+        for season_type in SEASON_TYPES:
+            manifest['tables'][f'games_{season_type}'] = _export_table(
+                conn, f'games_{season_type}', {'season': season, 'season_type': season_type}, staging
+            )
+        for table in tables:
+            manifest['tables'][table] = _export_table(conn, table, {'season': season}, staging)
+        
+        manifest['team_names'] = {
+            str(api_id): school for api_id, school in conn.execute(
+                text("SELECT api_id, school FROM teams WHERE api_id IS NOT NULL")
+            )
+        }
+    
+    with open(os.path.join(staging, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(staging, directory)
+    with open(os.path.join(season_dir, 'LATEST'), 'w') as f:
+        f.write(version['version'])
+    
+    rows = {name: info['rows'] for name, info in manifest['tables'].items()}
+    logger.info(f"Snapshot {season} {version['version']} written to {directory}: {rows}")
+    return directory
+
+# ==================== LOAD ====================
+
+class Snapshot:
+    """Memory-mapped view of one season snapshot"""
+    
+    def __init__(self, directory: str):
+        # Accept either a version directory or a season directory with a LATEST pointer
+        latest = os.path.join(directory, 'LATEST')
+        if os.path.exists(latest):
+            with open(latest) as f:
+                directory = os.path.join(directory, f.read().strip())
+        
+        with open(os.path.join(directory, 'manifest.json')) as f:
+            self.manifest = json.load(f)
+        self.directory = directory
+        self.team_names = {int(api_id): school for api_id, school in self.manifest.get('team_names', {}).items()}
+        self._columns: Dict[str, Dict[str, memoryview]] = {}
+        self._valid: Dict[str, Dict[str, memoryview]] = {}
+    
+    @property
+    def version(self) -> str:
+        return self.manifest['version']
+    
+    def columns(self, table: str) -> Dict[str, memoryview]:
+        """Column name -> memory-mapped values for a table in this snapshot"""
+        if table not in self._columns:
+            info = self.manifest['tables'][table]
+            self._columns[table] = {
+                name: _map_column(os.path.join(self.directory, column['file']))
+                for name, column in info['columns'].items()
+            }
+        return self._columns[table]
+    
+    def valid(self, table: str) -> Dict[str, memoryview]:
+        """Column name -> validity mask (1 = value present) for the columns that contain NULLs"""
+        if table not in self._valid:
+            info = self.manifest['tables'][table]
+            self._valid[table] = {
+                name: _map_column(os.path.join(self.directory, column['valid']))
+                for name, column in info['columns'].items() if 'valid' in column
+            }
+        return self._valid[table]
+    
+    def values(self, table: str, column: str) -> List:
+        """A column as a list with None for NULLs (copies - use columns() for zero-copy access)"""
+        values = self.columns(table)[column].tolist()
+        valid = self.valid(table).get(column)
+        if valid is not None:
+            values = [value if present else None for value, present in zip(values, valid)]
+        return values
+
+
+def load_snapshot(directory: str) -> Snapshot:
+    return Snapshot(directory)
+
+# ==================== CLI ====================
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar season snapshots for the ranking engine")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    export_parser = subparsers.add_parser('export', help="Write snapshots for one or more seasons")
+    export_parser.add_argument('--seasons', type=int, nargs='+', required=True)
+    export_parser.add_argument('--out', default='snapshots', help="Snapshot root directory")
+    export_parser.add_argument('--tables', default='', help="Extra tables to include: drives,plays")
+    export_parser.add_argument('--force', action='store_true', help="Rewrite even if the games are unchanged")
+    
+    info_parser = subparsers.add_parser('info', help="Show a snapshot manifest")
+    info_parser.add_argument('directory')
+    
+    args = parser.parse_args()
+    
+    if args.command == 'export':
+        tables = [t.strip() for t in args.tables.split(',') if t.strip()]
+        unknown = [t for t in tables if t not in TABLES or t == 'games']
+        if unknown:
+            parser.error(f"Unknown tables: {', '.join(unknown)} (choose from drives, plays)")
+        for season in args.seasons:
+            export_season(season, args.out, tables, args.force)
+    else:
+        snapshot = load_snapshot(args.directory)
+        print(f"Season {snapshot.manifest['season']} - version {snapshot.version} "
+              f"(created {snapshot.manifest['created_at']})")
+        for name, info in snapshot.manifest['tables'].items():
+            print(f"  {name:<20} {info['rows']:>10} rows  {', '.join(info['columns'])}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    main()
@@ -1,3 +1,4 @@
+import { useState, useEffect } from "react";
 import { TeamLogo } from "./TeamLogo";
 import { getRankColor } from "@/lib/cfb-utils";
 
@@ -15,22 +16,56 @@ interface Team {
   wins: number;
   losses: number;
   ranking: number;
-  games: Game[];
+  games?: Game[];
 }
 
 interface TeamDetailsProps {
   team: Team;
+  query: string;
 }
 
-export const TeamDetails = ({ team }: TeamDetailsProps) => {
+export const TeamDetails = ({ team, query }: TeamDetailsProps) => {
+  const [games, setGames] = useState<Game[] | null>(team.games ?? null);
+  const [error, setError] = useState<string | null>(null);
+
+  useEffect(() => {
+    if (team.games) return;
+
+    let cancelled = false;
+    fetch(`/team/${encodeURIComponent(team.name)}/games?${query}`)
+      .then((response) => {
+        if (!response.ok) throw new Error(`API returned ${response.status}`);
+        return response.json();
+      })
+      .then((data) => {
+        if (!cancelled) setGames(data.games || []);
+      })
+      .catch((err) => {
+        if (!cancelled) setError(err instanceof Error ? err.message : "Failed to load games");
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [team.name, team.games, query]);
+
   return (
     <div className="bg-card rounded-xl p-5 md:p-6 border-4 border-primary/20 shadow-brutal">
       <h3 className="font-display text-2xl md:text-3xl text-primary mb-5 flex items-center gap-3 text-shadow-pop">
         <i className="fas fa-list text-xl md:text-2xl"></i>
         {team.name.toUpperCase()} GAME RESULTS
       </h3>
+      {error && (
+        <p className="text-destructive font-semibold">{error}</p>
+      )}
+      {!games && !error && (
+        <p className="text-muted-foreground font-semibold">
+          <i className="fas fa-spinner animate-spin mr-2"></i>
+          Loading games...
+        </p>
+      )}
       <div className="space-y-3">
-        {team.games.map((game, index) => {
+        {(games || []).map((game, index) => {
           const isWin = game.won;
           const resultBadgeClass = isWin
             ? "bg-gradient-success text-white"
@@ -10,23 +10,30 @@ import { LoadingSpinner } from "@/components/LoadingSpinner";
 import { ErrorDisplay } from "@/components/ErrorDisplay";
 import { getTeamLogo, getRankColor } from "@/lib/cfb-utils";
 
-interface Game {
-  opponent: string;
-  opponent_record: string;
-  opponent_rank: number;
-  won: boolean;
-  margin: number;
-  value: number;
-}
-
 interface Team {
   name: string;
   wins: number;
   losses: number;
   ranking: number;
-  games: Game[];
 }
 
+interface RankingChange extends Team {
+  rank: number;
+  previous_rank: number | null;
+  previous_ranking: number | null;
+}
+
+// Merge pushed ranking changes into the loaded list and restore rank order
+const applyRankingChanges = (teams: Team[], changes: RankingChange[]): Team[] => {
+  const ranks = new Map(teams.map((team, index) => [team.name, index + 1]));
+  const updated = new Map(teams.map((team) => [team.name, team]));
+  for (const { rank, previous_rank, previous_ranking, ...team } of changes) {
+    ranks.set(team.name, rank);
+    updated.set(team.name, { ...updated.get(team.name), ...team });
+  }
+  return [...updated.values()].sort((a, b) => (ranks.get(a.name) ?? 0) - (ranks.get(b.name) ?? 0));
+};
+
 interface FormulaParams {
   win_loss_multiplier: number;
   one_score_multiplier: number;
@@ -69,6 +76,8 @@ const Index = () => {
   const [week, setWeek] = useState("");
   const [seasonType, setSeasonType] = useState("regular");
   const [formulaParams, setFormulaParams] = useState<FormulaParams>(getInitialParams());
+  // Query string of the loaded rankings - TeamDetails fetches games from the same cached solve
+  const [rankingsQuery, setRankingsQuery] = useState("");
 
   const fetchRankings = async () => {
     setLoading(true);
@@ -76,20 +85,22 @@ const Index = () => {
     setExpandedTeam(null);
 
     try {
-      let url = `/rankings?year=${year}&season_type=${seasonType}`;
-      if (week) url += `&week=${week}`;
+      let query = `year=${year}&season_type=${seasonType}`;
+      if (week) query += `&week=${week}`;
       
       // Add formula parameters
-      url += `&win_loss_multiplier=${formulaParams.win_loss_multiplier}`;
-      url += `&one_score_multiplier=${formulaParams.one_score_multiplier}`;
-      url += `&two_score_multiplier=${formulaParams.two_score_multiplier}`;
-      url += `&three_score_multiplier=${formulaParams.three_score_multiplier}`;
-      url += `&strength_of_schedule_multiplier=${formulaParams.strength_of_schedule_multiplier}`;
+      query += `&win_loss_multiplier=${formulaParams.win_loss_multiplier}`;
+      query += `&one_score_multiplier=${formulaParams.one_score_multiplier}`;
+      query += `&two_score_multiplier=${formulaParams.two_score_multiplier}`;
+      query += `&three_score_multiplier=${formulaParams.three_score_multiplier}`;
+      query += `&strength_of_schedule_multiplier=${formulaParams.strength_of_schedule_multiplier}`;
 
-      const response = await fetch(url);
+      // Summary rows only - game results are loaded when a team is expanded
+      const response = await fetch(`/rankings?${query}&include_games=false`);
       if (!response.ok) throw new Error(`API returned ${response.status}`);
 
       const data = await response.json();
+      setRankingsQuery(query);
       setAllTeams(data.teams || []);
       setFilteredTeams(data.teams || []);
     } catch (err) {
@@ -104,6 +115,19 @@ const Index = () => {
     fetchRankings();
   }, [year, week, seasonType, formulaParams]);
 
+  // Live updates: the server pushes rank changes when new final scores are synced
+  useEffect(() => {
+    if (!rankingsQuery) return;
+
+    const source = new EventSource(`/rankings/stream?${rankingsQuery}`);
+    source.addEventListener("rankings", (event) => {
+      const update = JSON.parse((event as MessageEvent).data);
+      setAllTeams((teams) => applyRankingChanges(teams, update.changes || []));
+    });
+
+    return () => source.close();
+  }, [rankingsQuery]);
+
   useEffect(() => {
     const filtered = allTeams.filter((team) =>
       team.name.toLowerCase().includes(searchQuery.toLowerCase())
@@ -247,7 +271,7 @@ const Index = () => {
                   {/* Expanded Details */}
                   {isExpanded && (
                     <div className="bg-gradient-to-r from-muted/30 to-muted/10 animate-accordion-down px-4 py-5 md:px-6 md:py-6">
-                      <TeamDetails team={team} />
+                      <TeamDetails team={team} query={rankingsQuery} />
                     </div>
                   )}
                 </div>
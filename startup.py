@@ -1,4 +1,11 @@
 # startup.py - Railway startup script
+#
+# The start command of every deploy target (Procfile, Dockerfile, nixpacks.toml,
+# railway.toml): creates missing tables, then serves api:app on $PORT.
+#
+# WEB_CONCURRENCY=N runs N uvicorn worker processes (default 1). The workers share
+# computed rankings through shared_cache (a local SQLite file, or Redis when
+# SHARED_CACHE_URL is set), so a ranking is calculated once rather than once per worker.
 
 import os
 import sys
@@ -41,11 +48,21 @@ def startup():
         
         # Start the API
         import uvicorn
-        from api import app
         
         port = int(os.environ.get("PORT", 8000))
-        uvicorn.run(app, host="0.0.0.0", port=port)
+        workers = int(os.environ.get("WEB_CONCURRENCY", 1))
         
+        if workers > 1:
+            from shared_cache import open_shared_cache
+            
+            # Rankings left over from a previous run may predate this code or data
+            open_shared_cache(workers=workers).clear()
+            logger.info(f"Starting {workers} workers with a shared ranking cache")
+            uvicorn.run("api:app", host="0.0.0.0", port=port, workers=workers)
+        else:
+            from api import app
+            uvicorn.run(app, host="0.0.0.0", port=port)
+    
     except Exception as e:
         logger.error(f"Startup failed: {e}")
         import traceback
@@ -0,0 +1,46 @@
+# sync_hooks.py - Callbacks run after a sync changes games
+#
+# The sync paths report which weeks of a season gained or changed games; anything
+# caching data derived from them (the API's ranking cache) registers a hook here.
+# The API also fires the same hooks when its change poll sees a sync that ran in
+# another process (the nightly cron), so hooks run whichever process did the sync.
+
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# hook(season, season_type, weeks, token) - weeks changed in that season type (None = unknown week);
+# token identifies the change so processes reporting the same one can skip duplicates
+PostSyncHook = Callable[[int, str, Set[Optional[int]], Optional[str]], None]
+
+_hooks: List[PostSyncHook] = []
+
+
+def register_post_sync_hook(hook: PostSyncHook) -> PostSyncHook:
+    """Run hook after every sync that changes games (usable as a decorator)"""
+    if hook not in _hooks:
+        _hooks.append(hook)
+    return hook
+
+
+def unregister_post_sync_hook(hook: PostSyncHook):
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def run_post_sync_hooks(changes: Dict[tuple, Iterable[Optional[int]]], token: Optional[str] = None):
+    """Notify hooks of changed weeks keyed by (season, season_type).
+    
+    A failing hook is logged and skipped - it must never fail the sync itself.
+    """
+    for (season, season_type), weeks in changes.items():
+        weeks = set(weeks)
+        if not weeks:
+            continue
+        for hook in list(_hooks):
+            try:
+                hook(season, season_type, weeks, token)
+            except Exception as e:
+                logger.warning(f"Post-sync hook {getattr(hook, '__name__', hook)} failed for {season} "
+                               f"{season_type}: {e}")
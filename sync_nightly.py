@@ -3,19 +3,27 @@
 
 import requests
 import time
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, text, bindparam
 from datetime import datetime, timezone
 import os
 
+from sync_utils import content_hash, iter_json_items, batched, TEAM_HASH_FIELDS, GAME_HASH_FIELDS
+from sync_planner import SyncPlanner, current_season
+from db_models_complete import SeasonGameSummary, backfill_team_ids, refresh_game_summary
+from sync_hooks import run_post_sync_hooks
+
 class MinimalSync:
     """Minimal sync - only teams and games"""
     
+    BATCH_SIZE = 500  # Games written per batch while streaming
+    
     def __init__(self, db_url: str, api_key: str):
         self.db_url = db_url
         self.api_key = api_key
         self.engine = create_engine(db_url)
         self.headers = {'Authorization': f'Bearer {api_key}'}
         self.base_url = "https://api.collegefootballdata.com"
+        self.changed_weeks = {}  # (season, season_type) -> weeks whose games changed this run
     
     def _api_request(self, endpoint: str, params: dict = None):
         """Make API request with rate limiting"""
@@ -33,6 +41,25 @@ class MinimalSync:
             print(f"API Error for {endpoint}: {e}")
             return None
     
+    def _api_stream(self, endpoint: str, params: dict = None):
+        """Make API request and yield the items of the JSON array as they are parsed"""
+        time.sleep(0.1)  # Rate limiting
+        try:
+            response = requests.get(
+                f"{self.base_url}{endpoint}",
+                headers=self.headers,
+                params=params or {},
+                timeout=30,
+                stream=True
+            )
+            response.raise_for_status()
+        except Exception as e:
+            print(f"API Error for {endpoint}: {e}")
+            return
+        
+        with response:
+            yield from iter_json_items(response)
+    
     def sync_teams(self):
         """Sync FBS teams"""
         print("Syncing teams...")
@@ -42,44 +69,53 @@ class MinimalSync:
             print("Failed to get teams data")
             return
         
-        added = updated = 0
+        added = updated = unchanged = 0
         
         with self.engine.connect() as conn:
+            # school -> content_hash for every known team in one query
+            existing = dict(conn.execute(text("SELECT school, content_hash FROM teams")).fetchall())
+            
             for team in teams_data:
                 school = team.get('school')
                 if not school:
                     continue
                 
-                # Check if exists
-                existing = conn.execute(
-                    text("SELECT id FROM teams WHERE school = :school"),
-                    {"school": school}
-                ).fetchone()
+                team_values = {
+                    "api_id": team.get('id'),
+                    "school": school,
+                    "mascot": team.get('mascot'),
+                    "abbreviation": team.get('abbreviation'),
+                    "classification": team.get('classification', 'fbs'),
+                    "conference": team.get('conference'),
+                    "division": team.get('division'),
+                    "color": team.get('color'),
+                    "alt_color": team.get('alt_color')
+                }
+                team_values["content_hash"] = content_hash(team_values, TEAM_HASH_FIELDS)
                 
-                if existing:
+                if school in existing:
+                    # Skip rows whose payload hasn't changed since the last sync
+                    if existing[school] == team_values["content_hash"]:
+                        unchanged += 1
+                        continue
+                    
                     # Update
                     conn.execute(
                         text("""
                             UPDATE teams SET
+                                api_id = :api_id,
                                 mascot = :mascot,
                                 abbreviation = :abbreviation,
                                 classification = :classification,
                                 conference = :conference,
                                 division = :division,
                                 color = :color,
-                                alt_color = :alt_color
+                                alt_color = :alt_color,
+                                content_hash = :content_hash,
+                                updated_at = CURRENT_TIMESTAMP
                             WHERE school = :school
                         """),
-                        {
-                            "school": school,
-                            "mascot": team.get('mascot'),
-                            "abbreviation": team.get('abbreviation'),
-                            "classification": team.get('classification', 'fbs'),
-                            "conference": team.get('conference'),
-                            "division": team.get('division'),
-                            "color": team.get('color'),
-                            "alt_color": team.get('alt_color')
-                        }
+                        team_values
                     )
                     updated += 1
                 else:
@@ -87,137 +123,192 @@ class MinimalSync:
                     conn.execute(
                         text("""
                             INSERT INTO teams 
-                            (school, mascot, abbreviation, classification, conference, 
-                             division, color, alt_color)
+                            (api_id, school, mascot, abbreviation, classification, conference, 
+                             division, color, alt_color, content_hash)
                             VALUES 
-                            (:school, :mascot, :abbreviation, :classification, :conference,
-                             :division, :color, :alt_color)
+                            (:api_id, :school, :mascot, :abbreviation, :classification, :conference,
+                             :division, :color, :alt_color, :content_hash)
                         """),
-                        {
-                            "school": school,
-                            "mascot": team.get('mascot'),
-                            "abbreviation": team.get('abbreviation'),
-                            "classification": team.get('classification', 'fbs'),
-                            "conference": team.get('conference'),
-                            "division": team.get('division'),
-                            "color": team.get('color'),
-                            "alt_color": team.get('alt_color')
-                        }
+                        team_values
                     )
                     added += 1
             
+            # New or changed API ids - fill integer team columns on rows stored by name only,
+            # then rebuild the game summary since ids and classifications feed it
+            if added or updated:
+                backfill_team_ids(conn)
+                refresh_game_summary(conn)
+            
             conn.commit()
         
-        print(f"Teams: {added} added, {updated} updated")
+        print(f"Teams: {added} added, {updated} updated, {unchanged} unchanged")
     
-    def sync_games(self, season: int, season_type: str = "regular"):
-        """Sync games for a season"""
-        print(f"Syncing {season} {season_type} games...")
+    def sync_games(self, season: int, season_type: str = "regular", week: int = None) -> bool:
+        """Sync games for a season (or a single week of it); False if the API sent nothing"""
+        print(f"Syncing {season} {season_type} games{f' (week {week})' if week else ''}...")
         
-        games_data = self._api_request('/games', {
-            'year': season,
-            'seasonType': season_type
-        })
+        params = {'year': season, 'seasonType': season_type}
+        if week:
+            params['week'] = week
         
-        if not games_data:
-            print(f"Failed to get games data for {season}")
-            return
+        games_stream = self._api_stream('/games', params)
         
-        added = updated = 0
+        added = updated = unchanged = 0
         skipped = 0
+        received = 0
         
         with self.engine.connect() as conn:
-            for game in games_data:
-                game_id = game.get('id')
-                home_team = game.get('homeTeam') or game.get('home_team')
-                away_team = game.get('awayTeam') or game.get('away_team')
-                home_points = game.get('homePoints') or game.get('home_points')
-                away_points = game.get('awayPoints') or game.get('away_points')
+            # Parse the response incrementally and write fixed-size batches
+            for batch in batched(games_stream, self.BATCH_SIZE):
+                received += len(batch)
                 
-                # Skip if missing critical data
-                if not game_id or not home_team or not away_team:
-                    skipped += 1
-                    continue
-                
-                # Check if exists
-                existing = conn.execute(
-                    text("SELECT id FROM games WHERE id = :id"),
-                    {"id": game_id}
-                ).fetchone()
-                
-                game_values = {
-                    "id": game_id,
-                    "season": game.get('season', season),
-                    "week": game.get('week'),
-                    "season_type": game.get('seasonType') or game.get('season_type', season_type),
-                    "start_date": game.get('startDate') or game.get('start_date'),
-                    "completed": game.get('completed', False),
-                    "home_team": home_team,
-                    "away_team": away_team,
-                    "home_points": home_points,
-                    "away_points": away_points,
-                    "venue": game.get('venue'),
-                    "neutral_site": game.get('neutralSite') or game.get('neutral_site', False),
-                    "conference_game": game.get('conferenceGame') or game.get('conference_game', False)
-                }
+                # game id -> content_hash for this batch in one query
+                batch_ids = [game.get('id') for game in batch if game.get('id')]
+                existing = dict(conn.execute(
+                    text("SELECT id, content_hash FROM games WHERE id IN :ids")
+                        .bindparams(bindparam('ids', expanding=True)),
+                    {"ids": batch_ids}
+                ).fetchall())
                 
-                if existing:
-                    # Update
-                    conn.execute(
-                        text("""
-                            UPDATE games SET
-                                season = :season,
-                                week = :week,
-                                season_type = :season_type,
-                                start_date = :start_date,
-                                completed = :completed,
-                                home_team = :home_team,
-                                away_team = :away_team,
-                                home_points = :home_points,
-                                away_points = :away_points,
-                                venue = :venue,
-                                neutral_site = :neutral_site,
-                                conference_game = :conference_game
-                            WHERE id = :id
-                        """),
-                        game_values
-                    )
-                    updated += 1
-                else:
-                    # Insert
-                    conn.execute(
-                        text("""
-                            INSERT INTO games 
-                            (id, season, week, season_type, start_date, completed,
-                             home_team, away_team, home_points, away_points,
-                             venue, neutral_site, conference_game)
-                            VALUES 
-                            (:id, :season, :week, :season_type, :start_date, :completed,
-                             :home_team, :away_team, :home_points, :away_points,
-                             :venue, :neutral_site, :conference_game)
-                        """),
-                        game_values
-                    )
-                    added += 1
+                for game in batch:
+                    game_id = game.get('id')
+                    home_team = game.get('homeTeam') or game.get('home_team')
+                    away_team = game.get('awayTeam') or game.get('away_team')
+                    home_points = game.get('homePoints') or game.get('home_points')
+                    away_points = game.get('awayPoints') or game.get('away_points')
+                    
+                    # Skip if missing critical data
+                    if not game_id or not home_team or not away_team:
+                        skipped += 1
+                        continue
+                    
+                    game_values = {
+                        "id": game_id,
+                        "season": game.get('season', season),
+                        "week": game.get('week'),
+                        "season_type": game.get('seasonType') or game.get('season_type', season_type),
+                        "start_date": game.get('startDate') or game.get('start_date'),
+                        "completed": game.get('completed', False),
+                        "home_id": game.get('homeId') or game.get('home_id'),
+                        "away_id": game.get('awayId') or game.get('away_id'),
+                        "home_team": home_team,
+                        "away_team": away_team,
+                        "home_points": home_points,
+                        "away_points": away_points,
+                        "venue": game.get('venue'),
+                        "neutral_site": game.get('neutralSite') or game.get('neutral_site', False),
+                        "conference_game": game.get('conferenceGame') or game.get('conference_game', False)
+                    }
+                    game_values["content_hash"] = content_hash(game_values, GAME_HASH_FIELDS)
+                    
+                    if game_id in existing:
+                        # Skip rows whose payload hasn't changed since the last sync
+                        if existing[game_id] == game_values["content_hash"]:
+                            unchanged += 1
+                            continue
+                        
+                        self.changed_weeks.setdefault((season, season_type), set()).add(game_values["week"])
+                        
+                        # Update
+                        conn.execute(
+                            text("""
+                                UPDATE games SET
+                                    season = :season,
+                                    week = :week,
+                                    season_type = :season_type,
+                                    start_date = :start_date,
+                                    completed = :completed,
+                                    home_id = :home_id,
+                                    away_id = :away_id,
+                                    home_team = :home_team,
+                                    away_team = :away_team,
+                                    home_points = :home_points,
+                                    away_points = :away_points,
+                                    venue = :venue,
+                                    neutral_site = :neutral_site,
+                                    conference_game = :conference_game,
+                                    content_hash = :content_hash,
+                                    updated_at = CURRENT_TIMESTAMP
+                                WHERE id = :id
+                            """),
+                            game_values
+                        )
+                        updated += 1
+                    else:
+                        self.changed_weeks.setdefault((season, season_type), set()).add(game_values["week"])
+                        
+                        # Insert
+                        conn.execute(
+                            text("""
+                                INSERT INTO games 
+                                (id, season, week, season_type, start_date, completed,
+                                 home_id, away_id, home_team, away_team, home_points, away_points,
+                                 venue, neutral_site, conference_game, content_hash)
+                                VALUES 
+                                (:id, :season, :week, :season_type, :start_date, :completed,
+                                 :home_id, :away_id, :home_team, :away_team, :home_points, :away_points,
+                                 :venue, :neutral_site, :conference_game, :content_hash)
+                            """),
+                            game_values
+                        )
+                        added += 1
+            
+            # Only seasons whose games changed need their summary rebuilt; games
+            # the API sent without team ids get them from the school name first
+            if added or updated:
+                backfill_team_ids(conn, ['games'])
+                refresh_game_summary(conn, [season])
             
             conn.commit()
         
-        print(f"Games: {added} added, {updated} updated, {skipped} skipped")
+        if not received:
+            print(f"Failed to get games data for {season}")
+            return False
+        
+        print(f"Games: {added} added, {updated} updated, {unchanged} unchanged, {skipped} skipped")
+        return True
+    
+    def sync_games_incremental(self, season: int, season_type: str = "regular"):
+        """Sync only the weeks that still have unfinished or recently changed games"""
+        planner = SyncPlanner(self._api_request)
+        
+        with self.engine.connect() as conn:
+            planner.ensure_table(conn)
+            conn.commit()
+            weeks = planner.plan_weeks(conn, season, season_type)
+        
+        if weeks is None:
+            print(f"No watermark for {season} {season_type}, syncing full season")
+            weeks = [None]
+        else:
+            print(f"{season} {season_type}: weeks to sync {weeks or 'none'}")
+        
+        # A week that failed to sync must stay below the watermark so the next run retries it
+        failed = [week for week in weeks if not self.sync_games(season, season_type, week)]
+        if failed:
+            print(f"Games sync failed for {season} {season_type} {failed}, keeping the watermark")
+            return
+        
+        with self.engine.connect() as conn:
+            planner.advance(conn, season, season_type)
     
     def sync_current_season(self):
         """Sync current season data"""
-        current_year = datetime.now().year
+        season = current_season()
+        
+        # Summary table read by the ranking engine, for databases created before it existed
+        SeasonGameSummary.__table__.create(bind=self.engine, checkfirst=True)
         
         # Sync teams first
         self.sync_teams()
         
-        # Sync regular season
-        self.sync_games(current_year, "regular")
+        # Regular season and postseason - the planner skips weeks that haven't started
+        self.changed_weeks = {}
+        self.sync_games_incremental(season, "regular")
+        self.sync_games_incremental(season, "postseason")
         
-        # If it's bowl season (December/January), sync postseason too
-        current_month = datetime.now().month
-        if current_month == 12 or current_month == 1:
-            self.sync_games(current_year, "postseason")
+        # Let the ranking cache drop and rewarm the weeks that changed
+        run_post_sync_hooks(self.changed_weeks)
         
         print("Sync complete!")
 
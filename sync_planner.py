@@ -0,0 +1,164 @@
+# sync_planner.py - Plan incremental game syncs from stored high-water marks
+
+from typing import Optional, List, Dict, Any, Callable
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, update, insert, text, bindparam
+import logging
+
+from db_models_complete import SyncWatermark
+
+logger = logging.getLogger(__name__)
+
+
+def parse_api_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO timestamp from the API (e.g. 2024-08-24T16:00:00.000Z)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def current_season(now: Optional[datetime] = None) -> int:
+    """Season year for a date - January bowls belong to the previous season"""
+    now = now or datetime.now()
+    return now.year if now.month >= 8 else now.year - 1
+
+
+class SyncPlanner:
+    """Decide which weeks of a season still need to be fetched.
+    
+    Per (dataset, season, season_type) the planner keeps the last week whose
+    games have all kicked off, the latest completed game start, and the ids of
+    started games that are not final yet. A week is refetched only when it
+    has started and is past the watermark, still holds an unfinished game,
+    or ended within the last `recheck_days` (late score corrections).
+    """
+    
+    DATASET = 'games'
+    
+    def __init__(self, api_request: Callable[[str, Dict], Any], recheck_days: int = 3):
+        self.api_request = api_request
+        self.recheck_days = recheck_days
+        self._calendars: Dict[int, List[Dict]] = {}
+    
+    def ensure_table(self, bind):
+        """Create the watermark table for callers that don't run init_db"""
+        SyncWatermark.__table__.create(bind=bind, checkfirst=True)
+    
+    def get_watermark(self, conn, season: int, season_type: str) -> Optional[Dict]:
+        """Load the stored watermark, or None if this season was never synced"""
+        table = SyncWatermark.__table__
+        row = conn.execute(
+            select(table).where(
+                table.c.dataset == self.DATASET,
+                table.c.season == season,
+                table.c.season_type == season_type
+            )
+        ).mappings().first()
+        return dict(row) if row else None
+    
+    def _calendar(self, season: int) -> List[Dict]:
+        """Season calendar (one cheap request, cached per planner)"""
+        if season not in self._calendars:
+            self._calendars[season] = self.api_request('/calendar', {'year': season}) or []
+        return self._calendars[season]
+    
+    def plan_weeks(self, conn, season: int, season_type: str,
+                   now: Optional[datetime] = None) -> Optional[List[int]]:
+        """Weeks to fetch, or None when a full-season sync is needed"""
+        now = now or datetime.now(timezone.utc)
+        
+        calendar = [
+            entry for entry in self._calendar(season)
+            if (entry.get('seasonType') or entry.get('season_type')) == season_type
+        ]
+        if not calendar:
+            return None
+        
+        # week -> end of week, for weeks that have already started
+        started = {}
+        for entry in calendar:
+            week_start = parse_api_date(entry.get('startDate') or entry.get('firstGameStart'))
+            week_end = parse_api_date(entry.get('endDate') or entry.get('lastGameStart')) or week_start
+            if entry.get('week') is not None and week_start and week_start <= now:
+                started[entry['week']] = week_end
+        
+        watermark = self.get_watermark(conn, season, season_type)
+        if watermark is None:
+            return None  # First sync of this season - one full-season request is cheapest
+        
+        last_completed_week = watermark['last_completed_week'] or 0
+        weeks = {week for week in started if week > last_completed_week}
+        
+        # Weeks still holding postponed or in-progress games
+        incomplete_ids = watermark['incomplete_game_ids'] or []
+        if incomplete_ids:
+            weeks.update(
+                week for (week,) in conn.execute(
+                    text("SELECT DISTINCT week FROM games WHERE id IN :ids")
+                        .bindparams(bindparam('ids', expanding=True)),
+                    {"ids": incomplete_ids}
+                ) if week is not None
+            )
+        
+        # Recently finished weeks, to pick up stat and score corrections
+        recheck_since = now - timedelta(days=self.recheck_days)
+        weeks.update(week for week, week_end in started.items() if week_end and week_end >= recheck_since)
+        
+        return sorted(weeks)
+    
+    def advance(self, conn, season: int, season_type: str, now: Optional[datetime] = None) -> Dict:
+        """Recompute the watermark from the games table after a sync"""
+        now = now or datetime.now(timezone.utc)
+        
+        rows = conn.execute(
+            text("""
+                SELECT id, week, start_date, completed FROM games
+                WHERE season = :season AND season_type = :season_type
+            """),
+            {"season": season, "season_type": season_type}
+        ).fetchall()
+        
+        incomplete_ids = [
+            game_id for game_id, _, start_date, completed in rows
+            if not completed and (parse_api_date(start_date) or now) <= now
+        ]
+        incomplete_set = set(incomplete_ids)
+        
+        # Started-but-unfinished games are tracked by id, so only games that
+        # haven't kicked off yet hold the week watermark back
+        pending_weeks = [
+            week for game_id, week, _, completed in rows
+            if not completed and week is not None and game_id not in incomplete_set
+        ]
+        all_weeks = [week for _, week, _, _ in rows if week is not None]
+        completed_starts = [start_date for _, _, start_date, completed in rows if completed and start_date]
+        
+        values = {
+            'last_completed_week': (min(pending_weeks) - 1) if pending_weeks else max(all_weeks, default=None),
+            'last_game_start': max(completed_starts, key=lambda d: parse_api_date(d) or now, default=None),
+            'incomplete_game_ids': incomplete_ids,
+            'updated_at': datetime.utcnow(),
+        }
+        
+        table = SyncWatermark.__table__
+        if self.get_watermark(conn, season, season_type) is None:
+            conn.execute(insert(table).values(
+                dataset=self.DATASET, season=season, season_type=season_type, **values
+            ))
+        else:
+            conn.execute(update(table).where(
+                table.c.dataset == self.DATASET,
+                table.c.season == season,
+                table.c.season_type == season_type
+            ).values(**values))
+        conn.commit()
+        
+        logger.info(f"Watermark {season} {season_type}: week {values['last_completed_week']}, "
+                    f"{len(incomplete_ids)} incomplete games")
+        return values
@@ -1,17 +1,22 @@
 # sync_service_enhanced.py - Enhanced version that extends your existing sync service
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 import requests
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import text, bindparam
 import logging
 import time
 import os
 
 from db_models_complete import (
-    SessionLocal, Team, Game, SyncLog
+    SessionLocal, Team, Game, SyncLog, backfill_team_ids, refresh_game_summary,
+    ensure_season_partitions, PARTITIONED_TABLES
 )
+from bulk_ingest import bulk_ingest, stable_id
+from sync_utils import content_hash, iter_json_items, batched, RateLimiter, TEAM_HASH_FIELDS, GAME_HASH_FIELDS
+from sync_planner import SyncPlanner, current_season
+from sync_hooks import run_post_sync_hooks
 
 logger = logging.getLogger(__name__)
 
@@ -19,15 +24,25 @@ class CFBDataSyncService:
     """Enhanced sync service for College Football Data API with additional datasets"""
     
     BASE_URL = "https://api.collegefootballdata.com"
+    SYNC_BATCH_SIZE = 500  # Rows per write batch; also keeps IN (...) lists under SQLite's bind limit
+    AP_POLL = 'AP Top 25'
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, rate_limiter: Optional[RateLimiter] = None):
         self.api_key = api_key
         self.headers = {'Authorization': f'Bearer {api_key}'}
+        self.rate_limiter = rate_limiter  # Shared across threads by the backfill
+    
+    def _throttle(self):
+        """Rate limiting between API requests"""
+        if self.rate_limiter:
+            self.rate_limiter.wait()
+        else:
+            time.sleep(0.1)
     
     def _api_request(self, endpoint: str, params: Dict = None) -> Any:
         """Make API request with error handling and rate limiting"""
         try:
-            time.sleep(0.1)  # Rate limiting
+            self._throttle()
             
             response = requests.get(
                 f"{self.BASE_URL}{endpoint}",
@@ -41,6 +56,26 @@ class CFBDataSyncService:
             logger.error(f"API request failed for {endpoint}: {e}")
             raise
     
+    def _api_stream(self, endpoint: str, params: Dict = None) -> Iterator[Any]:
+        """Make API request and yield the items of the JSON array as they are parsed"""
+        try:
+            self._throttle()
+            
+            response = requests.get(
+                f"{self.BASE_URL}{endpoint}",
+                headers=self.headers,
+                params=params or {},
+                timeout=30,
+                stream=True
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"API request failed for {endpoint}: {e}")
+            raise
+        
+        with response:
+            yield from iter_json_items(response)
+    
     def _log_sync(self, db: Session, sync_type: str, season: int = None, 
                   season_type: str = None, week: int = None) -> SyncLog:
         """Create sync log entry"""
@@ -57,15 +92,66 @@ class CFBDataSyncService:
     
     def _complete_sync_log(self, db: Session, log_entry: SyncLog, 
                           status: str, added: int = 0, updated: int = 0, 
-                          error: str = None):
+                          error: str = None, unchanged: int = 0):
         """Complete sync log entry"""
         log_entry.status = status
         log_entry.records_added = added
         log_entry.records_updated = updated
+        log_entry.records_unchanged = unchanged
         log_entry.error_message = error
         log_entry.completed_at = datetime.now(timezone.utc)
         db.commit()
     
+    def _prefetch_ids(self, db: Session, query, params: Dict) -> Dict[tuple, int]:
+        """Load existing natural keys -> row id in a single query.
+        
+        The query must select the row id first, followed by the natural key columns.
+        """
+        stmt = text(query) if isinstance(query, str) else query
+        return {tuple(row[1:]): row[0] for row in db.execute(stmt, params)}
+    
+    def _prefetch_rows(self, db: Session, query, params: Dict, key_size: int) -> Dict[tuple, tuple]:
+        """Load existing natural keys -> (row id, stored values) in a single query.
+        
+        The query must select the row id, then the key_size natural key columns, then
+        the columns an update writes.
+        """
+        stmt = text(query) if isinstance(query, str) else query
+        return {
+            tuple(row[1:1 + key_size]): (row[0], tuple(row[1 + key_size:]))
+            for row in db.execute(stmt, params)
+        }
+    
+    @staticmethod
+    def _queue_row(key: tuple, row: Dict, fields: tuple, existing: Dict, inserts: Dict, updates: Dict) -> bool:
+        """Queue a new row as an insert, or an existing one as an update if any of its
+        fields (in the order _prefetch_rows loaded them) changed. False if unchanged.
+        """
+        current = existing.get(key)
+        if current is None:
+            inserts[key] = row
+            return True
+        row_id, stored = current
+        if stored == tuple(row[field] for field in fields):
+            return False
+        updates[key] = dict(row, id=row_id)
+        return True
+    
+    def _write_batches(self, db: Session, insert_sql: str, update_sql: str,
+                       inserts: Dict, updates: Dict):
+        """Write queued rows as one executemany batch for inserts and one for updates"""
+        if inserts:
+            db.execute(text(insert_sql), list(inserts.values()))
+        if updates:
+            db.execute(text(update_sql), list(updates.values()))
+    
+    def _team_ids(self, db: Session) -> Dict[str, int]:
+        """school -> API team id, resolved once per sync so rows can store integer keys"""
+        return {
+            school: api_id
+            for school, api_id in db.query(Team.school, Team.api_id).filter(Team.api_id.isnot(None))
+        }
+    
     # ==================== EXISTING METHODS (from your current file) ====================
     
     def sync_teams(self, db: Session, classification: str = 'fbs') -> Dict:
@@ -74,21 +160,26 @@ class CFBDataSyncService:
         
         try:
             teams_data = self._api_request(f'/teams/{classification}')
-            added = updated = 0
+            added = updated = unchanged = 0
+            
+            # school -> (id, content_hash) for every known team in one query
+            existing = {
+                school: (team_id, row_hash)
+                for school, team_id, row_hash in db.query(Team.school, Team.id, Team.content_hash)
+            }
+            inserts, updates = {}, {}
+            now = datetime.utcnow()
             
             for team_data in teams_data:
-                existing = db.query(Team).filter(
-                    Team.school == team_data['school']
-                ).first()
-                
                 team_dict = {
+                    'api_id': team_data.get('id'),
                     'school': team_data['school'],
                     'mascot': team_data.get('mascot'),
                     'abbreviation': team_data.get('abbreviation'),
                     'alt_name1': team_data.get('alt_name1'),
                     'alt_name2': team_data.get('alt_name2'),
                     'alt_name3': team_data.get('alt_name3'),
-                    'classification': team_data.get('classification'),
+                    'classification': team_data.get('classification', classification),
                     'conference': team_data.get('conference'),
                     'division': team_data.get('division'),
                     'color': team_data.get('color'),
@@ -116,19 +207,33 @@ class CFBDataSyncService:
                         'location_dome': loc.get('dome'),
                     })
                 
-                if existing:
-                    for key, value in team_dict.items():
-                        setattr(existing, key, value)
-                    updated += 1
+                school = team_dict['school']
+                team_dict['content_hash'] = content_hash(team_dict, TEAM_HASH_FIELDS)
+                
+                if school in existing:
+                    team_id, row_hash = existing[school]
+                    if row_hash == team_dict['content_hash']:
+                        unchanged += 1
+                        continue
+                    updates[school] = dict(team_dict, id=team_id, updated_at=now)
                 else:
-                    db.add(Team(**team_dict))
-                    added += 1
+                    inserts[school] = team_dict
             
-            db.commit()
-            self._complete_sync_log(db, log_entry, 'success', added, updated)
-            logger.info(f"Teams synced: {added} added, {updated} updated")
-            return {'added': added, 'updated': updated}
+            db.bulk_insert_mappings(Team, list(inserts.values()))
+            db.bulk_update_mappings(Team, list(updates.values()))
+            added, updated = len(inserts), len(updates)
             
+            # New or changed API ids - fill integer team columns on rows stored by name only,
+            # then rebuild the game summary since ids and classifications feed it
+            if inserts or updates:
+                backfill_team_ids(db.connection())
+                refresh_game_summary(db.connection())
+            
+            db.commit()
+            self._complete_sync_log(db, log_entry, 'success', added, updated, unchanged=unchanged)
+            logger.info(f"Teams synced: {added} added, {updated} updated, {unchanged} unchanged")
+            return {'added': added, 'updated': updated, 'unchanged': unchanged}
+        
         except Exception as e:
             db.rollback()
             self._complete_sync_log(db, log_entry, 'failed', error=str(e))
@@ -144,77 +249,101 @@ class CFBDataSyncService:
             if week:
                 params['week'] = week
             
-            games_data = self._api_request('/games', params)
-            added = updated = 0
+            added = updated = unchanged = 0
             skipped = 0
+            changed_weeks = set()
+            now = datetime.utcnow()
             
-            for game_data in games_data:
-                game_id = game_data.get('id')
-                if not game_id:
-                    skipped += 1
-                    continue
+            # Parse the response incrementally and write fixed-size batches
+            for batch in batched(self._api_stream('/games', params), self.SYNC_BATCH_SIZE):
+                # game id -> content_hash for this batch in one query
+                batch_ids = [game_data.get('id') for game_data in batch if game_data.get('id')]
+                existing = dict(
+                    db.query(Game.id, Game.content_hash).filter(Game.id.in_(batch_ids)).all()
+                )
+                inserts, updates = {}, {}
                 
-                # Use camelCase field names from API
-                home_team = game_data.get('home_team') or game_data.get('homeTeam')
-                away_team = game_data.get('away_team') or game_data.get('awayTeam')
-                
-                if not home_team or not away_team:
-                    logger.debug(f"Skipping game {game_id} - missing team names")
-                    skipped += 1
-                    continue
-                
-                existing = db.query(Game).filter(Game.id == game_id).first()
-                
-                # Map all fields - use camelCase from API
-                game_dict = {
-                    'id': game_id,
-                    'season': game_data.get('season'),
-                    'week': game_data.get('week'),
-                    'season_type': game_data.get('season_type') or game_data.get('seasonType'),
-                    'start_date': game_data.get('start_date') or game_data.get('startDate'),
-                    'start_time_tbd': game_data.get('start_time_tbd') or game_data.get('startTimeTBD'),
-                    'completed': game_data.get('completed', False),
-                    'neutral_site': game_data.get('neutral_site') or game_data.get('neutralSite'),
-                    'conference_game': game_data.get('conference_game') or game_data.get('conferenceGame'),
-                    'attendance': game_data.get('attendance'),
-                    'venue_id': game_data.get('venue_id') or game_data.get('venueId'),
-                    'venue': game_data.get('venue'),
-                    'home_id': game_data.get('home_id') or game_data.get('homeId'),
-                    'home_team': home_team,
-                    'home_conference': game_data.get('home_conference') or game_data.get('homeConference'),
-                    'home_division': game_data.get('home_division') or game_data.get('homeDivision'),
-                    'home_points': game_data.get('home_points') or game_data.get('homePoints'),
-                    'home_line_scores': game_data.get('home_line_scores') or game_data.get('homeLineScores', []),
-                    'home_post_win_prob': game_data.get('home_post_win_prob') or game_data.get('homePostWinProbability'),
-                    'home_pregame_elo': game_data.get('home_pregame_elo') or game_data.get('homePregameElo'),
-                    'home_postgame_elo': game_data.get('home_postgame_elo') or game_data.get('homePostgameElo'),
-                    'away_id': game_data.get('away_id') or game_data.get('awayId'),
-                    'away_team': away_team,
-                    'away_conference': game_data.get('away_conference') or game_data.get('awayConference'),
-                    'away_division': game_data.get('away_division') or game_data.get('awayDivision'),
-                    'away_points': game_data.get('away_points') or game_data.get('awayPoints'),
-                    'away_line_scores': game_data.get('away_line_scores') or game_data.get('awayLineScores', []),
-                    'away_post_win_prob': game_data.get('away_post_win_prob') or game_data.get('awayPostWinProbability'),
-                    'away_pregame_elo': game_data.get('away_pregame_elo') or game_data.get('awayPregameElo'),
-                    'away_postgame_elo': game_data.get('away_postgame_elo') or game_data.get('awayPostgameElo'),
-                    'excitement_index': game_data.get('excitement_index') or game_data.get('excitementIndex'),
-                    'highlights': game_data.get('highlights', ''),
-                    'notes': game_data.get('notes'),
-                }
+                for game_data in batch:
+                    game_id = game_data.get('id')
+                    if not game_id:
+                        skipped += 1
+                        continue
+                    
+                    # Use camelCase field names from API
+                    home_team = game_data.get('home_team') or game_data.get('homeTeam')
+                    away_team = game_data.get('away_team') or game_data.get('awayTeam')
+                    
+                    if not home_team or not away_team:
+                        logger.debug(f"Skipping game {game_id} - missing team names")
+                        skipped += 1
+                        continue
+                    
+                    # Map all fields - use camelCase from API
+                    game_dict = {
+                        'id': game_id,
+                        'season': game_data.get('season', season),
+                        'week': game_data.get('week'),
+                        'season_type': game_data.get('season_type') or game_data.get('seasonType', season_type),
+                        'start_date': game_data.get('start_date') or game_data.get('startDate'),
+                        'start_time_tbd': game_data.get('start_time_tbd') or game_data.get('startTimeTBD'),
+                        'completed': game_data.get('completed', False),
+                        'neutral_site': game_data.get('neutral_site') or game_data.get('neutralSite', False),
+                        'conference_game': game_data.get('conference_game') or game_data.get('conferenceGame', False),
+                        'attendance': game_data.get('attendance'),
+                        'venue_id': game_data.get('venue_id') or game_data.get('venueId'),
+                        'venue': game_data.get('venue'),
+                        'home_id': game_data.get('home_id') or game_data.get('homeId'),
+                        'home_team': home_team,
+                        'home_conference': game_data.get('home_conference') or game_data.get('homeConference'),
+                        'home_division': game_data.get('home_division') or game_data.get('homeDivision'),
+                        'home_points': game_data.get('home_points') or game_data.get('homePoints'),
+                        'home_line_scores': game_data.get('home_line_scores') or game_data.get('homeLineScores', []),
+                        'home_post_win_prob': game_data.get('home_post_win_prob') or game_data.get('homePostWinProbability'),
+                        'home_pregame_elo': game_data.get('home_pregame_elo') or game_data.get('homePregameElo'),
+                        'home_postgame_elo': game_data.get('home_postgame_elo') or game_data.get('homePostgameElo'),
+                        'away_id': game_data.get('away_id') or game_data.get('awayId'),
+                        'away_team': away_team,
+                        'away_conference': game_data.get('away_conference') or game_data.get('awayConference'),
+                        'away_division': game_data.get('away_division') or game_data.get('awayDivision'),
+                        'away_points': game_data.get('away_points') or game_data.get('awayPoints'),
+                        'away_line_scores': game_data.get('away_line_scores') or game_data.get('awayLineScores', []),
+                        'away_post_win_prob': game_data.get('away_post_win_prob') or game_data.get('awayPostWinProbability'),
+                        'away_pregame_elo': game_data.get('away_pregame_elo') or game_data.get('awayPregameElo'),
+                        'away_postgame_elo': game_data.get('away_postgame_elo') or game_data.get('awayPostgameElo'),
+                        'excitement_index': game_data.get('excitement_index') or game_data.get('excitementIndex'),
+                        'highlights': game_data.get('highlights', ''),
+                        'notes': game_data.get('notes'),
+                    }
+                    
+                    game_dict['content_hash'] = content_hash(game_dict, GAME_HASH_FIELDS)
+                    
+                    if game_id in existing:
+                        if existing[game_id] == game_dict['content_hash']:
+                            unchanged += 1
+                            continue
+                        updates[game_id] = dict(game_dict, updated_at=now)
+                    else:
+                        inserts[game_id] = game_dict
                 
-                if existing:
-                    for key, value in game_dict.items():
-                        setattr(existing, key, value)
-                    updated += 1
-                else:
-                    db.add(Game(**game_dict))
-                    added += 1
+                db.bulk_insert_mappings(Game, list(inserts.values()))
+                db.bulk_update_mappings(Game, list(updates.values()))
+                added += len(inserts)
+                updated += len(updates)
+                changed_weeks.update(game['week'] for game in (*inserts.values(), *updates.values()))
             
-            db.commit()
-            self._complete_sync_log(db, log_entry, 'success', added, updated)
-            logger.info(f"Games synced for {season} {season_type}: {added} added, {updated} updated, {skipped} skipped")
-            return {'added': added, 'updated': updated, 'skipped': skipped}
+            # Only seasons whose games changed need their summary rebuilt; games
+            # the API sent without team ids get them from the school name first
+            if added or updated:
+                backfill_team_ids(db.connection(), ['games'])
+                refresh_game_summary(db.connection(), [season])
             
+            db.commit()
+            self._complete_sync_log(db, log_entry, 'success', added, updated, unchanged=unchanged)
+            logger.info(f"Games synced for {season} {season_type}: {added} added, {updated} updated, "
+                        f"{unchanged} unchanged, {skipped} skipped")
+            return {'success': True, 'added': added, 'updated': updated, 'unchanged': unchanged,
+                    'skipped': skipped, 'changed_weeks': list(changed_weeks)}
+        
         except Exception as e:
             db.rollback()
             self._complete_sync_log(db, log_entry, 'failed', error=str(e))
@@ -232,7 +361,22 @@ class CFBDataSyncService:
                 params['week'] = week
             
             data = self._api_request('/rankings', params)
-            added = updated = 0
+            
+            # Existing (week, season_type, school) rows for the season's AP poll in one query
+            existing_query = """
+                SELECT id, week, season_type, school, team_id, conference, rank, first_place_votes, points
+                FROM ap_rankings
+                WHERE season = :season AND poll = :poll
+            """
+            existing_params = {"season": season, "poll": self.AP_POLL}
+            if week:
+                existing_query += " AND week = :week"
+                existing_params["week"] = week
+            existing = self._prefetch_rows(db, existing_query, existing_params, key_size=3)
+            team_ids = self._team_ids(db)
+            
+            inserts, updates = {}, {}
+            unchanged = 0
             
             for poll_week in data:
                 week_num = poll_week.get('week')
@@ -241,7 +385,7 @@ class CFBDataSyncService:
                 # Process AP Poll rankings
                 ap_polls = poll_week.get('polls', [])
                 for poll in ap_polls:
-                    if poll.get('poll') != 'AP Top 25':
+                    if poll.get('poll') != self.AP_POLL:
                         continue
                     
                     ranks = poll.get('ranks', [])
@@ -254,46 +398,41 @@ class CFBDataSyncService:
                         if not team or not rank:
                             continue
                         
-                        # Check if record exists
-                        existing = db.execute(
-                            text("""
-                                SELECT id FROM ap_rankings 
-                                WHERE season = :season AND week = :week 
-                                AND season_type = :season_type AND team = :team
-                            """),
-                            {"season": season, "week": week_num, 
-                             "season_type": season_type, "team": team}
-                        ).fetchone()
+                        key = (week_num, season_type, team)
+                        row = {"season": season, "week": week_num, "season_type": season_type,
+                               "poll": self.AP_POLL, "school": team,
+                               "team_id": rank_data.get('teamId') or team_ids.get(team),
+                               "conference": rank_data.get('conference'),
+                               "rank": rank, "fpv": first_place_votes, "points": points}
                         
-                        if existing:
-                            db.execute(
-                                text("""
-                                    UPDATE ap_rankings 
-                                    SET rank = :rank, first_place_votes = :fpv, points = :points
-                                    WHERE id = :id
-                                """),
-                                {"id": existing[0], "rank": rank, "fpv": first_place_votes, 
-                                 "points": points}
-                            )
-                            updated += 1
-                        else:
-                            db.execute(
-                                text("""
-                                    INSERT INTO ap_rankings 
-                                    (season, week, season_type, team, rank, first_place_votes, points)
-                                    VALUES (:season, :week, :season_type, :team, :rank, :fpv, :points)
-                                """),
-                                {"season": season, "week": week_num, "season_type": season_type,
-                                 "team": team, "rank": rank, "fpv": first_place_votes, 
-                                 "points": points}
-                            )
-                            added += 1
+                        if not self._queue_row(key, row, ('team_id', 'conference', 'rank', 'fpv', 'points'),
+                                               existing, inserts, updates):
+                            unchanged += 1
             
-            db.commit()
-            self._complete_sync_log(db, log_entry, 'success', added, updated)
-            logger.info(f"AP rankings synced: {added} added, {updated} updated")
-            return {'success': True, 'added': added, 'updated': updated}
+            self._write_batches(
+                db,
+                """
+                    INSERT INTO ap_rankings 
+                    (season, week, season_type, poll, school, team_id, conference,
+                     rank, first_place_votes, points)
+                    VALUES (:season, :week, :season_type, :poll, :school, :team_id, :conference,
+                            :rank, :fpv, :points)
+                """,
+                """
+                    UPDATE ap_rankings 
+                    SET team_id = :team_id, conference = :conference, rank = :rank,
+                        first_place_votes = :fpv, points = :points
+                    WHERE id = :id
+                """,
+                inserts, updates
+            )
+            added, updated = len(inserts), len(updates)
             
+            db.commit()
+            self._complete_sync_log(db, log_entry, 'success', added, updated, unchanged=unchanged)
+            logger.info(f"AP rankings synced: {added} added, {updated} updated, {unchanged} unchanged")
+            return {'success': True, 'added': added, 'updated': updated, 'unchanged': unchanged}
+        
         except Exception as e:
             db.rollback()
             self._complete_sync_log(db, log_entry, 'failed', error=str(e))
@@ -310,11 +449,26 @@ class CFBDataSyncService:
                 params['week'] = week
             
             data = self._api_request('/ratings/sp', params)
-            added = updated = 0
+            
+            # Existing (year, team) rows in one query - ratings are stored per season, not per week
+            existing = self._prefetch_rows(
+                db,
+                """
+                    SELECT id, year, team, team_id, conference, rating, ranking,
+                           offense_rating, defense_rating, special_teams_rating
+                    FROM team_sp_ratings WHERE year = :year
+                """,
+                {"year": season},
+                key_size=2
+            )
+            team_ids = self._team_ids(db)
+            
+            inserts, updates = {}, {}
+            unchanged = 0
             
             for rating in data:
                 team = rating.get('team')
-                week_num = rating.get('week')
+                year = rating.get('year', season)
                 sp_rating = rating.get('rating')
                 ranking = rating.get('ranking')
                 
@@ -323,50 +477,43 @@ class CFBDataSyncService:
                 defense_rating = rating.get('defense', {}).get('rating') if rating.get('defense') else None
                 special_teams = rating.get('specialTeams', {}).get('rating') if rating.get('specialTeams') else None
                 
-                if not team or week_num is None:
+                if not team or team == 'nationalAverages':
                     continue
                 
-                # Check if record exists
-                existing = db.execute(
-                    text("""
-                        SELECT id FROM team_sp_ratings 
-                        WHERE season = :season AND week = :week AND team = :team
-                    """),
-                    {"season": season, "week": week_num, "team": team}
-                ).fetchone()
+                key = (year, team)
+                row = {"year": year, "team": team, "team_id": team_ids.get(team),
+                       "conference": rating.get('conference'),
+                       "rating": sp_rating, "ranking": ranking,
+                       "off": offense_rating, "def": defense_rating, "st": special_teams}
                 
-                if existing:
-                    db.execute(
-                        text("""
-                            UPDATE team_sp_ratings 
-                            SET rating = :rating, ranking = :ranking,
-                                offense_rating = :off, defense_rating = :def, 
-                                special_teams_rating = :st
-                            WHERE id = :id
-                        """),
-                        {"id": existing[0], "rating": sp_rating, "ranking": ranking,
-                         "off": offense_rating, "def": defense_rating, "st": special_teams}
-                    )
-                    updated += 1
-                else:
-                    db.execute(
-                        text("""
-                            INSERT INTO team_sp_ratings 
-                            (season, week, team, rating, ranking, offense_rating, 
-                             defense_rating, special_teams_rating)
-                            VALUES (:season, :week, :team, :rating, :ranking, :off, :def, :st)
-                        """),
-                        {"season": season, "week": week_num, "team": team, 
-                         "rating": sp_rating, "ranking": ranking,
-                         "off": offense_rating, "def": defense_rating, "st": special_teams}
-                    )
-                    added += 1
+                if not self._queue_row(key, row, ('team_id', 'conference', 'rating', 'ranking', 'off', 'def', 'st'),
+                                       existing, inserts, updates):
+                    unchanged += 1
             
-            db.commit()
-            self._complete_sync_log(db, log_entry, 'success', added, updated)
-            logger.info(f"SP+ ratings synced: {added} added, {updated} updated")
-            return {'success': True, 'added': added, 'updated': updated}
+            self._write_batches(
+                db,
+                """
+                    INSERT INTO team_sp_ratings 
+                    (year, team, team_id, conference, rating, ranking, offense_rating, 
+                     defense_rating, special_teams_rating)
+                    VALUES (:year, :team, :team_id, :conference, :rating, :ranking, :off, :def, :st)
+                """,
+                """
+                    UPDATE team_sp_ratings 
+                    SET team_id = :team_id, conference = :conference, rating = :rating, ranking = :ranking,
+                        offense_rating = :off, defense_rating = :def, 
+                        special_teams_rating = :st
+                    WHERE id = :id
+                """,
+                inserts, updates
+            )
+            added, updated = len(inserts), len(updates)
             
+            db.commit()
+            self._complete_sync_log(db, log_entry, 'success', added, updated, unchanged=unchanged)
+            logger.info(f"SP+ ratings synced: {added} added, {updated} updated, {unchanged} unchanged")
+            return {'success': True, 'added': added, 'updated': updated, 'unchanged': unchanged}
+        
         except Exception as e:
             db.rollback()
             self._complete_sync_log(db, log_entry, 'failed', error=str(e))
@@ -383,46 +530,53 @@ class CFBDataSyncService:
                 params['week'] = week
             
             data = self._api_request('/ratings/fpi', params)
-            added = updated = 0
+            
+            # Existing (year, team) rows in one query - ratings are stored per season, not per week
+            existing = self._prefetch_rows(
+                db,
+                "SELECT id, year, team, team_id, conference, fpi FROM team_fpi_ratings WHERE year = :year",
+                {"year": season},
+                key_size=2
+            )
+            team_ids = self._team_ids(db)
+            
+            inserts, updates = {}, {}
+            unchanged = 0
             
             for rating in data:
                 team = rating.get('team')
-                week_num = rating.get('week')
+                year = rating.get('year', season)
                 fpi = rating.get('fpi')
                 
-                if not team or week_num is None:
+                if not team:
                     continue
                 
-                # Check if record exists
-                existing = db.execute(
-                    text("""
-                        SELECT id FROM team_fpi_ratings 
-                        WHERE season = :season AND week = :week AND team = :team
-                    """),
-                    {"season": season, "week": week_num, "team": team}
-                ).fetchone()
+                key = (year, team)
+                row = {"year": year, "team": team, "team_id": team_ids.get(team),
+                       "conference": rating.get('conference'), "fpi": fpi}
                 
-                if existing:
-                    db.execute(
-                        text("UPDATE team_fpi_ratings SET fpi = :fpi WHERE id = :id"),
-                        {"id": existing[0], "fpi": fpi}
-                    )
-                    updated += 1
-                else:
-                    db.execute(
-                        text("""
-                            INSERT INTO team_fpi_ratings (season, week, team, fpi)
-                            VALUES (:season, :week, :team, :fpi)
-                        """),
-                        {"season": season, "week": week_num, "team": team, "fpi": fpi}
-                    )
-                    added += 1
+                if not self._queue_row(key, row, ('team_id', 'conference', 'fpi'), existing, inserts, updates):
+                    unchanged += 1
             
-            db.commit()
-            self._complete_sync_log(db, log_entry, 'success', added, updated)
-            logger.info(f"FPI ratings synced: {added} added, {updated} updated")
-            return {'success': True, 'added': added, 'updated': updated}
+            self._write_batches(
+                db,
+                """
+                    INSERT INTO team_fpi_ratings (year, team, team_id, conference, fpi)
+                    VALUES (:year, :team, :team_id, :conference, :fpi)
+                """,
+                """
+                    UPDATE team_fpi_ratings SET team_id = :team_id, conference = :conference, fpi = :fpi
+                    WHERE id = :id
+                """,
+                inserts, updates
+            )
+            added, updated = len(inserts), len(updates)
             
+            db.commit()
+            self._complete_sync_log(db, log_entry, 'success', added, updated, unchanged=unchanged)
+            logger.info(f"FPI ratings synced: {added} added, {updated} updated, {unchanged} unchanged")
+            return {'success': True, 'added': added, 'updated': updated, 'unchanged': unchanged}
+        
         except Exception as e:
             db.rollback()
             self._complete_sync_log(db, log_entry, 'failed', error=str(e))
@@ -436,7 +590,16 @@ class CFBDataSyncService:
         try:
             params = {'year': season}
             data = self._api_request('/records', params)
-            added = updated = 0
+            
+            # Existing (year, team) keys in one query
+            existing = self._prefetch_ids(
+                db,
+                "SELECT id, year, team FROM team_records WHERE year = :year",
+                {"year": season}
+            )
+            team_ids = self._team_ids(db)
+            
+            inserts, updates = {}, {}
             
             for record in data:
                 team = record.get('team')
@@ -466,50 +629,48 @@ class CFBDataSyncService:
                 if not team:
                     continue
                 
-                # Check if record exists
-                existing = db.execute(
-                    text("SELECT id FROM team_records WHERE season = :season AND team = :team"),
-                    {"season": year, "team": team}
-                ).fetchone()
+                key = (year, team)
+                row = {"year": year, "team": team,
+                       "team_id": record.get('teamId') or team_ids.get(team),
+                       "conference": record.get('conference'), "division": record.get('division'),
+                       "wins": wins, "losses": losses,
+                       "ties": ties, "cw": conf_wins, "cl": conf_losses, "ct": conf_ties,
+                       "hw": home_wins, "hl": home_losses, 
+                       "aw": away_wins, "al": away_losses}
                 
-                if existing:
-                    db.execute(
-                        text("""
-                            UPDATE team_records 
-                            SET total_wins = :wins, total_losses = :losses, total_ties = :ties,
-                                conf_wins = :cw, conf_losses = :cl, conf_ties = :ct,
-                                home_wins = :hw, home_losses = :hl,
-                                away_wins = :aw, away_losses = :al
-                            WHERE id = :id
-                        """),
-                        {"id": existing[0], "wins": wins, "losses": losses, "ties": ties,
-                         "cw": conf_wins, "cl": conf_losses, "ct": conf_ties,
-                         "hw": home_wins, "hl": home_losses, 
-                         "aw": away_wins, "al": away_losses}
-                    )
-                    updated += 1
+                if key in existing:
+                    updates[key] = dict(row, id=existing[key])
                 else:
-                    db.execute(
-                        text("""
-                            INSERT INTO team_records 
-                            (season, team, total_wins, total_losses, total_ties,
-                             conf_wins, conf_losses, conf_ties,
-                             home_wins, home_losses, away_wins, away_losses)
-                            VALUES (:season, :team, :wins, :losses, :ties,
-                                    :cw, :cl, :ct, :hw, :hl, :aw, :al)
-                        """),
-                        {"season": year, "team": team, "wins": wins, "losses": losses, 
-                         "ties": ties, "cw": conf_wins, "cl": conf_losses, "ct": conf_ties,
-                         "hw": home_wins, "hl": home_losses, 
-                         "aw": away_wins, "al": away_losses}
-                    )
-                    added += 1
+                    inserts[key] = row
+            
+            self._write_batches(
+                db,
+                """
+                    INSERT INTO team_records 
+                    (year, team, team_id, conference, division, total_wins, total_losses, total_ties,
+                     conference_wins, conference_losses, conference_ties,
+                     home_wins, home_losses, away_wins, away_losses)
+                    VALUES (:year, :team, :team_id, :conference, :division, :wins, :losses, :ties,
+                            :cw, :cl, :ct, :hw, :hl, :aw, :al)
+                """,
+                """
+                    UPDATE team_records 
+                    SET team_id = :team_id, conference = :conference, division = :division,
+                        total_wins = :wins, total_losses = :losses, total_ties = :ties,
+                        conference_wins = :cw, conference_losses = :cl, conference_ties = :ct,
+                        home_wins = :hw, home_losses = :hl,
+                        away_wins = :aw, away_losses = :al
+                    WHERE id = :id
+                """,
+                inserts, updates
+            )
+            added, updated = len(inserts), len(updates)
             
             db.commit()
             self._complete_sync_log(db, log_entry, 'success', added, updated)
             logger.info(f"Team records synced: {added} added, {updated} updated")
             return {'success': True, 'added': added, 'updated': updated}
-            
+        
         except Exception as e:
             db.rollback()
             self._complete_sync_log(db, log_entry, 'failed', error=str(e))
@@ -525,69 +686,77 @@ class CFBDataSyncService:
             if week:
                 params['week'] = week
             
-            data = self._api_request('/lines', params)
             added = updated = 0
             
-            for game in data:
-                game_id = game.get('id')
-                home_team = game.get('homeTeam') or game.get('home_team')
-                away_team = game.get('awayTeam') or game.get('away_team')
+            # Parse the response incrementally and write fixed-size batches
+            for batch in batched(self._api_stream('/lines', params), self.SYNC_BATCH_SIZE):
+                # Existing (game_id, provider) keys for the batch in one query
+                game_ids = [game.get('id') for game in batch if game.get('id')]
+                existing = self._prefetch_ids(
+                    db,
+                    text("""
+                        SELECT id, game_id, provider FROM game_lines 
+                        WHERE game_id IN :game_ids
+                    """).bindparams(bindparam('game_ids', expanding=True)),
+                    {"game_ids": game_ids}
+                )
                 
-                if not game_id or not home_team or not away_team:
-                    continue
+                inserts, updates = {}, {}
                 
-                # Process each betting line provider
-                lines = game.get('lines', [])
-                for line in lines:
-                    provider = line.get('provider')
-                    spread = line.get('spread')
-                    over_under = line.get('overUnder')
-                    home_moneyline = line.get('homeMoneyline')
-                    away_moneyline = line.get('awayMoneyline')
+                for game in batch:
+                    game_id = game.get('id')
+                    home_team = game.get('homeTeam') or game.get('home_team')
+                    away_team = game.get('awayTeam') or game.get('away_team')
                     
-                    if not provider:
+                    if not game_id or not home_team or not away_team:
                         continue
                     
-                    # Check if record exists
-                    existing = db.execute(
-                        text("""
-                            SELECT id FROM game_lines 
-                            WHERE game_id = :game_id AND provider = :provider
-                        """),
-                        {"game_id": game_id, "provider": provider}
-                    ).fetchone()
-                    
-                    if existing:
-                        db.execute(
-                            text("""
-                                UPDATE game_lines 
-                                SET spread = :spread, over_under = :ou,
-                                    home_moneyline = :hm, away_moneyline = :am
-                                WHERE id = :id
-                            """),
-                            {"id": existing[0], "spread": spread, "ou": over_under,
-                             "hm": home_moneyline, "am": away_moneyline}
-                        )
-                        updated += 1
-                    else:
-                        db.execute(
-                            text("""
-                                INSERT INTO game_lines 
-                                (game_id, provider, spread, over_under, 
-                                 home_moneyline, away_moneyline)
-                                VALUES (:game_id, :provider, :spread, :ou, :hm, :am)
-                            """),
-                            {"game_id": game_id, "provider": provider, 
-                             "spread": spread, "ou": over_under,
-                             "hm": home_moneyline, "am": away_moneyline}
-                        )
-                        added += 1
+                    # Process each betting line provider
+                    lines = game.get('lines', [])
+                    for line in lines:
+                        provider = line.get('provider')
+                        spread = line.get('spread')
+                        over_under = line.get('overUnder')
+                        home_moneyline = line.get('homeMoneyline')
+                        away_moneyline = line.get('awayMoneyline')
+                        
+                        if not provider:
+                            continue
+                        
+                        key = (game_id, provider)
+                        row = {"game_id": game_id, "provider": provider, 
+                               "spread": spread, "ou": over_under,
+                               "hm": home_moneyline, "am": away_moneyline}
+                        
+                        if key in existing:
+                            updates[key] = dict(row, id=existing[key])
+                        else:
+                            inserts[key] = row
+                
+                self._write_batches(
+                    db,
+                    """
+                        INSERT INTO game_lines 
+                        (game_id, provider, spread, over_under, 
+                         home_moneyline, away_moneyline)
+                        VALUES (:game_id, :provider, :spread, :ou, :hm, :am)
+                    """,
+                    """
+                        UPDATE game_lines 
+                        SET spread = :spread, over_under = :ou,
+                            home_moneyline = :hm, away_moneyline = :am
+                        WHERE id = :id
+                    """,
+                    inserts, updates
+                )
+                added += len(inserts)
+                updated += len(updates)
             
             db.commit()
             self._complete_sync_log(db, log_entry, 'success', added, updated)
             logger.info(f"Betting lines synced: {added} added, {updated} updated")
             return {'success': True, 'added': added, 'updated': updated}
-            
+        
         except Exception as e:
             db.rollback()
             self._complete_sync_log(db, log_entry, 'failed', error=str(e))
@@ -601,7 +770,16 @@ class CFBDataSyncService:
         try:
             params = {'year': season}
             data = self._api_request('/recruiting/teams', params)
-            added = updated = 0
+            
+            # Existing (year, team) keys in one query
+            existing = self._prefetch_ids(
+                db,
+                "SELECT id, year, team FROM recruiting_teams WHERE year = :year",
+                {"year": season}
+            )
+            team_ids = self._team_ids(db)
+            
+            inserts, updates = {}, {}
             
             for team_data in data:
                 team = team_data.get('team')
@@ -612,46 +790,192 @@ class CFBDataSyncService:
                 if not team:
                     continue
                 
-                # Check if record exists
-                existing = db.execute(
-                    text("""
-                        SELECT id FROM recruiting_teams 
-                        WHERE year = :year AND team = :team
-                    """),
-                    {"year": year, "team": team}
-                ).fetchone()
+                key = (year, team)
+                row = {"year": year, "team": team, "team_id": team_ids.get(team),
+                       "rank": rank, "points": points}
                 
-                if existing:
-                    db.execute(
-                        text("""
-                            UPDATE recruiting_teams 
-                            SET rank = :rank, points = :points
-                            WHERE id = :id
-                        """),
-                        {"id": existing[0], "rank": rank, "points": points}
-                    )
-                    updated += 1
+                if key in existing:
+                    updates[key] = dict(row, id=existing[key])
                 else:
-                    db.execute(
-                        text("""
-                            INSERT INTO recruiting_teams (year, team, rank, points)
-                            VALUES (:year, :team, :rank, :points)
-                        """),
-                        {"year": year, "team": team, "rank": rank, "points": points}
-                    )
-                    added += 1
+                    inserts[key] = row
+            
+            self._write_batches(
+                db,
+                """
+                    INSERT INTO recruiting_teams (year, team, team_id, rank, points)
+                    VALUES (:year, :team, :team_id, :rank, :points)
+                """,
+                """
+                    UPDATE recruiting_teams 
+                    SET team_id = :team_id, rank = :rank, points = :points
+                    WHERE id = :id
+                """,
+                inserts, updates
+            )
+            added, updated = len(inserts), len(updates)
             
             db.commit()
             self._complete_sync_log(db, log_entry, 'success', added, updated)
             logger.info(f"Recruiting rankings synced: {added} added, {updated} updated")
             return {'success': True, 'added': added, 'updated': updated}
-            
+        
         except Exception as e:
             db.rollback()
             self._complete_sync_log(db, log_entry, 'failed', error=str(e))
             logger.error(f"Error syncing recruiting rankings: {e}")
             return {'success': False, 'error': str(e)}
     
+    # ==================== PLAY-BY-PLAY (bulk ingest) ====================
+    
+    PLAY_COLUMNS = [
+        'id', 'drive_id', 'game_id', 'season', 'week',
+        'offense_id', 'offense', 'offense_conference', 'offense_score',
+        'defense_id', 'defense', 'defense_conference', 'defense_score',
+        'home', 'away', 'period', 'clock_minutes', 'clock_seconds',
+        'yard_line', 'yards_to_goal', 'down', 'distance', 'yards_gained',
+        'play_number', 'play_text', 'play_type', 'ppa', 'scoring',
+    ]
+    PLAY_STAT_COLUMNS = [
+        'id', 'play_id', 'game_id', 'season', 'week', 'team_id', 'team', 'conference',
+        'opponent', 'player_id', 'player_name', 'stat_type', 'stat',
+    ]
+    PLAYER_GAME_STAT_COLUMNS = [
+        'game_id', 'season', 'week', 'player_id', 'player', 'team', 'opponent',
+        'category', 'stat_type', 'stat',
+    ]
+    
+    @staticmethod
+    def _int(value) -> Optional[int]:
+        """API ids sometimes arrive as strings"""
+        try:
+            return int(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+    
+    def _season_weeks(self, db: Session, season: int, season_type: str) -> List[int]:
+        """Weeks that have games in the database - play endpoints must be fetched per week"""
+        return [
+            week for (week,) in db.execute(
+                text("""
+                    SELECT DISTINCT week FROM games
+                    WHERE season = :season AND season_type = :season_type AND week IS NOT NULL
+                    ORDER BY week
+                """),
+                {"season": season, "season_type": season_type}
+            )
+        ]
+    
+    def _bulk_sync(self, db: Session, sync_type: str, endpoint: str, table: str, columns: List[str],
+                   to_rows, season: int, season_type: str, week: Optional[int], **merge) -> Dict:
+        """Stream an endpoint week by week through bulk_ingest into one table"""
+        log_entry = self._log_sync(db, sync_type, season, season_type, week)
+        
+        try:
+            if table in PARTITIONED_TABLES:
+                ensure_season_partitions([season], bind=db.get_bind())
+            
+            weeks = [week] if week else self._season_weeks(db, season, season_type)
+            team_ids = self._team_ids(db)
+            
+            def rows():
+                for week_num in weeks:
+                    params = {'year': season, 'week': week_num, 'seasonType': season_type}
+                    for item in self._api_stream(endpoint, params):
+                        yield from to_rows(item, season, week_num, team_ids)
+            
+            stats = bulk_ingest(db.connection(), table, columns, rows(), **merge)
+            
+            db.commit()
+            self._complete_sync_log(db, log_entry, 'success', stats['inserted'], stats['updated'])
+            logger.info(f"{sync_type} synced for {season} {season_type}: {stats['inserted']} added, "
+                        f"{stats['updated']} updated ({stats['rows_per_second'] or 0} rows/sec)")
+            return {'success': True, 'added': stats['inserted'], 'updated': stats['updated'],
+                    'seconds': stats['seconds'], 'rows_per_second': stats['rows_per_second']}
+        
+        except Exception as e:
+            db.rollback()
+            self._complete_sync_log(db, log_entry, 'failed', error=str(e))
+            logger.error(f"Error syncing {sync_type}: {e}")
+            return {'success': False, 'error': str(e)}
+    
+    def _play_rows(self, play: Dict, season: int, week: int, team_ids: Dict[str, int]):
+        play_id = self._int(play.get('id'))
+        if play_id is None:
+            return
+        
+        clock = play.get('clock') or {}
+        offense, defense = play.get('offense'), play.get('defense')
+        yield (
+            play_id, self._int(play.get('driveId')), play.get('gameId'), season, week,
+            team_ids.get(offense), offense, play.get('offenseConference'), play.get('offenseScore'),
+            team_ids.get(defense), defense, play.get('defenseConference'), play.get('defenseScore'),
+            play.get('home'), play.get('away'), play.get('period'), clock.get('minutes'), clock.get('seconds'),
+            play.get('yardline'), play.get('yardsToGoal'), play.get('down'), play.get('distance'),
+            play.get('yardsGained'), play.get('playNumber'), play.get('playText'), play.get('playType'),
+            play.get('ppa'), play.get('scoring'),
+        )
+    
+    def _play_stat_rows(self, stat: Dict, season: int, week: int, team_ids: Dict[str, int]):
+        play_id = self._int(stat.get('playId'))
+        player_id = self._int(stat.get('athleteId'))
+        if play_id is None:
+            return
+        
+        team = stat.get('team')
+        yield (
+            # The API has no id for a play stat - derive a stable one from its natural key
+            stable_id(play_id, player_id, stat.get('statType')),
+            play_id, stat.get('gameId'), season, week, team_ids.get(team), team,
+            stat.get('conference'), stat.get('opponent'), player_id, stat.get('athleteName'),
+            stat.get('statType'), self._int(stat.get('stat')),
+        )
+    
+    def _player_game_rows(self, game: Dict, season: int, week: int, team_ids: Dict[str, int]):
+        game_id = game.get('id')
+        teams = game.get('teams') or []
+        schools = [team.get('team') or team.get('school') for team in teams]
+        
+        for team in teams:
+            school = team.get('team') or team.get('school')
+            opponent = next((other for other in schools if other != school), None)
+            for category in team.get('categories') or []:
+                for stat_type in category.get('types') or []:
+                    for athlete in stat_type.get('athletes') or []:
+                        # stat is Float - composite values like "12/20" (C/ATT) aren't stored
+                        try:
+                            value = float(athlete.get('stat'))
+                        except (TypeError, ValueError):
+                            continue
+                        yield (
+                            game_id, season, week, self._int(athlete.get('id')), athlete.get('name'),
+                            school, opponent, category.get('name'), stat_type.get('name'), value,
+                        )
+    
+    def sync_plays(self, db: Session, season: int, season_type: str = 'regular',
+                   week: Optional[int] = None) -> Dict:
+        """Bulk load play-by-play for a season (or one week), upserting on play id"""
+        return self._bulk_sync(
+            db, 'plays', '/plays', 'plays', self.PLAY_COLUMNS, self._play_rows,
+            season, season_type, week, key=['id', 'season']
+        )
+    
+    def sync_play_stats(self, db: Session, season: int, season_type: str = 'regular',
+                        week: Optional[int] = None) -> Dict:
+        """Bulk load per-play player stats, upserting on a stable (play, player, stat) id"""
+        return self._bulk_sync(
+            db, 'play_stats', '/play/stats', 'play_stats', self.PLAY_STAT_COLUMNS, self._play_stat_rows,
+            season, season_type, week, key=['id', 'season']
+        )
+    
+    def sync_player_game_stats(self, db: Session, season: int, season_type: str = 'regular',
+                               week: Optional[int] = None) -> Dict:
+        """Bulk load box-score player stats, replacing each synced game's rows"""
+        return self._bulk_sync(
+            db, 'player_game_stats', '/games/players', 'player_game_stats',
+            self.PLAYER_GAME_STAT_COLUMNS, self._player_game_rows,
+            season, season_type, week, replace_by=['game_id']
+        )
+    
     def sync_all(self, db: Session, season: int, week: Optional[int] = None, 
                  include: List[str] = None) -> Dict:
         """Sync multiple datasets at once"""
@@ -704,11 +1028,43 @@ class CFBDataSyncService:
         logger.info(f"Starting weekly sync for {season} week {week}")
         
         # Games for this week
-        results['games'] = self.sync_games(db, season, 'regular', week)
+        games = results['games'] = self.sync_games(db, season, 'regular', week)
+        if not games.get('success'):
+            logger.error(f"Weekly sync failed for week {week}: {games.get('error')}")
+            return results
+        
+        # Let the ranking cache drop and rewarm the weeks that changed
+        run_post_sync_hooks({(season, 'regular'): games.get('changed_weeks', [])})
         
         logger.info(f"Weekly sync completed for week {week}")
         return results
     
+    def sync_games_incremental(self, db: Session, season: int, season_type: str = 'regular') -> Dict:
+        """Sync only the weeks that still have unfinished or recently changed games"""
+        planner = SyncPlanner(self._api_request)
+        weeks = planner.plan_weeks(db, season, season_type)
+        
+        results = {}
+        if weeks is None:
+            logger.info(f"No watermark for {season} {season_type}, syncing full season")
+            weeks = [None]
+        else:
+            logger.info(f"Incremental sync for {season} {season_type}: weeks {weeks or 'none'}")
+        
+        for week in weeks:
+            try:
+                results[week or 'season'] = self.sync_games(db, season, season_type, week)
+            except Exception as e:
+                results[week or 'season'] = {'success': False, 'error': str(e)}
+        
+        # A week that failed to sync must stay below the watermark so the next run retries it
+        failed = [week for week, result in results.items() if not result.get('success')]
+        if failed:
+            logger.error(f"Games sync failed for {season} {season_type} {failed}, keeping the watermark")
+        else:
+            planner.advance(db, season, season_type)
+        return results
+    
     def sync_season_core_data(self, db: Session, season: int) -> Dict:
         """Sync all core data for a season"""
         results = {}
@@ -747,24 +1103,18 @@ def run_daily_sync():
     
     try:
         current_date = datetime.now()
-        current_season = current_date.year
-        
-        # Determine current week (rough estimate - Aug-Dec)
-        if 8 <= current_date.month <= 12:
-            weeks_since_start = (current_date - datetime(current_season, 8, 25)).days // 7
-            current_week = min(max(weeks_since_start, 1), 15)
-            
-            logger.info(f"Running weekly sync for {current_season} week {current_week}")
-            sync_service.sync_weekly_update(db, current_season, current_week)
-        elif current_date.month == 1:
-            # Postseason
-            logger.info(f"Running postseason sync for {current_season}")
-            sync_service.sync_games(db, current_season, 'postseason')
+        season = current_season(current_date)
+        
+        # In season (Aug-Jan): let the watermark planner pick the weeks to fetch
+        if current_date.month >= 8 or current_date.month == 1:
+            logger.info(f"Running incremental sync for {season}")
+            sync_service.sync_games_incremental(db, season, 'regular')
+            sync_service.sync_games_incremental(db, season, 'postseason')
         else:
             # Off-season - just update teams
             logger.info("Off-season: updating teams only")
             sync_service.sync_teams(db, 'fbs')
-        
+    
     except Exception as e:
         logger.error(f"Daily sync failed: {e}")
     finally:
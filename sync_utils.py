@@ -0,0 +1,85 @@
+# sync_utils.py - Shared helpers for the sync scripts
+
+import hashlib
+import json
+import threading
+import time
+from itertools import islice
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    import ijson
+except ImportError:  # Fall back to response.json() when ijson isn't installed
+    ijson = None
+
+
+# Columns fingerprinted into teams.content_hash / games.content_hash. Both sync paths
+# (sync_nightly and sync_service_complete) hash exactly these, so a row written by one
+# is recognised as unchanged by the other.
+TEAM_HASH_FIELDS = (
+    'api_id', 'school', 'mascot', 'abbreviation', 'classification',
+    'conference', 'division', 'color', 'alt_color',
+)
+GAME_HASH_FIELDS = (
+    'id', 'season', 'week', 'season_type', 'start_date', 'completed',
+    'home_id', 'away_id', 'home_team', 'away_team', 'home_points', 'away_points',
+    'venue', 'neutral_site', 'conference_game',
+)
+
+
+def content_hash(values: Dict[str, Any], fields: Optional[Sequence[str]] = None) -> str:
+    """Fingerprint a row payload so unchanged rows can be skipped on re-sync.
+    
+    Keys are sorted so the hash only depends on the values being written,
+    not on the order the API returned them in. With `fields`, only those
+    keys are hashed (missing ones count as None).
+    """
+    if fields is not None:
+        values = {field: values.get(field) for field in fields}
+    payload = json.dumps(values, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def iter_json_items(response) -> Iterator[Any]:
+    """Yield the items of a top-level JSON array from a streamed response.
+    
+    With ijson installed the body is parsed incrementally straight off the
+    socket, so memory stays flat regardless of response size.
+    """
+    if ijson is None:
+        yield from response.json()
+        return
+    
+    response.raw.decode_content = True  # Let urllib3 handle gzip transfer encoding
+    yield from ijson.items(response.raw, 'item', use_float=True)
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Group an iterable into lists of at most `size` items"""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class RateLimiter:
+    """Space out API requests across threads to stay under a rate limit"""
+    
+    def __init__(self, requests_per_second: float):
+        if not requests_per_second > 0:
+            raise ValueError(f"requests_per_second must be positive, got {requests_per_second}")
+        self.interval = 1.0 / requests_per_second
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def wait(self):
+        """Block until this caller's request slot comes up"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        
+        if slot > now:
+            time.sleep(slot - now)
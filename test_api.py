@@ -0,0 +1,254 @@
+# test_api.py - /rankings responses and caching, with the CFBD fetch replaced by a fixed season
+
+import asyncio
+import gzip
+import threading
+
+import orjson
+import pytest
+from sqlalchemy import text
+from starlette.requests import Request
+
+import api
+from cache_warmer import UsageTracker
+from cfb_ranking_system import RankingSystem
+from db_models_complete import Base
+from sync_hooks import run_post_sync_hooks
+
+TEAMS = ['Georgia', 'Texas', 'Alabama', 'Ohio State', 'Oregon']
+
+
+def _season():
+    system = RankingSystem()
+    for week, (home, away) in enumerate(zip(TEAMS, TEAMS[1:]), start=1):
+        system.add_game(home, 30 + week, away, 20, week=week)
+    system.calculate_rankings(iterations=20)
+    return system
+
+@pytest.fixture(autouse=True)
+def season(monkeypatch):
+    computed = []
+    
+    def compute(*args):
+        computed.append(args)
+        return _season()
+    
+    monkeypatch.setattr(api, 'compute_rankings', compute)
+    monkeypatch.setattr(api, 'shared_cache', None)
+    monkeypatch.setattr(api, 'rate_limiter', api.RateLimiter(per_minute=600, burst=100))
+    caches = (api.ranking_cache, api.response_cache, api.ranking_versions, api.ranking_order, api.content_versions)
+    for cache in caches:
+        cache.clear()
+    yield computed
+    for cache in caches:
+        cache.clear()
+
+def _request(headers=None):
+    return Request({
+        'type': 'http', 'method': 'GET', 'path': '/rankings', 'query_string': b'',
+        'headers': [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+        'client': ('10.0.0.1', 1234),
+    })
+
+def rankings(headers=None, **params):
+    params = {'year': 2025, 'season_type': 'regular', 'classification': 'fbs', 'week': None, 'top_n': None,
+              'include_games': True, 'after_rank': None, 'limit': None, 'response_format': 'json',
+              'api_key': None, 'formula_params': api.FormulaParams(), **params}
+    return asyncio.run(api.get_rankings(_request(headers), **params))
+
+def body(response):
+    if response.headers.get('content-encoding') == 'gzip':
+        return orjson.loads(gzip.decompress(response.body))
+    return orjson.loads(response.body)
+
+
+def test_top_n_past_the_team_count_shares_the_full_response():
+    full = rankings()
+    assert len(body(full)['teams']) == len(TEAMS)
+    assert body(rankings(top_n=500)) == body(full)
+    assert body(rankings(top_n=2))['teams'] == body(full)['teams'][:2]
+    assert len(api.response_cache) == 2
+
+def test_after_rank_past_the_end_is_an_empty_last_page():
+    page = body(rankings(after_rank=10_000, limit=2))
+    assert (page['teams'], page['after_rank'], page['next_after_rank']) == ([], len(TEAMS), None)
+    rankings(after_rank=len(TEAMS), limit=2)
+    assert len(api.response_cache) == 1
+
+def test_response_cache_drops_least_recently_served(monkeypatch):
+    monkeypatch.setattr(api, 'RESPONSE_CACHE_SIZE', 2)
+    rankings(top_n=1)
+    rankings(top_n=2)
+    rankings(top_n=1)  # Served again, so top_n=2 is now the oldest
+    rankings(top_n=3)
+    assert sorted(key[1] for key in api.response_cache) == [1, 3]
+
+def test_cached_responses_are_negotiated_per_request(season):
+    plain = rankings()
+    assert 'content-encoding' not in plain.headers
+    compressed = rankings(headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['content-encoding'] == 'gzip'
+    assert body(compressed) == body(plain)
+    assert len(season) == 1
+
+def _synced_season(engine):
+    """A RankingSystem computed from the games table, as compute_rankings would from CFBD."""
+    system = RankingSystem()
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT home_team, home_points, away_team, away_points, week FROM games ORDER BY id"
+        )).fetchall()
+    for home, home_points, away, away_points, week in rows:
+        system.add_game(home, home_points, away, away_points, week=week)
+    system.calculate_rankings(iterations=20)
+    return system
+
+def test_etag_changes_when_the_nightly_sync_changes_a_score(monkeypatch, season, tmp_path):
+    from sync_nightly import MinimalSync
+    
+    sync = MinimalSync(f"sqlite:///{tmp_path / 'games.db'}", 'test')
+    Base.metadata.create_all(sync.engine)
+    games = [{'id': 400 + week, 'season': 2025, 'week': week, 'seasonType': 'regular', 'completed': True,
+              'homeTeam': home, 'homePoints': 30 + week, 'awayTeam': away, 'awayPoints': 20}
+             for week, (home, away) in enumerate(zip(TEAMS, TEAMS[1:]), start=1)]
+    sync._api_stream = lambda endpoint, params=None: iter(games)
+    monkeypatch.setattr(api, 'compute_rankings', lambda *args: _synced_season(sync.engine))
+    monkeypatch.setattr(api.warmer, 'schedule', lambda season, season_type: None)
+    sync.sync_games(2025)
+    first = rankings()
+    
+    # Recomputing the same games keeps the validators
+    api.invalidate_local(2025)
+    assert rankings().headers['etag'] == first.headers['etag']
+    assert rankings(headers={'If-None-Match': first.headers['etag']}).status_code == 304
+    assert rankings(top_n=2).headers['etag'] != first.headers['etag']
+    
+    games[1]['awayPoints'] = 35  # Texas now beats Alabama
+    sync.changed_weeks = {}
+    sync.sync_games(2025)
+    run_post_sync_hooks(sync.changed_weeks)
+    
+    changed = rankings(headers={'If-None-Match': first.headers['etag']})
+    assert changed.status_code == 200
+    assert changed.headers['etag'] != first.headers['etag']
+    assert rankings(headers={'If-Modified-Since': first.headers['last-modified']}).status_code == 200
+
+def test_summary_rows_match_the_summary_model():
+    payload = body(rankings(include_games=False))
+    api.RankingsSummaryResponse(**payload)
+    assert set(payload['teams'][0]) == {'name', 'wins', 'losses', 'ranking'}
+    assert payload['total_teams'] == len(TEAMS)
+
+def test_team_games_match_the_embedded_games():
+    full = {team['name']: team['games'] for team in body(rankings())['teams']}
+    response = api.Response()
+    games = asyncio.run(api.get_team_games(
+        'Texas', _request(), response, year=2025, season_type='regular', classification='fbs', week=None,
+        api_key=None, formula_params=api.FormulaParams()
+    ))
+    assert isinstance(games, api.TeamGamesResponse)
+    assert games.name == 'Texas'
+    assert [game.model_dump() for game in games.games] == full['Texas']
+    assert [game.opponent for game in games.games] == ['Georgia', 'Alabama']
+    assert response.headers['etag']
+
+def test_pages_chain_through_next_after_rank():
+    names, after_rank = [], 0
+    while after_rank is not None:
+        page = body(rankings(include_games=False, after_rank=after_rank, limit=2))
+        assert page['limit'] == 2 and page['after_rank'] == after_rank
+        names += [team['name'] for team in page['teams']]
+        after_rank = page['next_after_rank']
+    assert names == [team['name'] for team in body(rankings(include_games=False))['teams']]
+    
+    last = body(rankings(after_rank=3, limit=2))
+    assert (len(last['teams']), last['next_after_rank']) == (2, None)
+    assert body(rankings(top_n=3, after_rank=1, limit=5))['next_after_rank'] is None
+
+def test_ndjson_streams_one_team_per_line():
+    response = rankings(response_format='ndjson', include_games=False, after_rank=1, limit=3)
+    assert response.media_type == 'application/x-ndjson'
+    assert response.headers['content-encoding'] == 'identity'
+    assert response.headers['x-total-teams'] == str(len(TEAMS))
+    
+    async def read():
+        return [chunk async for chunk in response.body_iterator]
+    
+    chunks = asyncio.run(read())
+    assert len(chunks) == 3 and all(chunk.endswith(b'\n') and chunk.count(b'\n') == 1 for chunk in chunks)
+    expected = body(rankings(include_games=False))['teams'][1:4]
+    assert [orjson.loads(chunk) for chunk in chunks] == expected
+
+def test_other_workers_serve_rankings_from_the_shared_cache(monkeypatch, season, tmp_path):
+    from shared_cache import SharedCache, SQLiteCache
+    monkeypatch.setattr(api, 'shared_cache', SharedCache(SQLiteCache(str(tmp_path / 'cache.sqlite3'))))
+    first = rankings()
+    
+    api.invalidate_local(2025)  # Another worker: nothing in process, same shared cache
+    again = rankings()
+    assert (again.body, again.headers['etag']) == (first.body, first.headers['etag'])
+    assert body(rankings(top_n=2))['teams'] == body(first)['teams'][:2]  # Rebuilt from the shared snapshot
+    assert len(season) == 1
+
+def test_affected_weeks_cover_every_later_week_and_the_full_season():
+    assert api.affected_weeks([3, 5]) == {None, *range(3, api.MAX_WEEK + 1)}
+    assert api.affected_weeks([api.MAX_WEEK]) == {None, api.MAX_WEEK}
+    assert api.affected_weeks([None]) is None       # A game without a week could be in any ranking
+    assert api.affected_weeks([4, None]) is None
+    assert api.affected_weeks([]) is None
+
+def test_in_scope_matches_cache_keys_by_season_type_and_week():
+    key = api.rankings_cache_key(2025, 'regular', 'fbs', 7, api.FormulaParams(three_score_multiplier=2.0))
+    season_key = api.rankings_cache_key(2025, 'regular', 'fcs', None)
+    
+    assert api.in_scope(key, 2025) and not api.in_scope(key, 2024)
+    assert api.in_scope(key, 2025, 'regular') and not api.in_scope(key, 2025, 'postseason')
+    assert api.in_scope(key, 2025, 'regular', {None, 6, 7}) and not api.in_scope(key, 2025, 'regular', {8})
+    assert api.in_scope(season_key, 2025, 'regular', {None}) and not api.in_scope(season_key, 2025, 'regular', {7})
+
+def test_response_cache_misses_are_rate_limited(monkeypatch):
+    monkeypatch.setattr(api, 'rate_limiter', api.RateLimiter(per_minute=0.001, burst=2))
+    rankings(top_n=1)                 # Computes the ranking: one token
+    rankings(top_n=1)                 # Cached body: free
+    rankings(top_n=2)                 # New body over the cached ranking: one token
+    with pytest.raises(api.HTTPException) as error:
+        rankings(top_n=3)
+    assert error.value.status_code == 429
+    assert rankings(top_n=2).status_code == 200
+
+def test_usage_is_recorded_only_for_admitted_requests(monkeypatch):
+    monkeypatch.setattr(api, 'rate_limiter', api.RateLimiter(per_minute=0.001, burst=1))
+    monkeypatch.setattr(api.warmer, 'tracker', UsageTracker())
+    preset = api.FormulaParams(three_score_multiplier=2.0)
+    rankings(formula_params=preset)
+    with pytest.raises(api.HTTPException):
+        rankings(formula_params=api.FormulaParams(three_score_multiplier=3.0))
+    assert api.warmer.tracker.most_common(5) == [{'three_score_multiplier': 2.0}]
+
+def test_different_rankings_compute_in_parallel(monkeypatch):
+    both_running = threading.Barrier(2, timeout=5)
+    calls = []
+    
+    def compute(*args):
+        calls.append(args[-1].three_score_multiplier)
+        both_running.wait()  # Times out if one computation waits behind the other
+        return _season()
+    
+    monkeypatch.setattr(api, 'compute_rankings', compute)
+    presets = [api.FormulaParams(three_score_multiplier=2.0), api.FormulaParams(three_score_multiplier=3.0)]
+    threads = [threading.Thread(target=api.get_or_create_rankings, args=(2025, 'regular', 'fbs', None, None, preset))
+               for preset in presets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert sorted(calls) == [2.0, 3.0]
+    assert len(api.ranking_cache) == 2 and api.compute_locks == {}
+
+def test_openapi_documents_every_rankings_shape():
+    responses = api.app.openapi()['paths']['/rankings']['get']['responses']
+    content = responses['200']['content']
+    shapes = {ref['$ref'].rsplit('/', 1)[-1] for ref in content['application/json']['schema']['anyOf']}
+    assert shapes == {'RankingsResponse', 'RankingsSummaryResponse', 'RankingsPageResponse'}
+    assert 'application/x-ndjson' in content and '304' in responses
@@ -0,0 +1,55 @@
+# test_api_enhanced_endpoints.py - SQL in files/api_enhanced_endpoints.py against the model schema
+#
+# The endpoints file is a snippet pasted into api.py (it has no app of its own), so its
+# query constants are read from the source instead of importing it.
+
+import ast
+import os
+
+from sqlalchemy import create_engine, text
+
+from db_models_complete import Base
+
+ENDPOINTS = os.path.join(os.path.dirname(__file__), 'files', 'api_enhanced_endpoints.py')
+
+
+def _constant(name: str) -> str:
+    with open(ENDPOINTS) as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, 'id', None) == name for t in node.targets):
+            return node.value.value
+    raise KeyError(name)
+
+
+def test_team_details_query_joins_on_team_id_and_year():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO teams (school, api_id, conference, mascot) VALUES ('Georgia', 61, 'SEC', 'Bulldogs')"))
+        conn.execute(text("""
+            INSERT INTO ap_rankings (season, season_type, week, poll, rank, team_id, school, points) VALUES
+            (2025, 'regular', 14, 'AP Top 25', 3, 61, 'Georgia', 1300),
+            (2025, 'postseason', 1, 'AP Top 25', 2, 61, 'Georgia', 1400),
+            (2025, 'regular', 15, 'Coaches Poll', 1, 61, 'Georgia', 1500),
+            (2024, 'regular', 16, 'AP Top 25', 1, 61, 'Georgia', 1550)
+        """))
+        conn.execute(text("""
+            INSERT INTO team_records (year, team_id, team, total_wins, total_losses, conference_wins,
+                                      conference_losses, home_wins, home_losses, away_wins, away_losses)
+            VALUES (2025, 61, 'Georgia', 12, 1, 8, 0, 7, 0, 3, 1), (2024, 61, 'Georgia', 10, 3, 6, 2, 6, 1, 3, 1)
+        """))
+        conn.execute(text("INSERT INTO team_sp_ratings (year, team_id, team, rating, ranking) VALUES (2025, 61, 'Georgia', 25.5, 4)"))
+        conn.execute(text("INSERT INTO team_fpi_ratings (year, team_id, team, fpi) VALUES (2024, 61, 'Georgia', 20.0)"))
+    
+    query = text(_constant('TEAM_DETAILS_QUERY'))
+    with engine.connect() as conn:
+        row = conn.execute(query, {"team": "Georgia", "season": 2025}).mappings().one()
+        missing = conn.execute(query, {"team": "Nowhere State", "season": 2025}).first()
+    
+    assert (row['conference'], row['mascot']) == ('SEC', 'Bulldogs')
+    assert (row['total_wins'], row['conference_wins'], row['away_losses']) == (12, 8, 1)
+    assert (row['ap_rank'], row['ap_points'], row['ap_week']) == (2, 1400, 1)  # Postseason poll is latest
+    assert (row['sp_id'] is not None, row['sp_rating'], row['sp_ranking']) == (True, 25.5, 4)
+    assert row['fpi_id'] is None and row['recruiting_id'] is None  # Nothing for 2025
+    assert missing is None
@@ -0,0 +1,64 @@
+# test_backfill.py - Checkpoint/resume behaviour of the historical backfill
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import backfill
+from db_models_complete import Base, SyncLog
+from sync_service_complete import CFBDataSyncService
+
+
+@pytest.fixture
+def database(monkeypatch):
+    engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(backfill, 'SessionLocal', sessionmaker(bind=engine))
+    monkeypatch.setattr(backfill, 'init_db', lambda: None)
+    monkeypatch.setattr(CFBDataSyncService, 'sync_teams', lambda self, db, classification='fbs': {})
+    return sessionmaker(bind=engine)
+
+def _datasets(monkeypatch, calls, failing):
+    def sync(name):
+        def run(service, db, season):
+            calls.append((name, season))
+            if (name, season) in failing:
+                return {'success': False, 'error': 'boom'}
+            return {'success': True, 'added': 10, 'updated': 0}
+        return run
+    monkeypatch.setattr(backfill, 'DATASETS', {'games': sync('games'), 'sp': sync('sp')})
+
+
+def test_backfill_resumes_only_unfinished_jobs(database, monkeypatch):
+    calls, failing = [], {('sp', 2023)}
+    _datasets(monkeypatch, calls, failing)
+    
+    first = backfill.run_backfill(2023, 2024, ['games', 'sp'], workers=1, requests_per_second=100, api_key='k')
+    assert (first['jobs'], first['failed'], first['skipped']) == (4, 1, 0)
+    assert first['rows'] == 30
+    
+    db = database()
+    assert backfill.completed_jobs(db, [2023, 2024], ['games', 'sp']) == {
+        ('games', 2023), ('games', 2024), ('sp', 2024)
+    }
+    failed = db.query(SyncLog).filter_by(sync_type='backfill_sp', season=2023).one()
+    assert (failed.status, failed.error_message) == ('failed', 'boom')
+    db.close()
+    
+    calls.clear()
+    failing.clear()
+    second = backfill.run_backfill(2023, 2024, ['games', 'sp'], workers=1, requests_per_second=100, api_key='k')
+    assert calls == [('sp', 2023)]
+    assert (second['jobs'], second['failed'], second['skipped']) == (1, 0, 3)
+    
+    calls.clear()
+    backfill.run_backfill(2023, 2024, ['games', 'sp'], workers=1, requests_per_second=100, api_key='k',
+                          restart=True)
+    assert sorted(calls) == [('games', 2023), ('games', 2024), ('sp', 2023), ('sp', 2024)]
+
+def test_backfill_rejects_bad_arguments(database):
+    with pytest.raises(ValueError):
+        backfill.run_backfill(2024, 2024, ['nope'], api_key='k')
+    with pytest.raises(ValueError):
+        backfill.run_backfill(2024, 2024, ['games'], requests_per_second=0, api_key='k')
@@ -0,0 +1,51 @@
+# test_bulk_ingest.py - Staged merge loads on SQLite (executemany path)
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from bulk_ingest import bulk_ingest, stable_id
+
+
+def _conn():
+    conn = create_engine('sqlite://').connect()
+    conn.execute(text("CREATE TABLE plays (id INTEGER, season INTEGER, play_text TEXT, PRIMARY KEY (id, season))"))
+    conn.execute(text("CREATE TABLE player_stats (game_id INTEGER, player TEXT, yards INTEGER)"))
+    return conn
+
+def _rows(conn, query):
+    return [tuple(row) for row in conn.execute(text(query))]
+
+
+def test_upsert_keeps_last_row_per_key_across_chunks():
+    conn = _conn()
+    conn.execute(text("INSERT INTO plays VALUES (2, 2025, 'old')"))
+    rows = [(1, 2025, 'a'), (2, 2025, 'b'), (1, 2025, 'c'), (3, 2025, 'd'), (1, 2025, 'e')]
+    
+    stats = bulk_ingest(conn, 'plays', ['id', 'season', 'play_text'], rows, key=['id', 'season'], batch_size=2)
+    
+    assert (stats['rows'], stats['inserted'], stats['updated'], stats['deleted']) == (3, 2, 1, 0)
+    assert _rows(conn, "SELECT * FROM plays ORDER BY id") == [(1, 2025, 'e'), (2, 2025, 'b'), (3, 2025, 'd')]
+
+def test_replace_by_swaps_the_rows_of_each_staged_group():
+    conn = _conn()
+    conn.execute(text("INSERT INTO player_stats VALUES (1, 'A', 10), (1, 'B', 20), (2, 'C', 30)"))
+    rows = [(1, 'A', 15), (3, 'D', 40)]
+    
+    stats = bulk_ingest(conn, 'player_stats', ['game_id', 'player', 'yards'], rows, replace_by=['game_id'])
+    
+    assert (stats['rows'], stats['inserted'], stats['updated'], stats['deleted']) == (2, 1, 1, 2)
+    assert _rows(conn, "SELECT * FROM player_stats ORDER BY game_id, player") == [
+        (1, 'A', 15), (2, 'C', 30), (3, 'D', 40)
+    ]
+
+def test_bulk_ingest_requires_one_merge_mode():
+    conn = _conn()
+    with pytest.raises(ValueError):
+        bulk_ingest(conn, 'plays', ['id'], [], key=['id'], replace_by=['id'])
+    with pytest.raises(ValueError):
+        bulk_ingest(conn, 'plays', ['id'], [])
+
+def test_stable_id_is_deterministic_and_positive():
+    assert stable_id(1, None, 'rush') == stable_id(1, None, 'rush')
+    assert stable_id(1, None, 'rush') != stable_id(1, 2, 'rush')
+    assert 0 < stable_id('x') < 2 ** 63
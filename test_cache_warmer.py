@@ -0,0 +1,23 @@
+# test_cache_warmer.py - Preset usage tracking behind the post-sync rewarm
+
+from cache_warmer import CacheWarmer, UsageTracker
+
+
+def test_usage_tracker_caps_distinct_presets_per_day():
+    tracker = UsageTracker(max_presets=2)
+    for multiplier in (2.0, 2.0, 2.5, 3.0, 3.5):
+        tracker.record({'three_score_multiplier': multiplier})
+    tracker.record({'three_score_multiplier': 2.5})  # Already counted, so still tracked
+    tracker.record({})                               # The default formula isn't counted
+    
+    assert tracker.most_common(5) == [{'three_score_multiplier': 2.0}, {'three_score_multiplier': 2.5}]
+
+def test_warm_presets_start_with_the_default_formula():
+    tracker = UsageTracker()
+    tracker.record({'one_score_multiplier': 1.2})
+    warmer = CacheWarmer(lambda season, season_type, preset: None, tracker=tracker,
+                         presets=[{'one_score_multiplier': 1.2}, {'two_score_multiplier': 2.0}], popular=3)
+    try:
+        assert warmer.presets() == [{}, {'one_score_multiplier': 1.2}, {'two_score_multiplier': 2.0}]
+    finally:
+        warmer.shutdown()
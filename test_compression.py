@@ -0,0 +1,38 @@
+# test_compression.py - Accept-Encoding negotiation and precompressed response variants
+
+import gzip
+
+from compression import compress_variants, encoded_body_response, negotiate
+
+
+def test_negotiate_prefers_br_then_gzip_at_equal_q():
+    assert negotiate('gzip, deflate, br', ['br', 'gzip']) == 'br'
+    assert negotiate('gzip, deflate, br', ['gzip']) == 'gzip'
+    assert negotiate('deflate', ['br', 'gzip']) is None
+    assert negotiate(None, ['br', 'gzip']) is None
+    assert negotiate('', ['gzip']) is None
+
+def test_negotiate_follows_q_values():
+    assert negotiate('br;q=0.5, gzip;q=0.8', ['br', 'gzip']) == 'gzip'
+    assert negotiate('br;q=0, gzip', ['br', 'gzip']) == 'gzip'
+    assert negotiate('br;q=0', ['br']) is None
+    assert negotiate('GZIP; q=0.3', ['gzip']) == 'gzip'
+    assert negotiate('gzip;q=oops', ['gzip']) is None
+
+def test_negotiate_wildcard_covers_unlisted_encodings():
+    assert negotiate('*', ['br', 'gzip']) == 'br'
+    assert negotiate('br;q=0, *', ['br', 'gzip']) == 'gzip'
+    assert negotiate('*;q=0', ['gzip']) is None
+
+def test_encoded_body_response_serves_the_negotiated_variant():
+    body = b'{"teams": []}' * 200
+    variants = compress_variants(body)
+    
+    response = encoded_body_response(variants, 'gzip', headers={'ETag': '"v1"'})
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.headers['vary'] == 'Accept-Encoding' and response.headers['etag'] == '"v1"'
+    assert gzip.decompress(response.body) == body
+    
+    identity = encoded_body_response(variants, 'gzip;q=0')
+    assert 'content-encoding' not in identity.headers
+    assert identity.body == body
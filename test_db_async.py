@@ -0,0 +1,64 @@
+# test_db_async.py - Both read paths behind get_async_read_db
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+import db_async
+from db_async import ThreadedReadSession, async_url, get_async_read_db
+
+
+def _database(tmp_path) -> str:
+    path = tmp_path / 'read.db'
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE teams (school TEXT, api_id INTEGER)"))
+        conn.execute(text("INSERT INTO teams VALUES ('Georgia', 61), ('Texas', 251)"))
+    engine.dispose()
+    return str(path)
+
+async def _query():
+    async for db in get_async_read_db():
+        result = await db.execute(text("SELECT school FROM teams WHERE api_id > :id ORDER BY school"), {"id": 0})
+        return result.scalars().all()
+
+
+def test_async_url_needs_a_known_scheme_and_installed_driver(monkeypatch):
+    assert async_url('mysql://localhost/db') is None
+    monkeypatch.setitem(db_async.ASYNC_DRIVERS, 'sqlite', ('sqlite+nodriver', 'no_such_driver_module'))
+    assert async_url('sqlite:///x.db') is None
+
+def test_threaded_read_session(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{_database(tmp_path)}")
+    monkeypatch.setattr(db_async, 'AsyncReadSessionLocal', None)
+    monkeypatch.setattr(db_async, 'ReadSessionLocal', sessionmaker(bind=engine))
+    
+    assert asyncio.run(_query()) == ['Georgia', 'Texas']
+    assert engine.pool.checkedout() == 0
+    
+    # No query, no session
+    session = ThreadedReadSession()
+    asyncio.run(session.close())
+    assert session._session is None
+
+def test_aiosqlite_read_session(tmp_path, monkeypatch):
+    pytest.importorskip('aiosqlite')
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    
+    path = _database(tmp_path)
+    url = async_url(f"sqlite:///{path}")
+    assert url == f"sqlite+aiosqlite:///{path}"
+    
+    engine = create_async_engine(url)
+    monkeypatch.setattr(db_async, 'AsyncReadSessionLocal', async_sessionmaker(engine, expire_on_commit=False))
+    
+    async def run():
+        async for db in get_async_read_db():
+            assert isinstance(db, AsyncSession)
+        rows = await _query()
+        await engine.dispose()
+        return rows
+    
+    assert asyncio.run(run()) == ['Georgia', 'Texas']
@@ -0,0 +1,131 @@
+# test_db_models.py - Maintenance helpers in db_models_complete against SQLite
+
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+
+import db_models_complete
+from db_models_complete import (
+    Base, refresh_game_summary, pool_status, engine,
+    ensure_season_partitions, create_season_staging, swap_season, detach_season
+)
+
+# Partition tests run against a scratch PostgreSQL database when one is given, e.g.
+#   TEST_POSTGRES_URL=postgresql://localhost/cfb_test pytest test_db_models.py
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+
+def _engine():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO teams (school, api_id, classification) VALUES
+            ('Georgia', 61, 'fbs'), ('Texas', 251, 'fbs'), ('Samford', 2535, 'fcs')
+        """))
+    return engine
+
+def _add_games(engine, rows):
+    with engine.begin() as conn:
+        for game_id, season, home_id, home_team, away_id, away_team in rows:
+            conn.execute(text("""
+                INSERT INTO games (id, season, week, season_type, completed, home_id, home_team, home_points,
+                                   away_id, away_team, away_points)
+                VALUES (:id, :season, 1, 'regular', true, :home_id, :home_team, 30, :away_id, :away_team, 20)
+            """), {"id": game_id, "season": season, "home_id": home_id, "home_team": home_team,
+                   "away_id": away_id, "away_team": away_team})
+
+
+def test_refresh_game_summary_resolves_name_only_games():
+    engine = _engine()
+    _add_games(engine, [
+        (1, 2025, 61, 'Georgia', None, 'Samford'),
+        (2, 2025, None, 'Texas', 61, 'Georgia'),
+    ])
+    
+    assert refresh_game_summary(engine, [2025]) == 2
+    with engine.connect() as conn:
+        rows = conn.execute(text("""
+            SELECT game_id, home_id, away_id, home_fbs, away_fbs FROM season_game_summary ORDER BY game_id
+        """)).fetchall()
+    assert [tuple(row) for row in rows] == [(1, 61, 2535, 1, 0), (2, 251, 61, 1, 1)]
+
+def test_refresh_game_summary_skips_seasons_with_unresolvable_games():
+    engine = _engine()
+    _add_games(engine, [
+        (1, 2024, 61, 'Georgia', 251, 'Texas'),
+        (2, 2025, 61, 'Georgia', 251, 'Texas'),
+        (3, 2025, None, 'Unknown State', 61, 'Georgia'),
+    ])
+    
+    assert refresh_game_summary(engine) == 1
+    with engine.connect() as conn:
+        seasons = conn.execute(text("SELECT season FROM season_game_summary")).scalars().all()
+    assert seasons == [2024]
+
+def test_pool_status_reports_configured_capacity(monkeypatch):
+    monkeypatch.setitem(db_models_complete.POOL_SETTINGS, 'write', {'max_overflow': 5})
+    with engine.connect():
+        status = pool_status()['write']
+    if status.get('size') is None:
+        return  # Not a QueuePool (in-memory SQLite)
+    assert status['max_overflow'] == 5
+    assert status['checked_out'] == 1
+    assert status['saturation'] == round(1 / (status['size'] + 5), 3)
+
+def _add_drives(engine, table, rows):
+    with engine.begin() as conn:
+        for drive_id, season in rows:
+            conn.execute(text(f"""
+                INSERT INTO {table} (id, game_id, season, offense, defense)
+                VALUES (:id, 1, :season, 'Georgia', 'Texas')
+            """), {"id": drive_id, "season": season})
+
+def _drive_ids(engine, season):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT id FROM drives WHERE season = :season ORDER BY id"),
+                            {"season": season}).scalars().all()
+
+def test_season_swap_and_detach_without_partitions():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    _add_drives(engine, 'drives', [(1, 2024), (2, 2025), (3, 2025)])
+    
+    staging = create_season_staging('drives', 2025, bind=engine)
+    _add_drives(engine, staging, [(4, 2025)])
+    swap_season('drives', 2025, staging, bind=engine)
+    assert _drive_ids(engine, 2025) == [4]
+    assert _drive_ids(engine, 2024) == [1]
+    
+    assert detach_season('drives', 2025, bind=engine) is None
+    assert _drive_ids(engine, 2025) == [4]
+    assert detach_season('drives', 2025, drop=True, bind=engine) is None
+    assert _drive_ids(engine, 2025) == []
+    
+    with pytest.raises(ValueError):
+        detach_season('games', 2025, bind=engine)
+
+@pytest.mark.skipif(not TEST_POSTGRES_URL, reason="TEST_POSTGRES_URL not set")
+def test_season_partitions_on_postgres():
+    engine = create_engine(TEST_POSTGRES_URL)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    try:
+        assert 'drives_default' in ensure_season_partitions([2024], bind=engine)
+        _add_drives(engine, 'drives', [(1, 2024), (2, 2025)])  # 2025 lands in the default partition
+        assert 'drives_2025' in ensure_season_partitions([2025], bind=engine)
+        assert _drive_ids(engine, 2025) == [2]
+        
+        staging = create_season_staging('drives', 2025, bind=engine)
+        _add_drives(engine, staging, [(3, 2025)])
+        swap_season('drives', 2025, staging, bind=engine)
+        assert _drive_ids(engine, 2025) == [3]
+        
+        assert detach_season('drives', 2025, bind=engine) == 'drives_2025'
+        assert _drive_ids(engine, 2025) == []
+        assert _drive_ids(engine, 2024) == [1]
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE drives_2025"))
+    finally:
+        Base.metadata.drop_all(engine)
@@ -0,0 +1,46 @@
+# test_json_encoding.py - orjson and the stdlib fallback encode payloads identically
+
+import json
+from datetime import date, datetime, timezone
+
+import pytest
+
+import json_encoding
+from json_encoding import FastJSONResponse, encode_json, round_float
+
+PAYLOAD = {
+    "teams": [
+        {"name": "Hawai'i", "ranking": 12.345678, "games": [{"opponent": "São Paulo", "value": -0.5, "won": True}]},
+        {"name": "Texas", "ranking": float("nan"), "margin": None},
+    ],
+    "extremes": (float("inf"), float("-inf"), 0.0001, 10 ** 18),
+    "synced_at": datetime(2025, 9, 7, 4, 30, 15, 120000),
+    "synced_utc": datetime(2025, 9, 7, 4, 30, tzinfo=timezone.utc),
+    "day": date(2025, 9, 7),
+    2025: "int key",
+}
+
+
+def _stdlib(monkeypatch, content):
+    monkeypatch.setattr(json_encoding, "orjson", None)
+    return encode_json(content)
+
+@pytest.mark.skipif(json_encoding.orjson is None, reason="orjson not installed")
+def test_fallback_matches_orjson_byte_for_byte(monkeypatch):
+    # Exponent notation is spelled differently (1e-9 / 1e-09) but parses the same
+    tiny = {"value": 1e-9, "big": 1.5e300}
+    fast, fast_tiny = encode_json(PAYLOAD), encode_json(tiny)
+    assert b'"ranking":null' in fast and b'"2025":"int key"' in fast
+    
+    assert _stdlib(monkeypatch, PAYLOAD) == fast
+    assert json.loads(_stdlib(monkeypatch, tiny)) == json.loads(fast_tiny)
+
+def test_fallback_writes_non_finite_floats_as_null(monkeypatch):
+    assert _stdlib(monkeypatch, {"a": float("nan"), "b": [float("inf")]}) == b'{"a":null,"b":[null]}'
+
+def test_rendered_responses_round_every_float():
+    assert round_float(1.23456789) == 1.2346
+    assert round_float(float("nan")) is None and round_float(None) is None
+    
+    rendered = FastJSONResponse({"records": [{"team": "Texas", "rating": 21.987654}], "fpi": (3.14159265,)})
+    assert rendered.body == b'{"records":[{"team":"Texas","rating":21.9877}],"fpi":[3.1416]}'
@@ -0,0 +1,41 @@
+# test_live_updates.py - Change detection and fan-out of ranking deltas
+
+import asyncio
+
+from live_updates import RankingBroadcaster, _Channel, changed_weeks, diff_rankings
+
+
+def _row(name, rank, ranking=1.0, wins=1, losses=0):
+    return {'name': name, 'rank': rank, 'ranking': ranking, 'wins': wins, 'losses': losses}
+
+
+def test_changed_weeks_reports_changed_added_and_removed_weeks():
+    previous = {('regular', 1): (40, 12, 101), ('regular', 2): (38, 4, 140), ('postseason', 1): (1, 3, 900)}
+    current = {('regular', 1): (40, 12, 101), ('regular', 2): (39, 11, 141), ('regular', 3): (2, 7, 150)}
+    assert changed_weeks(previous, current) == {'regular': {2, 3}, 'postseason': {1}}
+    assert changed_weeks(current, current) == {}
+    assert changed_weeks({}, {('regular', None): (1, 0, 5)}) == {'regular': {None}}
+
+def test_diff_rankings_returns_moved_and_new_rows():
+    previous = {'Georgia': _row('Georgia', 1), 'Texas': _row('Texas', 2, 0.5)}
+    current = [_row('Texas', 1, 1.5, wins=2), _row('Georgia', 2), _row('Oregon', 3, 0.2)]
+    
+    changes = diff_rankings(previous, current)
+    assert [(row['name'], row['previous_rank'], row['previous_ranking']) for row in changes] == [
+        ('Texas', 2, 0.5), ('Georgia', 1, 1.0), ('Oregon', None, None)
+    ]
+    assert diff_rankings({row['name']: row for row in current}, current) == []
+
+def test_publish_replaces_a_full_backlog_with_a_resync():
+    async def run():
+        channel = _Channel(2025, {})
+        channel.rows = [_row('Georgia', 1)]
+        fast, slow = asyncio.Queue(), asyncio.Queue(maxsize=2)
+        channel.subscribers.update({fast, slow})
+        for n in range(3):
+            RankingBroadcaster._publish(channel, {'season': 2025, 'total_teams': 1, 'changes': [n]})
+        return [fast.get_nowait() for _ in range(fast.qsize())], [slow.get_nowait() for _ in range(slow.qsize())]
+    
+    fast, slow = asyncio.run(run())
+    assert [event['changes'] for event in fast] == [[0], [1], [2]]
+    assert slow == [{'resync': True, 'season': 2025, 'total_teams': 1, 'teams': [_row('Georgia', 1)]}]
@@ -0,0 +1,66 @@
+# test_ranking_system.py - Team keying when rows mix API ids and school names
+
+import importlib.util
+import os
+
+from sqlalchemy import create_engine, text
+
+from cfb_ranking_system import RankingFormula, RankingSystem
+from db_models_complete import Base
+
+
+def test_name_only_and_id_rows_are_one_team():
+    system = RankingSystem()
+    system.add_game('Georgia', 28, 'Texas', 21, week=1)                         # Names only
+    system.add_game('Georgia', 35, 'Auburn', 10, week=2, home_id=61, away_id=2)  # Ids known
+    system.add_game('Texas', 14, 'Georgia', 17, week=3, home_id=251)            # Georgia by name again
+    
+    assert sorted(system.teams, key=str) == [2, 251, 61]
+    georgia = system.get_team('Georgia')
+    assert georgia.id == 61 and georgia.get_record() == (3, 0)
+    assert system.get_team('Texas').get_record() == (0, 2)
+    assert system.fbs_teams == {2, 61, 251}
+
+def test_database_loader_resolves_ids_for_name_only_games(tmp_path):
+    path = os.path.join(os.path.dirname(__file__), 'files', 'files2', 'files (1)', 'cfb_ranking_system_db.py')
+    spec = importlib.util.spec_from_file_location('cfb_ranking_system_db', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    
+    db_url = f"sqlite:///{tmp_path / 'rankings.db'}"
+    engine = create_engine(db_url)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO teams (school, api_id, classification) VALUES
+            ('Georgia', 61, 'fbs'), ('Texas', 251, 'fbs'), ('Samford', 2535, 'fcs')
+        """))
+        conn.execute(text("""
+            INSERT INTO games (id, season, week, season_type, completed, home_id, home_team, home_points,
+                               away_id, away_team, away_points)
+            VALUES (1, 2025, 1, 'regular', true, 61, 'Georgia', 45, NULL, 'Samford', 3),
+                   (2, 2025, 2, 'regular', true, NULL, 'Texas', 21, 61, 'Georgia', 28)
+        """))
+    
+    rows = list(module.DatabaseLoader(db_url).iter_games(2025))
+    assert [(row.home_id, row.away_id, row.away_classification) for row in rows] == [
+        (61, 2535, 'fcs'), (251, 61, 'fbs')
+    ]
+    
+    system = module.RankingSystem()
+    system.load_games_from_database(module.DatabaseLoader(db_url), 2025)
+    assert sorted(system.teams) == [61, 251, 2535]
+    assert system.fbs_teams == {61, 251}
+
+def test_formula_with_params_leaves_the_default_formula_alone():
+    def season(formula=RankingFormula):
+        system = RankingSystem()
+        system.add_game('Georgia', 45, 'Texas', 10, week=1)
+        system.add_game('Texas', 24, 'Auburn', 21, week=2)
+        system.calculate_rankings(formula=formula)
+        return system.get_team('Georgia').ranking
+    
+    blowouts = RankingFormula.with_params(three_score_multiplier=3.0)
+    assert blowouts.THREE_SCORE_MULTIPLIER == 3.0 and RankingFormula.THREE_SCORE_MULTIPLIER == 1.5
+    assert season(blowouts) > season()
+    assert season() == season(RankingFormula.with_params())
@@ -0,0 +1,96 @@
+# test_shared_cache.py - Cross-worker cache over the SQLite file store
+
+import pickle
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from shared_cache import SharedCache, SQLiteCache
+
+
+def _worker(tmp_path, **kwargs):
+    """A SharedCache as one worker process would open it (own connection, same file)."""
+    return SharedCache(SQLiteCache(str(tmp_path / 'cache.sqlite3')), **kwargs)
+
+
+def test_objects_round_trip_as_json(tmp_path):
+    cache = _worker(tmp_path)
+    entry = {"variants": {"identity": b'{"teams":[]}', "gzip": b'\x1f\x8b\x00'},
+             "version": (datetime(2025, 9, 7, 4, 30), "0.0.0:2025-09-07T04:30:00"), "teams": [[61, "Georgia", 1.5]]}
+    cache.set_object("response", entry)
+    assert cache.get_object("response") == {**entry, "version": list(entry["version"])}
+    assert cache.store.get("response").startswith(b'{')
+
+def test_pickled_entries_are_never_loaded(tmp_path):
+    cache = _worker(tmp_path)
+    cache.store.set("ranking", pickle.dumps({"snapshot": []}))
+    assert cache.get_object("ranking") is None
+    with pytest.raises(TypeError):
+        cache.set_object("ranking", {"team": object()})
+
+def test_compute_once_runs_one_computation_across_workers(tmp_path):
+    calls, results = [], []
+    
+    def compute():
+        calls.append(1)
+        time.sleep(0.3)
+        return {"snapshot": [1, 2, 3]}
+    
+    workers = [_worker(tmp_path) for _ in range(3)]
+    threads = [threading.Thread(target=lambda cache=cache: results.append(cache.compute_once("ranking", compute)))
+               for cache in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(calls) == 1
+    assert results == [{"snapshot": [1, 2, 3]}] * 3
+    assert workers[0].compute_once("ranking", lambda: pytest.fail("recomputed")) == {"snapshot": [1, 2, 3]}
+
+def test_compute_once_releases_the_lock_when_the_winner_fails(tmp_path):
+    cache = _worker(tmp_path)
+    
+    def fail():
+        raise RuntimeError("CFBD down")
+    
+    with pytest.raises(RuntimeError):
+        cache.compute_once("ranking", fail)
+    assert cache.compute_once("ranking", lambda: {"ok": True}) == {"ok": True}
+
+def test_bump_generation_invalidates_scopes_once_per_token(tmp_path):
+    first, second = _worker(tmp_path), _worker(tmp_path, generation_seconds=0)
+    week = first.generation(2025, "2025_regular_3")
+    season = first.generation(2025)
+    
+    assert first.bump_generation("2025_regular_3", token="2025:abc")
+    assert first.generation(2025, "2025_regular_3") != week   # This worker sees its own bump at once
+    assert first.generation(2025) == season                   # Other scopes are untouched
+    
+    bumped = second.generation(2025, "2025_regular_3")
+    assert not second.bump_generation("2025_regular_3", token="2025:abc")  # Same change from another worker
+    assert second.generation(2025, "2025_regular_3") == bumped
+    
+    second.bump_generation("all")
+    assert second.generation(2025) != season
+
+def test_generation_is_reread_after_generation_seconds(tmp_path):
+    reader, writer = _worker(tmp_path, generation_seconds=0.2), _worker(tmp_path)
+    before = reader.generation(2025)
+    writer.bump_generation(2025)
+    assert reader.generation(2025) == before  # Cached briefly
+    time.sleep(0.25)
+    assert reader.generation(2025) != before
+
+def test_workers_dedupe_a_token_whatever_order_they_list_scopes_in(tmp_path):
+    first, second = _worker(tmp_path, generation_seconds=0), _worker(tmp_path, generation_seconds=0)
+    scopes = ["2025_regular_None", "2025_regular_3", "2025_regular_4"]
+    assert first.bump_generation(*scopes, token="2025:abc")
+    after = second.generation(2025, "2025_regular_4")
+    
+    assert not second.bump_generation(*reversed(scopes), token="2025:abc")
+    assert second.generation(2025, "2025_regular_4") == after
+    assert second.bump_generation(*scopes, token="2025:def")  # The next change bumps again
+    assert second.generation(2025, "2025_regular_4") != after
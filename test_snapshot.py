@@ -0,0 +1,70 @@
+# test_snapshot.py - Round trips through the columnar season snapshots
+
+import os
+
+from sqlalchemy import create_engine, text
+
+from db_models_complete import Base, refresh_game_summary
+from snapshot import export_season, load_snapshot
+
+
+def _engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'snapshot.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO teams (school, api_id, classification) VALUES
+            ('Georgia', 61, 'fbs'), ('Texas', 251, 'fbs'), ('Samford', 2535, 'fcs')
+        """))
+        conn.execute(text("""
+            INSERT INTO games (id, season, week, season_type, completed, home_id, home_team, home_points,
+                               away_id, away_team, away_points)
+            VALUES (1, 2025, NULL, 'regular', true, 61, 'Georgia', 45, 2535, 'Samford', 3),
+                   (2, 2025, 2, 'regular', true, 251, 'Texas', 21, 61, 'Georgia', 28),
+                   (3, 2025, 1, 'postseason', true, 61, 'Georgia', 10, 251, 'Texas', 13)
+        """))
+        conn.execute(text("""
+            INSERT INTO drives (id, game_id, season, offense_id, offense, defense_id, defense,
+                                drive_number, start_period, start_yards_to_goal, plays, yards, scoring)
+            VALUES (10, 2, 2025, 251, 'Texas', NULL, 'Georgia', 1, 1, 75, 8, -1, false)
+        """))
+    refresh_game_summary(engine, [2025])
+    return engine
+
+
+def test_snapshot_round_trip_keeps_nulls_distinct_from_values(tmp_path):
+    engine = _engine(tmp_path)
+    directory = export_season(2025, str(tmp_path / 'snapshots'), ['drives'], bind=engine)
+    snapshot = load_snapshot(str(tmp_path / 'snapshots' / '2025'))
+    assert snapshot.directory == directory
+    
+    games = snapshot.columns('games_regular')
+    assert list(games['game_id']) == [1, 2]
+    assert snapshot.values('games_regular', 'week') == [None, 2]
+    assert list(games['home_fbs']) == [1, 1] and list(games['away_fbs']) == [0, 1]
+    assert list(snapshot.valid('games_regular')) == ['week']
+    assert snapshot.values('games_postseason', 'margin') == [-3]
+    assert snapshot.valid('games_postseason') == {}
+    
+    # -1 yards is a real value, not a NULL marker
+    assert snapshot.values('drives', 'yards') == [-1]
+    assert snapshot.values('drives', 'defense_id') == [None]
+    assert snapshot.team_names[2535] == 'Samford'
+
+def test_snapshot_version_follows_game_content(tmp_path):
+    engine = _engine(tmp_path)
+    out_dir = str(tmp_path / 'snapshots')
+    first = export_season(2025, out_dir, bind=engine)
+    created = os.path.getmtime(os.path.join(first, 'manifest.json'))
+    
+    # Re-summarizing unchanged games keeps the version, so the snapshot is reused
+    refresh_game_summary(engine, [2025])
+    assert export_season(2025, out_dir, bind=engine) == first
+    assert os.path.getmtime(os.path.join(first, 'manifest.json')) == created
+    
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE games SET home_points = 24 WHERE id = 2"))
+    refresh_game_summary(engine, [2025])
+    second = export_season(2025, out_dir, bind=engine)
+    assert second != first
+    assert load_snapshot(os.path.join(out_dir, '2025')).values('games_regular', 'margin') == [42, -4]
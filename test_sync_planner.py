@@ -0,0 +1,100 @@
+# test_sync_planner.py - Tests for watermark-based incremental sync planning
+
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine, text
+
+from db_models_complete import Base
+from sync_planner import SyncPlanner, current_season
+
+NOW = datetime(2025, 10, 15, 12, tzinfo=timezone.utc)
+
+
+def _iso(days: float) -> str:
+    return (NOW + timedelta(days=days)).isoformat().replace('+00:00', 'Z')
+
+def _calendar(weeks: int = 9):
+    # Week 6 starts today; each week runs Tuesday-Monday
+    return [
+        {'week': w, 'seasonType': 'regular', 'startDate': _iso(-7 * (6 - w)), 'endDate': _iso(-7 * (6 - w) + 6)}
+        for w in range(1, weeks + 1)
+    ]
+
+def _setup(games):
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    conn = engine.connect()
+    for game_id, week, start_days, completed in games:
+        conn.execute(
+            text("""
+                INSERT INTO games (id, season, week, season_type, start_date, completed, home_team, away_team)
+                VALUES (:id, 2025, :week, 'regular', :start, :completed, 'A', 'B')
+            """),
+            {"id": game_id, "week": week, "start": _iso(start_days), "completed": completed}
+        )
+    conn.commit()
+    return conn
+
+
+def test_first_sync_is_full_season():
+    conn = _setup([])
+    planner = SyncPlanner(lambda endpoint, params: _calendar())
+    assert planner.plan_weeks(conn, 2025, 'regular', now=NOW) is None
+
+def test_plan_only_refetches_open_and_recent_weeks():
+    games = [(w * 10, w, -7 * (6 - w) + 1, w < 5) for w in range(1, 10)]
+    games.append((11, 1, -34, False))  # Postponed week 1 game
+    conn = _setup(games)
+    
+    planner = SyncPlanner(lambda endpoint, params: _calendar())
+    watermark = planner.advance(conn, 2025, 'regular', now=NOW)
+    assert watermark['last_completed_week'] == 5
+    assert sorted(watermark['incomplete_game_ids']) == [11, 50]
+    
+    # Week 1 (postponed game), week 5 (unfinished + recent), week 6 (started today)
+    assert planner.plan_weeks(conn, 2025, 'regular', now=NOW) == [1, 5, 6]
+
+def test_current_season_rolls_over_in_august():
+    assert current_season(datetime(2026, 1, 5)) == 2025
+    assert current_season(datetime(2025, 9, 1)) == 2025
+
+def _stub_planner(monkeypatch, weeks):
+    advanced = []
+    monkeypatch.setattr(SyncPlanner, 'plan_weeks', lambda self, conn, season, season_type: weeks)
+    monkeypatch.setattr(SyncPlanner, 'advance', lambda self, conn, season, season_type: advanced.append(season_type))
+    return advanced
+
+def test_failed_week_keeps_the_watermark(monkeypatch):
+    from sync_service_complete import CFBDataSyncService
+    
+    advanced = _stub_planner(monkeypatch, [5, 6])
+    service = CFBDataSyncService(api_key='test')
+    
+    def sync_games(db, season, season_type, week=None):
+        if week == 5:
+            raise RuntimeError('CFBD down')
+        return {'success': True, 'added': 1}
+    monkeypatch.setattr(service, 'sync_games', sync_games)
+    
+    results = service.sync_games_incremental(None, 2025, 'regular')
+    assert results[5] == {'success': False, 'error': 'CFBD down'}
+    assert results[6]['success'] and advanced == []
+    
+    monkeypatch.setattr(service, 'sync_games', lambda db, season, season_type, week=None: {'success': True})
+    service.sync_games_incremental(None, 2025, 'regular')
+    assert advanced == ['regular']
+
+def test_nightly_failed_week_keeps_the_watermark(monkeypatch):
+    from sync_nightly import MinimalSync
+    
+    advanced = _stub_planner(monkeypatch, [5, 6])
+    nightly = MinimalSync('sqlite://', 'test')
+    nightly._api_stream = lambda endpoint, params=None: iter([])
+    
+    # The API sent nothing for either week
+    assert nightly.sync_games(2025, 'regular', 5) is False
+    nightly.sync_games_incremental(2025, 'regular')
+    assert advanced == []
+    
+    monkeypatch.setattr(nightly, 'sync_games', lambda season, season_type, week=None: True)
+    nightly.sync_games_incremental(2025, 'regular')
+    assert advanced == ['regular']
@@ -0,0 +1,144 @@
+# test_sync_service.py - Sync methods against the model schema
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from db_models_complete import Base, Team
+from http_cache import data_version_query
+from sync_service_complete import CFBDataSyncService
+
+
+def _session():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add(Team(school='Georgia', api_id=61))
+    db.commit()
+    return db
+
+def _service(responses):
+    service = CFBDataSyncService(api_key='test')
+    service._api_request = lambda endpoint, params=None: responses[endpoint]
+    return service
+
+
+def test_sync_ap_rankings_upserts_by_school():
+    db = _session()
+    polls = [{'week': 3, 'seasonType': 'regular', 'polls': [
+        {'poll': 'Coaches Poll', 'ranks': [{'school': 'Texas', 'rank': 1}]},
+        {'poll': 'AP Top 25', 'ranks': [
+            {'school': 'Georgia', 'rank': 1, 'firstPlaceVotes': 50, 'points': 1500, 'conference': 'SEC'},
+            {'school': 'Texas', 'rank': 2, 'teamId': 251, 'points': 1400},
+        ]},
+    ]}]
+    service = _service({'/rankings': polls})
+    
+    assert service.sync_ap_rankings(db, 2025, 3) == {'success': True, 'added': 2, 'updated': 0, 'unchanged': 0}
+    polls[0]['polls'][1]['ranks'][0]['rank'] = 2
+    assert service.sync_ap_rankings(db, 2025, 3) == {'success': True, 'added': 0, 'updated': 1, 'unchanged': 1}
+    
+    # A re-sync of the same poll changes nothing, so the endpoint's data version stays put
+    version = db.execute(data_version_query(['ap_rankings']), {'season': 2025}).scalar()
+    assert service.sync_ap_rankings(db, 2025, 3) == {'success': True, 'added': 0, 'updated': 0, 'unchanged': 2}
+    assert db.execute(data_version_query(['ap_rankings']), {'season': 2025}).scalar() == version
+    
+    rows = db.execute(text("SELECT school, team_id, poll, rank FROM ap_rankings ORDER BY school")).fetchall()
+    assert [tuple(row) for row in rows] == [('Georgia', 61, 'AP Top 25', 2), ('Texas', 251, 'AP Top 25', 2)]
+
+def test_sync_sp_ratings_stores_one_row_per_year():
+    db = _session()
+    ratings = [
+        {'year': 2025, 'team': 'Georgia', 'conference': 'SEC', 'rating': 25.1, 'ranking': 3,
+         'offense': {'rating': 38.0}, 'defense': {'rating': 12.9}, 'specialTeams': {'rating': 0.4}},
+        {'year': 2025, 'team': 'nationalAverages', 'rating': 0.0},
+    ]
+    service = _service({'/ratings/sp': ratings})
+    
+    assert service.sync_sp_ratings(db, 2025) == {'success': True, 'added': 1, 'updated': 0, 'unchanged': 0}
+    assert service.sync_sp_ratings(db, 2025) == {'success': True, 'added': 0, 'updated': 0, 'unchanged': 1}
+    ratings[0]['rating'] = 26.0
+    assert service.sync_sp_ratings(db, 2025) == {'success': True, 'added': 0, 'updated': 1, 'unchanged': 0}
+    
+    row = db.execute(text("SELECT year, team, team_id, rating, offense_rating FROM team_sp_ratings")).one()
+    assert tuple(row) == (2025, 'Georgia', 61, 26.0, 38.0)
+
+def test_sync_fpi_ratings_stores_one_row_per_year():
+    db = _session()
+    ratings = [{'year': 2025, 'team': 'Georgia', 'conference': 'SEC', 'fpi': 21.5}]
+    service = _service({'/ratings/fpi': ratings})
+    
+    assert service.sync_fpi_ratings(db, 2025) == {'success': True, 'added': 1, 'updated': 0, 'unchanged': 0}
+    assert service.sync_fpi_ratings(db, 2025) == {'success': True, 'added': 0, 'updated': 0, 'unchanged': 1}
+    ratings[0]['fpi'] = 22.0
+    assert service.sync_fpi_ratings(db, 2025) == {'success': True, 'added': 0, 'updated': 1, 'unchanged': 0}
+    
+    row = db.execute(text("SELECT year, team, team_id, conference, fpi FROM team_fpi_ratings")).one()
+    assert tuple(row) == (2025, 'Georgia', 61, 'SEC', 22.0)
+
+def test_sync_team_records_writes_conference_columns():
+    db = _session()
+    records = [{
+        'year': 2025, 'teamId': 61, 'team': 'Georgia', 'conference': 'SEC', 'division': 'East',
+        'total': {'wins': 9, 'losses': 1, 'ties': 0},
+        'conferenceGames': {'wins': 6, 'losses': 1, 'ties': 0},
+        'homeGames': {'wins': 5, 'losses': 0}, 'awayGames': {'wins': 4, 'losses': 1},
+    }]
+    service = _service({'/records': records})
+    
+    assert service.sync_team_records(db, 2025) == {'success': True, 'added': 1, 'updated': 0}
+    records[0]['total']['wins'] = 10
+    assert service.sync_team_records(db, 2025) == {'success': True, 'added': 0, 'updated': 1}
+    
+    row = db.execute(text("""
+        SELECT year, team_id, total_wins, conference_wins, conference_losses, away_losses FROM team_records
+    """)).one()
+    assert tuple(row) == (2025, 61, 10, 6, 1, 1)
+
+
+TEAMS = [{'id': 61, 'school': 'Georgia', 'mascot': 'Bulldogs', 'conference': 'SEC', 'classification': 'fbs'},
+         {'id': 251, 'school': 'Texas', 'mascot': 'Longhorns', 'conference': 'SEC'}]
+GAMES = [{'id': 401, 'season': 2025, 'week': 1, 'seasonType': 'regular', 'startDate': '2025-08-30T19:30:00.000Z',
+          'completed': True, 'homeId': 61, 'homeTeam': 'Georgia', 'homePoints': 28,
+          'awayId': 251, 'awayTeam': 'Texas', 'awayPoints': 21, 'neutralSite': False, 'conferenceGame': True,
+          'homePregameElo': 1800}]
+
+def test_identical_payloads_are_unchanged_across_sync_paths(capsys):
+    from sync_nightly import MinimalSync
+    
+    nightly = MinimalSync('sqlite://', 'test')
+    Base.metadata.create_all(nightly.engine)
+    nightly._api_request = lambda endpoint, params=None: TEAMS
+    nightly._api_stream = lambda endpoint, params=None: iter(GAMES)
+    nightly.sync_teams()
+    nightly.sync_games(2025)
+    
+    service = _service({'/teams/fbs': TEAMS})
+    service._api_stream = lambda endpoint, params=None: iter(GAMES)
+    db = sessionmaker(bind=nightly.engine)()
+    assert service.sync_teams(db) == {'added': 0, 'updated': 0, 'unchanged': 2}
+    assert service.sync_games(db, 2025)['updated'] == 0
+    
+    # And back: the nightly sync sees the rows the full sync wrote as unchanged
+    capsys.readouterr()
+    nightly.sync_teams()
+    nightly.sync_games(2025)
+    output = capsys.readouterr().out
+    assert "Teams: 0 added, 0 updated, 2 unchanged" in output
+    assert "Games: 0 added, 0 updated, 1 unchanged" in output
+
+def test_weekly_update_runs_hooks_only_after_a_successful_sync(monkeypatch):
+    from sync_hooks import register_post_sync_hook, unregister_post_sync_hook
+    
+    calls = []
+    hook = register_post_sync_hook(lambda season, season_type, weeks, token: calls.append((season, season_type, weeks)))
+    try:
+        service = CFBDataSyncService(api_key='test')
+        outcomes = iter([{'success': False, 'error': 'CFBD down'}, {'success': True, 'added': 3, 'changed_weeks': [4]}])
+        monkeypatch.setattr(service, 'sync_games', lambda db, season, season_type, week: next(outcomes))
+        
+        assert service.sync_weekly_update(None, 2025, 4)['games']['success'] is False
+        assert calls == []
+        service.sync_weekly_update(None, 2025, 4)
+        assert calls == [(2025, 'regular', {4})]
+    finally:
+        unregister_post_sync_hook(hook)
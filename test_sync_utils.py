@@ -0,0 +1,56 @@
+# test_sync_utils.py - Tests for the shared sync helpers
+
+import io
+import json
+import threading
+import time
+
+import pytest
+
+import sync_utils
+from sync_utils import content_hash, iter_json_items, batched, RateLimiter
+
+
+class FakeStreamResponse:
+    """Minimal stand-in for a streamed requests.Response"""
+    
+    def __init__(self, data):
+        self.data = data
+        self.raw = io.BytesIO(json.dumps(data).encode('utf-8'))
+    
+    def json(self):
+        return self.data
+
+
+def test_content_hash_ignores_key_order():
+    assert content_hash({'a': 1, 'b': 'x'}) == content_hash({'b': 'x', 'a': 1})
+    assert content_hash({'a': 1}) != content_hash({'a': 2})
+
+def test_batched_splits_into_fixed_size_lists():
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(batched([], 3)) == []
+
+def test_iter_json_items_streams_array():
+    games = [{'id': 1, 'excitementIndex': 1.5}, {'id': 2, 'excitementIndex': None}]
+    assert list(iter_json_items(FakeStreamResponse(games))) == games
+
+def test_iter_json_items_without_ijson(monkeypatch):
+    monkeypatch.setattr(sync_utils, 'ijson', None)
+    games = [{'id': 1}, {'id': 2}]
+    assert list(iter_json_items(FakeStreamResponse(games))) == games
+
+def test_rate_limiter_rejects_non_positive_rates():
+    for rate in (0, -1):
+        with pytest.raises(ValueError):
+            RateLimiter(rate)
+
+def test_rate_limiter_spaces_requests_across_threads():
+    limiter = RateLimiter(50)  # One slot every 20ms
+    started = time.monotonic()
+    threads = [threading.Thread(target=limiter.wait) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # First slot is immediate, the other five are spaced 20ms apart
+    assert time.monotonic() - started >= 0.09